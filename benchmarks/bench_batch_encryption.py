@@ -0,0 +1,71 @@
+"""
+Benchmark: batch payload serialization + encryption across processes
+
+Usage (with the package installed, e.g. ``pip install -e .``):
+    python benchmarks/bench_batch_encryption.py [--payloads 20000] [--max-processes 8]
+"""
+
+import argparse
+import os
+import time
+
+from payagency_api.utils import prepare_request_data, prepare_request_data_batch
+
+
+ENCRYPTION_KEY = "12345678901234567890123456789012"
+
+
+def make_payload(index):
+    """Build a realistic S2S payment payload"""
+    return {
+        "first_name": "James",
+        "last_name": "Dean",
+        "email": f"james{index}@example.com",
+        "address": "64 Hertingfordbury Rd",
+        "country": "GB",
+        "city": "Newport",
+        "state": "GB",
+        "zip": "TF10 8DF",
+        "ip_address": "127.0.0.1",
+        "phone_number": "7654233212",
+        "amount": 100 + index % 1000,
+        "currency": "GBP",
+        "card_number": "4111111111111111",
+        "card_expiry_month": "12",
+        "card_expiry_year": "2027",
+        "card_cvv": "029",
+        "redirect_url": "https://pay.agency",
+        "webhook_url": "https://pay.agency/webhook",
+        "order_id": f"ORDER-{index}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--payloads", type=int, default=20000)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    payloads = [make_payload(i) for i in range(args.payloads)]
+
+    start = time.perf_counter()
+    for payload in payloads:
+        prepare_request_data(payload, ENCRYPTION_KEY)
+    baseline = time.perf_counter() - start
+
+    print(f"{args.payloads} payloads, {os.cpu_count()} CPUs")
+    print(f"{'processes':>9}  {'seconds':>8}  {'payloads/s':>11}  {'speedup':>7}")
+    print(f"{'serial':>9}  {baseline:8.3f}  {args.payloads / baseline:11.0f}  {1.0:7.2f}")
+
+    processes = 1
+    while processes <= args.max_processes:
+        start = time.perf_counter()
+        bodies = prepare_request_data_batch(payloads, ENCRYPTION_KEY, processes=processes)
+        elapsed = time.perf_counter() - start
+        assert len(bodies) == len(payloads)
+        print(f"{processes:>9}  {elapsed:8.3f}  {args.payloads / elapsed:11.0f}  {baseline / elapsed:7.2f}")
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
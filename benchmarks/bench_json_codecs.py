@@ -0,0 +1,91 @@
+"""
+Benchmark: JSON codecs on realistic transaction pages
+
+Measures raw dumps/loads throughput per codec and an end-to-end
+``txn.get_transactions()`` round trip through an in-memory transport.
+
+Usage (with the package installed, e.g. ``pip install -e .``):
+    python benchmarks/bench_json_codecs.py [--transactions 100] [--iterations 2000]
+"""
+
+import argparse
+import time
+
+from payagency_api import PayAgencyApi
+from payagency_api.codec import CODECS, get_codec
+from payagency_api.transports import InMemoryTransport, TransportResponse
+
+
+def make_transaction(index):
+    """Build a realistic transaction record"""
+    return {
+        "transaction_id": f"TXN_{index:08d}",
+        "order_id": f"ORDER-{index}",
+        "amount": f"{100 + index % 1000}.50",
+        "currency": "GBP",
+        "converted_amount": f"{120 + index % 1000}.10",
+        "converted_currency": "USD",
+        "status": ("SUCCESS", "FAILED", "PENDING")[index % 3],
+        "transaction_type": "CARD",
+        "payment_method": "card",
+        "card_type": "VISA",
+        "card_number": "411111XXXXXX1111",
+        "country": "GB",
+        "ip_address": "127.0.0.1",
+        "created_at": "2026-10-19T10:15:30.000Z",
+        "updated_at": "2026-10-19T10:15:31.000Z",
+        "merchant_connector": {"id": 7, "name": "Connector Seven"},
+        "user": {"first_name": "James", "last_name": "Dean", "email": f"james{index}@example.com"},
+        "user_kyc": {"status": "APPROVED", "level": 2},
+    }
+
+
+def make_page(size):
+    """Build a transactions response page"""
+    return {
+        "data": [make_transaction(i) for i in range(size)],
+        "meta": {"nextCursor": "abc", "hasNextPage": True, "totalCount": size * 10},
+    }
+
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    page = make_page(args.transactions)
+    names = [name for name, codec_class in CODECS.items() if codec_class.available()]
+
+    print(f"page of {args.transactions} transactions, {args.iterations} iterations")
+    print(f"{'codec':>8}  {'dumps/s':>9}  {'loads/s':>9}  {'round trips/s':>13}")
+
+    for name in names:
+        codec = get_codec(name)
+        encoded = codec.dumps(page)
+        response = TransportResponse(200, {"Content-Type": "application/json"}, encoded)
+        client = PayAgencyApi(
+            encryption_key="12345678901234567890123456789012",
+            secret_key="PA_TEST_benchmark",
+            transport=InMemoryTransport(lambda request: response, history=1),
+            json_codec=codec,
+        )
+
+        dumps = timed(lambda: codec.dumps(page), args.iterations)
+        loads = timed(lambda: codec.loads(encoded), args.iterations)
+        round_trip = timed(lambda: client.txn.get_transactions({"limit": args.transactions}), args.iterations)
+        print(
+            f"{name:>8}  {args.iterations / dumps:9.0f}  {args.iterations / loads:9.0f}  "
+            f"{args.iterations / round_trip:13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,25 @@ A comprehensive Python SDK for PayAgency payment processing platform.
 """
 
 from .client import PayAgencyApi
-from .exceptions import PayAgencyError, PayAgencyAPIError, PayAgencyNetworkError
+from .merchants import PayAgencyClientPool
+from .exceptions import (
+    PayAgencyError,
+    PayAgencyAPIError,
+    PayAgencyNetworkError,
+    PayAgencyValidationError,
+    PayAgencyOverloadError,
+    PayAgencyRateLimitError,
+    PayAgencyServerError,
+    PayAgencyDeclinedError,
+    PayAgencyInvalidRequestError,
+    PayAgencyTimeoutError,
+    PayAgencyConnectionError,
+    PayAgencyTLSError,
+    PayAgencyBatchError,
+)
+from .idempotency import IdempotencyStore, InMemoryIdempotencyStore, SQLiteIdempotencyStore
 from . import types
+from . import models
 
 __version__ = "1.1.0"
 __author__ = "PaneruVipin"
@@ -14,8 +31,23 @@ __email__ = "support@pay.agency"
 
 __all__ = [
     "PayAgencyApi",
+    "PayAgencyClientPool",
     "PayAgencyError",
     "PayAgencyAPIError", 
     "PayAgencyNetworkError",
+    "PayAgencyValidationError",
+    "PayAgencyOverloadError",
+    "PayAgencyRateLimitError",
+    "PayAgencyServerError",
+    "PayAgencyDeclinedError",
+    "PayAgencyInvalidRequestError",
+    "PayAgencyTimeoutError",
+    "PayAgencyConnectionError",
+    "PayAgencyTLSError",
+    "PayAgencyBatchError",
+    "IdempotencyStore",
+    "InMemoryIdempotencyStore",
+    "SQLiteIdempotencyStore",
     "types",
+    "models",
 ]
@@ -0,0 +1,310 @@
+"""
+Record and replay API traffic
+
+``PayAgencyApi.record()`` captures each request (method, path, query
+parameters and the decrypted payload) with its response and latency into a
+``Cassette``, saved as gzip-compressed JSON lines. Card numbers, CVVs and
+expiry dates are redacted before anything is stored. A ``ReplayTransport``
+serves the recorded responses back, without sleeping or at the recorded
+latency scaled by ``speed``, so integration code can be benchmarked and
+profiled deterministically offline.
+"""
+
+import gzip
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from . import exceptions
+from .exceptions import PayAgencyError, PayAgencyNetworkError
+from .transports import Transport, TransportRequest, TransportResponse
+from .utils import decrypt_data
+from .validation import luhn_valid
+
+
+CASSETTE_VERSION = 1
+
+REDACTED = "[REDACTED]"
+
+# Fields removed outright; card numbers keep their last four digits
+CARD_FIELDS = frozenset({"card_cvv", "cvv", "card_expiry_month", "card_expiry_year"})
+CARD_NUMBER_FIELDS = frozenset({"card_number"})
+
+_CARD_NUMBER = re.compile(r"^\d(?:[ -]?\d){12,18}$")
+
+
+def _mask(number: str) -> str:
+    digits = re.sub(r"\D", "", number)
+    return "*" * (len(digits) - 4) + digits[-4:]
+
+
+def redact_card_data(value: Any) -> Any:
+    """
+    Copy a decoded JSON value with card data removed
+
+    CVVs and expiry dates are replaced with "[REDACTED]"; card numbers,
+    including Luhn-valid numbers in any other string field, keep only their
+    last four digits.
+
+    Args:
+        value: Decoded JSON value
+
+    Returns:
+        Redacted copy
+    """
+    if isinstance(value, dict):
+        redacted = {}
+        for key, item in value.items():
+            if key in CARD_FIELDS and item is not None:
+                redacted[key] = REDACTED
+            elif key in CARD_NUMBER_FIELDS and isinstance(item, str):
+                redacted[key] = _mask(item)
+            else:
+                redacted[key] = redact_card_data(item)
+        return redacted
+    if isinstance(value, list):
+        return [redact_card_data(item) for item in value]
+    if isinstance(value, str) and _CARD_NUMBER.match(value) and luhn_valid(re.sub(r"\D", "", value)):
+        return _mask(value)
+    return value
+
+
+class Cassette:
+    """
+    Recorded interactions
+
+    Each interaction is a dict with ``method``, ``path``, ``params``,
+    ``request`` (the decrypted, redacted payload), ``status``, ``headers``,
+    ``response`` (the redacted body), ``elapsed`` seconds and ``offset``
+    seconds since recording started; failed requests have ``error`` and
+    ``message`` instead of a response.
+
+    Args:
+        interactions: Recorded interactions (optional)
+    """
+
+    def __init__(self, interactions: Optional[Iterable[Dict[str, Any]]] = None):
+        self.interactions: List[Dict[str, Any]] = list(interactions or [])
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def append(self, interaction: Dict[str, Any]) -> None:
+        """
+        Add an interaction, stamping its offset from the start of recording
+
+        Args:
+            interaction: Recorded interaction
+        """
+        interaction["offset"] = round(time.perf_counter() - self._start, 6)
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self, path: str) -> None:
+        """
+        Write the cassette as gzip-compressed JSON lines
+
+        Args:
+            path: File path
+        """
+        with self._lock:
+            interactions = list(self.interactions)
+
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+            for interaction in interactions:
+                file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """
+        Read a cassette written by ``save()``
+
+        Args:
+            path: File path
+
+        Returns:
+            Loaded cassette
+
+        Raises:
+            ValueError: If the file is not a cassette of a supported version
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline() or "null")
+            if not isinstance(header, dict) or header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+            return cls(json.loads(line) for line in file if line.strip())
+
+
+def _decode_body(content: bytes) -> Any:
+    try:
+        return json.loads(content)
+    except ValueError:
+        return {"raw_response": content.decode("utf-8", errors="replace")}
+
+
+class RecordingTransport(Transport):
+    """
+    Transport recording every request sent through another transport
+
+    Args:
+        transport: Transport that sends the requests
+        cassette: Cassette receiving the interactions
+        encryption_key: Key used to decrypt request payloads before recording
+    """
+
+    def __init__(self, transport: Transport, cassette: Cassette, encryption_key: str):
+        self.transport = transport
+        self.cassette = cassette
+        self.encryption_key = encryption_key
+
+    def _request_payload(self, request: TransportRequest) -> Any:
+        payload = request.json()
+        if isinstance(payload, dict) and isinstance(payload.get("payload"), str):
+            try:
+                return json.loads(decrypt_data(payload["payload"], self.encryption_key))
+            except ValueError:
+                pass
+        return payload
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        request = TransportRequest(method, url, headers, body, params)
+        interaction: Dict[str, Any] = {
+            "method": method.upper(),
+            "path": request.path,
+            "params": redact_card_data(params),
+            "request": redact_card_data(self._request_payload(request)),
+        }
+
+        start = time.perf_counter()
+        try:
+            response = self.transport.send(method, url, headers, body=body, params=params, timeout=timeout)
+        except PayAgencyError as e:
+            interaction.update(
+                elapsed=round(time.perf_counter() - start, 6), error=type(e).__name__, message=e.message
+            )
+            self.cassette.append(interaction)
+            raise
+
+        interaction.update(
+            elapsed=round(time.perf_counter() - start, 6),
+            status=response.status_code,
+            headers={"Content-Type": response.headers.get("Content-Type", "application/json")},
+            response=redact_card_data(_decode_body(response.content)),
+        )
+        self.cassette.append(interaction)
+        return response
+
+    def preconnect(self, url: str, connections: int, timeout: Optional[float] = None) -> int:
+        return self.transport.preconnect(url, connections, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.transport.stats()
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Transport serving responses from a cassette
+
+    Requests are matched by method and path (and query parameters with
+    ``match_params``), and each match is served in recorded order.
+
+    Args:
+        cassette: Cassette or path of a saved cassette
+        speed: Replay latency as the recorded latency divided by ``speed``
+            (1.0 for recorded timing, 10.0 for ten times faster); None to
+            respond immediately (default: None)
+        loop: Start again from the first matching interaction once all have
+            been served, instead of failing (default: False)
+        match_params: Also match on query parameters (default: False)
+    """
+
+    def __init__(
+        self,
+        cassette: Union[Cassette, str],
+        speed: Optional[float] = None,
+        loop: bool = False,
+        match_params: bool = False
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette.load(cassette)
+        self.speed = speed
+        self.loop = loop
+        self.match_params = match_params
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, ...], Deque[Dict[str, Any]]] = {}
+        self._served = 0
+        self._rewind()
+
+    def _key(self, method: str, path: str, params: Any) -> Tuple[str, ...]:
+        key: Tuple[str, ...] = (method.upper(), path)
+        if self.match_params:
+            key += (json.dumps(params, sort_keys=True),)
+        return key
+
+    def _rewind(self, key: Optional[Tuple[str, ...]] = None) -> None:
+        for interaction in self.cassette.interactions:
+            interaction_key = self._key(interaction["method"], interaction["path"], interaction.get("params"))
+            if key is None or interaction_key == key:
+                self._queues.setdefault(interaction_key, deque()).append(interaction)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        request = TransportRequest(method, url, headers, body, params)
+        key = self._key(method, request.path, redact_card_data(params))
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue and self.loop and queue is not None:
+                self._rewind(key)
+            if not queue:
+                raise PayAgencyNetworkError(f"No recorded response for {method.upper()} {request.path}")
+            interaction = queue.popleft()
+            self._served += 1
+
+        if self.speed is not None:
+            time.sleep(interaction["elapsed"] / self.speed)
+
+        if "error" in interaction:
+            error_class = getattr(exceptions, interaction["error"], PayAgencyNetworkError)
+            raise error_class(interaction["message"])
+
+        return TransportResponse(
+            interaction["status"],
+            interaction["headers"],
+            json.dumps(interaction["response"]).encode("utf-8"),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": "replay",
+                "recorded": len(self.cassette),
+                "served": self._served,
+                "remaining": sum(len(queue) for queue in self._queues.values()),
+            }
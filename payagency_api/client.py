@@ -2,11 +2,73 @@
 Main PayAgency API client
 """
 
+import asyncio
+import itertools
+import socket
+import time
+from concurrent.futures import Executor
+from contextlib import ExitStack, contextmanager, nullcontext
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+from urllib.parse import urlsplit
+
 import requests
-from typing import Dict, Any, Optional
 
-from .exceptions import PayAgencyAPIError, PayAgencyNetworkError
-from .utils import validate_config, get_environment, normalize_base_url, prepare_request_data
+from . import types as api_types
+
+from .cassette import Cassette, RecordingTransport
+from .codec import JsonCodec, get_codec
+from .compression import CompressionPolicy
+from .exceptions import (
+    PayAgencyError,
+    PayAgencyAPIError,
+    PayAgencyBatchError,
+    PayAgencyDeclinedError,
+    PayAgencyInvalidRequestError,
+    PayAgencyRateLimitError,
+    PayAgencyServerError,
+    PayAgencyTimeoutError,
+)
+from .utils import (
+    validate_config,
+    get_environment,
+    normalize_base_url,
+    encrypt_data,
+    prepare_request_data,
+    prepare_request_data_batch,
+)
+from .hedging import HedgingPolicy
+from .limits import ConcurrencyLimiter
+from .profiling import Profiler
+from .scheduling import PriorityScheduler, resolve_priority
+from .streaming import JsonItemStream
+from .validation import get_validator, validate_input
+from .idempotency import IdempotencyStore, IDEMPOTENCY_HEADER, generate_idempotency_key, idempotency_namespace
+from .transports import (
+    Transport,
+    AsyncTransport,
+    TransportResponse,
+    RequestsTransport,
+    Urllib3Transport,
+    HttpxTransport,
+)
 from .modules.payment import Payment
 from .modules.payout import Payout  
 from .modules.payment_link import PaymentLink
@@ -16,15 +78,127 @@ from .modules.refund import Refund
 from .types.refund import RefundInput, RefundResponse
 
 
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Shared no-op context used for phases when profiling is off
+_NOT_PROFILED = nullcontext()
+
+# Response "status" values that mean the gateway declined the operation
+DECLINED_STATUSES = frozenset({"DECLINED", "BLOCKED"})
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _api_error(response: TransportResponse, error_data: Dict[str, Any]) -> PayAgencyAPIError:
+    status_code = response.status_code
+    error_class: Type[PayAgencyAPIError]
+    if status_code == 429:
+        error_class = PayAgencyRateLimitError
+    elif status_code >= 500:
+        error_class = PayAgencyServerError
+    elif status_code == 402 or error_data.get("status") in DECLINED_STATUSES:
+        error_class = PayAgencyDeclinedError
+    elif status_code in (400, 422):
+        error_class = PayAgencyInvalidRequestError
+    else:
+        error_class = PayAgencyAPIError
+    
+    return error_class(
+        message=error_data.get("message", f"HTTP {status_code} error"),
+        status_code=status_code,
+        response=error_data,
+        # 408: the server gave up waiting for the request, so it was not processed
+        retryable=True if status_code == 408 else None,
+        retry_after=_retry_after(response.headers),
+    )
+
+
+def build_transport(
+    transport: Union[str, Transport] = "requests",
+    session_mode: str = "shared",
+    session_shards: int = 4,
+    pool_maxsize: int = 10
+) -> Transport:
+    """
+    Resolve a transport name to a transport
+    
+    Args:
+        transport: "requests" (default), "urllib3", "http2" (requires httpx) or a Transport
+        session_mode: "shared", "thread" or "sharded" (default: "shared")
+        session_shards: Number of sessions in "sharded" mode (default: 4)
+        pool_maxsize: Connections kept per session (default: 10)
+        
+    Returns:
+        Transport instance
+        
+    Raises:
+        ValueError: If the transport name is unknown
+    """
+    if isinstance(transport, Transport):
+        return transport
+    if transport == "requests":
+        return RequestsTransport(
+            session_mode=session_mode,
+            session_shards=session_shards,
+            pool_maxsize=pool_maxsize,
+        )
+    if transport == "urllib3":
+        return Urllib3Transport(pool_maxsize=pool_maxsize)
+    if transport == "http2":
+        return HttpxTransport(max_connections=pool_maxsize)
+    raise ValueError("Transport must be 'requests', 'urllib3', 'http2' or a Transport instance")
+
+
 class PayAgencyApi:
     """
     Main PayAgency API client
     
+    A client can be shared between threads: configuration is read-only after
+    construction, the API modules are stateless, and HTTP sessions are handed
+    out by a ``SessionPool``. In the default "shared" mode all threads use one
+    session without locking; "thread" gives each thread its own session and
+    "sharded" spreads requests over the least busy of ``session_shards`` sessions.
+    Contention metrics are available from ``session_stats()``.
+    
+    HTTP is delegated to a transport (see ``payagency_api.transports``):
+    "requests" (default), "urllib3", "http2" (httpx, multiplexing concurrent
+    requests over a few connections) or any ``Transport`` instance.
+    ``amake_request`` uses ``async_transport``.
+    
     Args:
         encryption_key: 32-character encryption key for payload encryption
         secret_key: Your API secret key (PA_TEST for test, PA_LIVE for live)
         base_url: PayAgency API base URL (optional, defaults to https://backend.pay.agency)
         timeout: Request timeout in seconds (default: 15)
+        idempotency_store: Local store used to deduplicate POST submissions (optional)
+        session_mode: "shared", "thread" or "sharded" (default: "shared")
+        session_shards: Number of sessions in "sharded" mode (default: 4)
+        pool_maxsize: Connections kept per session (default: 10)
+        transport: "requests" (default), "urllib3", "http2" (requires httpx) or a Transport
+        async_transport: Transport used by ``amake_request`` (optional)
+        json_codec: JSON codec name ("auto", "orjson", "msgspec", "ujson", "json") or instance (default: "auto")
+        validate_inputs: Validate payment, payout and crypto inputs before sending (default: True)
+        check_luhn: Also reject card numbers failing the Luhn check; gateway test
+            cards may not pass it (default: False)
+        hedging: Policy for hedging slow idempotent (GET) requests (optional)
+        concurrency_limiter: Adaptive per-endpoint limit on requests in flight (optional)
+        scheduler: Priority scheduler sharing connections between request classes (optional)
+        compression: Response encoding negotiation and request body compression
+            (default: accept every encoding the installed libraries can decode,
+            send requests uncompressed)
+        profiler: Records CPU and wall time per request phase (optional)
     """
     
     def __init__(
@@ -32,7 +206,21 @@ class PayAgencyApi:
         encryption_key: str,
         secret_key: str,
         base_url: Optional[str] = None,
-        timeout: int = 15
+        timeout: int = 15,
+        idempotency_store: Optional[IdempotencyStore] = None,
+        session_mode: str = "shared",
+        session_shards: int = 4,
+        pool_maxsize: int = 10,
+        transport: Union[str, Transport] = "requests",
+        async_transport: Optional[AsyncTransport] = None,
+        json_codec: Union[str, JsonCodec] = "auto",
+        validate_inputs: bool = True,
+        check_luhn: bool = False,
+        hedging: Optional[HedgingPolicy] = None,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        compression: Optional[CompressionPolicy] = None,
+        profiler: Optional[Profiler] = None
     ):
         # Validate configuration
         validate_config(encryption_key, secret_key)
@@ -41,6 +229,17 @@ class PayAgencyApi:
         self.secret_key = secret_key
         self.environment = get_environment(secret_key)
         self.timeout = timeout
+        self.idempotency_store = idempotency_store
+        # Keeps merchants sharing a store (see PayAgencyClientPool) apart
+        self._idempotency_namespace = idempotency_namespace(secret_key)
+        self.codec = get_codec(json_codec)
+        self.validate_inputs = validate_inputs
+        self.check_luhn = check_luhn
+        self.hedging = hedging
+        self.concurrency_limiter = concurrency_limiter
+        self.scheduler = scheduler
+        self.compression = compression if compression is not None else CompressionPolicy()
+        self.profiler = profiler
         
         # Set base URL
         if base_url is None:
@@ -48,13 +247,15 @@ class PayAgencyApi:
         else:
             self.base_url = normalize_base_url(base_url)
         
-        # Configure session
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Configure transport
+        self._headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {secret_key}",
-        })
-        self.session.timeout = timeout
+        }
+        if self.compression.accept_encoding:
+            self._headers["Accept-Encoding"] = self.compression.accept_encoding
+        self._transport = build_transport(transport, session_mode, session_shards, pool_maxsize)
+        self.async_transport = async_transport
         
         # Initialize API modules
         self._payment = Payment(self)
@@ -64,6 +265,130 @@ class PayAgencyApi:
         self._txn = Transaction(self)
         self._refund = Refund(self)
     
+    @property
+    def transport(self) -> Transport:
+        """HTTP transport"""
+        return self._transport
+    
+    @property
+    def session(self) -> Optional[requests.Session]:
+        """HTTP session used by the calling thread (None unless using the requests transport)"""
+        return getattr(self._transport, "session", None)
+    
+    def session_stats(self) -> Dict[str, Any]:
+        """
+        Get session pool and lock contention metrics
+        
+        Returns:
+            Session mode, session count and lock wait metrics
+        """
+        return self._transport.stats()
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self._transport.close()
+    
+    def warmup(
+        self,
+        connections: int = 4,
+        timeout: Optional[float] = None,
+        preload: Optional[Mapping[str, Callable[["PayAgencyApi"], Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Pay one-off connection and initialization costs before the first request
+        
+        Resolves the API host, opens idle keep-alive connections to it
+        (including the TLS handshake), runs the encryption and JSON codec once
+        and compiles the input validators, then calls each ``preload``
+        function with the client, for example to fill an application cache of
+        crypto currencies. Failures are reported rather than raised, so a
+        warmup problem never stops a service from starting.
+        
+        Args:
+            connections: Keep-alive connections to open (default: 4; at most
+                ``pool_maxsize`` per session, and one for the "http2" transport)
+            timeout: Connect timeout in seconds (default: the client's timeout)
+            preload: Functions to call with the client, by name (optional)
+            
+        Returns:
+            Report with the resolved ``addresses``, ``connections`` open,
+            ``validators`` compiled, ``preload`` results by name, seconds
+            spent per step in ``timings`` and failed steps in ``errors``
+        """
+        timings: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+        
+        def run(step: str, func: Callable[[], Any], default: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func()
+            except Exception as e:
+                errors[step] = f"{type(e).__name__}: {e}"
+                return default
+            finally:
+                timings[step] = time.perf_counter() - start
+        
+        def resolve() -> List[str]:
+            url = urlsplit(self.base_url)
+            port = url.port or (443 if url.scheme == "https" else 80)
+            return sorted({str(info[4][0]) for info in socket.getaddrinfo(url.hostname, port, type=socket.SOCK_STREAM)})
+        
+        def init_encryption() -> None:
+            encrypt_data(self.codec.dumps({"warmup": True}), self.encryption_key)
+            self.codec.loads(b'{"warmup": true}')
+        
+        def compile_validators() -> int:
+            schemas = [getattr(api_types, name) for name in api_types.__all__ if name.endswith("Input")]
+            for schema in schemas:
+                get_validator(schema, self.check_luhn)
+            return len(schemas)
+        
+        start = time.perf_counter()
+        report: Dict[str, Any] = {
+            "addresses": run("dns", resolve, []),
+            "connections": run(
+                "connections",
+                lambda: self._transport.preconnect(
+                    self.base_url, connections, self.timeout if timeout is None else timeout
+                ),
+                0,
+            ),
+        }
+        run("encryption", init_encryption, None)
+        report["validators"] = run("validators", compile_validators, 0) if self.validate_inputs else 0
+        report["preload"] = {
+            name: run(f"preload.{name}", partial(func, self), None) for name, func in (preload or {}).items()
+        }
+        timings["total"] = time.perf_counter() - start
+        report["timings"] = timings
+        report["errors"] = errors
+        return report
+    
+    @contextmanager
+    def record(self, path: Optional[str] = None) -> Iterator[Cassette]:
+        """
+        Record the requests made in a block for replay with ``ReplayTransport``
+        
+        Requests are recorded with their decrypted payloads and responses,
+        with card data redacted. Recording swaps the client's transport, so
+        do not start it while other threads are using the client.
+        
+        Args:
+            path: File the cassette is saved to when the block exits (optional)
+            
+        Yields:
+            Cassette receiving the interactions
+        """
+        cassette = Cassette()
+        transport = self._transport
+        self._transport = RecordingTransport(transport, cassette, self.encryption_key)
+        try:
+            yield cassette
+        finally:
+            self._transport = transport
+            if path is not None:
+                cassette.save(path)
+    
     @property
     def payment(self) -> Payment:
         """Payment operations"""
@@ -100,6 +425,48 @@ class PayAgencyApi:
             Refund response
         """
         return self._refund.create(data)
+
+    def validate(self, schema: type, data: Any) -> None:
+        """
+        Validate request data against an input schema, unless ``validate_inputs`` is off
+
+        Args:
+            schema: TypedDict class from ``payagency_api.types``
+            data: Request data
+
+        Raises:
+            PayAgencyValidationError: If the data is invalid
+        """
+        if self.validate_inputs:
+            with self._phase("validate"):
+                validate_input(schema, data, self.check_luhn)
+    
+    def _phase(self, name: str) -> ContextManager[None]:
+        return self.profiler.phase(name) if self.profiler is not None else _NOT_PROFILED
+    
+    def _operation(self, method: str, endpoint: str) -> ContextManager[None]:
+        if self.profiler is None:
+            return _NOT_PROFILED
+        return self.profiler.operation(f"{method.upper()} {endpoint}")
+
+    def prepare_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        processes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Serialize and encrypt many payloads across a process pool
+        
+        Send the results with ``make_request(..., prepared=True)``.
+        
+        Args:
+            items: Request data
+            processes: Worker processes (default: CPU count)
+            
+        Returns:
+            Ready-to-send request bodies, in input order
+        """
+        return prepare_request_data_batch(items, self.encryption_key, processes=processes, codec=self.codec)
     
     def make_request(
         self,
@@ -107,67 +474,480 @@ class PayAgencyApi:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
-        skip_encryption: bool = False
+        skip_encryption: bool = False,
+        idempotency_key: Optional[str] = None,
+        prepared: bool = False,
+        priority: Optional[str] = None,
+        idempotent: bool = False
     ) -> Dict[str, Any]:
         """
         Make a request to the PayAgency API
         
+        With a ``hedging`` policy, slow requests using a hedgeable method are
+        duplicated after the policy's delay and the first response wins. With a
+        ``concurrency_limiter``, requests over the endpoint's current limit
+        wait for a slot or are shed. With a ``scheduler``, requests first
+        wait for a slot in their priority class.
+        
+        Errors raised while making the request carry ``endpoint``, ``elapsed``,
+        ``attempts`` (requests sent, counting hedges; 0 if the request was
+        shed before sending) and ``retryable``.
+        
         Args:
             method: HTTP method
             endpoint: API endpoint
             data: Request data
             params: Query parameters
             skip_encryption: Whether to skip encryption
+            idempotency_key: Idempotency key sent with the request. When an
+                idempotency store is configured, a request whose key was
+                already recorded returns the recorded response without being
+                sent again.
+            prepared: Whether data is already a request body from
+                ``prepare_batch``. Encrypted bodies cannot be used to derive
+                an idempotency key, so pass ``idempotency_key`` explicitly.
+            priority: Scheduling class used when no ``request_priority()``
+                block is active (default: "interactive")
+            idempotent: Whether the request is a submission that is safe to
+                deduplicate; with an idempotency store and no
+                ``idempotency_key``, a key is derived from the payload
+                (default: False)
             
         Returns:
             Response data
             
         Raises:
-            PayAgencyAPIError: For API errors
-            PayAgencyNetworkError: For network errors
+            PayAgencyAPIError: For API errors (``PayAgencyRateLimitError``,
+                ``PayAgencyServerError``, ``PayAgencyDeclinedError`` or
+                ``PayAgencyInvalidRequestError`` where applicable)
+            PayAgencyNetworkError: For network errors (``PayAgencyConnectionError``,
+                ``PayAgencyTimeoutError`` or ``PayAgencyTLSError`` where the cause is known)
+            PayAgencyOverloadError: If the concurrency limiter or scheduler shed the request
         """
-        url = f"{self.base_url}{endpoint}"
+        with self._operation(method, endpoint):
+            url, headers, body, idempotency_key, recorded = self._prepare_request(
+                method, endpoint, data, skip_encryption, idempotency_key, prepared, idempotent
+            )
+            if recorded is not None:
+                return recorded
+            
+            # Counts transport sends; a hedged request may send twice, concurrently
+            sends = itertools.count(1)
+            
+            def send() -> TransportResponse:
+                next(sends)
+                return self._transport.send(
+                    method, url, headers=headers, body=body, params=params, timeout=self.timeout
+                )
+            
+            attempt: Callable[[], TransportResponse] = send
+            hedging = self.hedging
+            if hedging is not None and hedging.applies(method):
+                def hedged() -> TransportResponse:
+                    return hedging.execute(send)
+                
+                attempt = hedged
+            
+            start = time.perf_counter()
+            try:
+                if self.scheduler is None:
+                    response = self._send_limited(endpoint, attempt)
+                else:
+                    with self.scheduler.acquire(resolve_priority(priority)):
+                        response = self._send_limited(endpoint, attempt)
+                return self._parse_response(response, idempotency_key)
+            except PayAgencyError as e:
+                self._annotate_error(e, method, endpoint, idempotency_key, start, next(sends) - 1)
+                raise
+    
+    def stream_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        key: str = "data",
+        priority: Optional[str] = None
+    ) -> JsonItemStream:
+        """
+        Make a request and stream the elements of an array in the response
         
-        # Prepare request data
-        if data is not None:
-            request_data = prepare_request_data(data, self.encryption_key, skip_encryption)
-        else:
-            request_data = None
+        The request is sent when iteration starts, and elements are parsed
+        as the body arrives rather than after it has been read. The
+        connection (and any scheduler or concurrency limiter slot) is held
+        until iteration finishes or the stream is closed.
         
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            params: Query parameters
+            key: Response member holding the array to stream (default: "data")
+            priority: Scheduling class used when no ``request_priority()``
+                block is active (default: "interactive")
+            
+        Returns:
+            Stream of array elements; the response's other members are in
+            ``fields`` once iteration has finished
+            
+        Raises:
+            PayAgencyAPIError: While iterating, for API errors or invalid JSON
+            PayAgencyNetworkError: While iterating, for network errors
+        """
+        url, headers, _, _, _ = self._prepare_request(method, endpoint, None, True, None, False, False)
+        return JsonItemStream(self._stream_body(method, endpoint, url, headers, params, priority), key)
+    
+    def _stream_body(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        priority: Optional[str]
+    ) -> Iterator[bytes]:
+        start = time.perf_counter()
+        attempts = 0
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=request_data,
-                params=params
+            with ExitStack() as stack:
+                if self.scheduler is not None:
+                    stack.enter_context(self.scheduler.acquire(resolve_priority(priority)))
+                permit = None
+                if self.concurrency_limiter is not None:
+                    permit = stack.enter_context(self.concurrency_limiter.acquire(endpoint))
+                
+                attempts = 1
+                response = stack.enter_context(self._transport.stream(
+                    method, url, headers=headers, params=params, timeout=self.timeout
+                ))
+                if response.status_code >= 400:
+                    if permit is not None and (response.status_code == 429 or response.status_code >= 500):
+                        permit.drop()
+                    self._parse_response(response.read(), None)
+                
+                decoded_bytes = 0
+                try:
+                    for chunk in response.iter_bytes():
+                        decoded_bytes += len(chunk)
+                        yield chunk
+                finally:
+                    # The parser closes the stream once the document ends, possibly mid-loop
+                    self.compression.record(
+                        response.headers.get("Content-Encoding"), response.wire_bytes, decoded_bytes
+                    )
+        except PayAgencyError as e:
+            self._annotate_error(e, method, endpoint, None, start, attempts)
+            raise
+    
+    def _send_limited(self, endpoint: str, attempt: Callable[[], TransportResponse]) -> TransportResponse:
+        if self.concurrency_limiter is None:
+            with self._phase("send"):
+                return attempt()
+        
+        with self.concurrency_limiter.acquire(endpoint) as permit:
+            with self._phase("send"):
+                response = attempt()
+            if response.status_code == 429 or response.status_code >= 500:
+                permit.drop()
+            return response
+    
+    async def amake_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        skip_encryption: bool = False,
+        idempotency_key: Optional[str] = None,
+        prepared: bool = False,
+        idempotent: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Make a request to the PayAgency API using the async transport
+        
+        Takes the same arguments as ``make_request``.
+        
+        Returns:
+            Response data
+            
+        Raises:
+            ValueError: If no async transport is configured
+            PayAgencyAPIError: For API errors
+            PayAgencyNetworkError: For network errors
+        """
+        if self.async_transport is None:
+            raise ValueError("amake_request requires an async_transport")
+        
+        with self._operation(method, endpoint):
+            url, headers, body, idempotency_key, recorded = self._prepare_request(
+                method, endpoint, data, skip_encryption, idempotency_key, prepared, idempotent
             )
+            if recorded is not None:
+                return recorded
+            
+            start = time.perf_counter()
+            try:
+                with self._phase("send"):
+                    response = await self.async_transport.send(
+                        method, url, headers=headers, body=body, params=params, timeout=self.timeout
+                    )
+                return self._parse_response(response, idempotency_key)
+            except PayAgencyError as e:
+                self._annotate_error(e, method, endpoint, idempotency_key, start, 1)
+                raise
+    
+    def abatch_request(
+        self,
+        method: str,
+        endpoint: str,
+        items: Union[Iterable[Mapping[str, Any]], AsyncIterable[Mapping[str, Any]]],
+        schema: Optional[type] = None,
+        concurrency: int = 10,
+        executor: Optional[Executor] = None,
+        return_exceptions: bool = True,
+        idempotent: bool = False
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Send many requests using the async transport, yielding results as they complete
+        
+        Items are read from ``items`` as slots free up, so at most
+        ``concurrency`` requests are in flight and an async source is never
+        read far ahead. Each payload is validated against ``schema`` and then
+        serialized and encrypted in ``executor`` (the event loop's default
+        thread pool unless given; a ``ProcessPoolExecutor`` spreads the work
+        over CPUs), keeping that CPU work off the event loop. With
+        ``idempotent`` and an idempotency store, each item's key is derived
+        from its payload as by ``make_request`` (also in ``executor``) and
+        recorded responses are returned without encrypting the item.
+        Closing the iterator cancels the requests still in flight.
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            items: Request data, as an iterable or async iterable
+            schema: TypedDict class to validate each item against (optional)
+            concurrency: Requests in flight at once (default: 10)
+            executor: Executor for serialization and encryption (optional)
+            return_exceptions: Yield a failed request's ``PayAgencyError`` as
+                its result; otherwise no new requests start after a failure,
+                the ones in flight are awaited and a ``PayAgencyBatchError``
+                is raised once they finish (default: True)
+            idempotent: Whether the items are submissions that are safe to
+                deduplicate (default: False)
             
-            # Check for HTTP errors
-            if response.status_code >= 400:
+        Returns:
+            Async iterator of ``(index, result)`` pairs in completion order,
+            where ``index`` is the item's position in ``items``
+            
+        Raises:
+            ValueError: If concurrency is less than 1 or no async transport is configured
+            PayAgencyBatchError: While iterating, without ``return_exceptions``,
+                carrying every result and error of the batch
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if self.async_transport is None:
+            raise ValueError("abatch_request requires an async_transport")
+        
+        return self._abatch(method, endpoint, items, schema, concurrency, executor, return_exceptions, idempotent)
+    
+    async def _abatch(
+        self,
+        method: str,
+        endpoint: str,
+        items: Union[Iterable[Mapping[str, Any]], AsyncIterable[Mapping[str, Any]]],
+        schema: Optional[type],
+        concurrency: int,
+        executor: Optional[Executor],
+        return_exceptions: bool,
+        idempotent: bool
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        if hasattr(items, "__aiter__"):
+            source = items.__aiter__()
+            
+            async def next_item() -> Any:
+                return await source.__anext__()
+        else:
+            sync_source = iter(items)
+            
+            async def next_item() -> Any:
                 try:
-                    error_data = response.json()
-                except ValueError:
-                    error_data = {"message": response.text or "Unknown error"}
+                    return next(sync_source)
+                except StopIteration:
+                    raise StopAsyncIteration from None
+        
+        pending: Set[asyncio.Future] = set()
+        index = 0
+        exhausted = False
+        # Without return_exceptions, outcomes are kept for the error raised at the end
+        results: List[Tuple[int, Any]] = []
+        errors: List[Tuple[int, PayAgencyError]] = []
+        try:
+            while True:
+                # After a failure, requests already sent are awaited but no new ones start
+                while not exhausted and not errors and len(pending) < concurrency:
+                    try:
+                        data = await next_item()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(
+                        self._abatch_item(index, method, endpoint, data, schema, executor, idempotent)
+                    ))
+                    index += 1
+                if not pending:
+                    break
                 
-                raise PayAgencyAPIError(
-                    message=error_data.get("message", f"HTTP {response.status_code} error"),
-                    status_code=response.status_code,
-                    response=error_data
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for item_index, result in sorted((task.result() for task in done), key=lambda pair: pair[0]):
+                    if return_exceptions:
+                        yield item_index, result
+                    elif isinstance(result, PayAgencyError):
+                        errors.append((item_index, result))
+                    else:
+                        results.append((item_index, result))
+                        yield item_index, result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        
+        if errors:
+            raise PayAgencyBatchError(
+                f"{len(errors)} of {len(results) + len(errors)} batch requests failed", results, errors
+            )
+    
+    async def _abatch_item(
+        self,
+        index: int,
+        method: str,
+        endpoint: str,
+        item: Mapping[str, Any],
+        schema: Optional[type],
+        executor: Optional[Executor],
+        idempotent: bool
+    ) -> Tuple[int, Any]:
+        loop = asyncio.get_running_loop()
+        # Snapshot the item so the caller changing it while it waits cannot alter what is sent
+        data = dict(item)
+        try:
+            if schema is not None:
+                self.validate(schema, data)
+            idempotency_key = None
+            store = self.idempotency_store
+            if store is not None and idempotent:
+                # Look for a recorded response before paying for encryption
+                idempotency_key = await loop.run_in_executor(
+                    executor,
+                    partial(generate_idempotency_key, method, endpoint, data, self._idempotency_namespace)
                 )
+                recorded = store.get(self._store_key(idempotency_key))
+                if recorded is not None:
+                    return index, recorded
             
-            # Parse response
+            body = await loop.run_in_executor(
+                executor, partial(prepare_request_data, data, self.encryption_key, codec=self.codec)
+            )
+            result = await self.amake_request(
+                method, endpoint, body, idempotency_key=idempotency_key, prepared=True
+            )
+        except PayAgencyError as e:
+            return index, e
+        return index, result
+    
+    def _prepare_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        skip_encryption: bool,
+        idempotency_key: Optional[str],
+        prepared: bool,
+        idempotent: bool
+    ) -> Tuple[str, Dict[str, str], Optional[bytes], Optional[str], Optional[Dict[str, Any]]]:
+        url = f"{self.base_url}{endpoint}"
+        
+        # Resolve idempotency key and short-circuit duplicate submissions
+        store = self.idempotency_store
+        if store is not None:
+            with self._phase("idempotency"):
+                if idempotency_key is None and idempotent and not prepared:
+                    idempotency_key = generate_idempotency_key(method, endpoint, data, self._idempotency_namespace)
+                
+                recorded = store.get(self._store_key(idempotency_key)) if idempotency_key is not None else None
+            if recorded is not None:
+                return url, {}, None, idempotency_key, recorded
+        
+        with self._phase("headers"):
+            headers = dict(self._headers)
+            if idempotency_key is not None:
+                headers[IDEMPOTENCY_HEADER] = idempotency_key
+        
+        # Prepare request data
+        request_data: Optional[Dict[str, Any]]
+        if data is not None and not prepared and not skip_encryption:
+            with self._phase("serialize"):
+                payload = self.codec.dumps(data)
+            with self._phase("encrypt"):
+                request_data = {"payload": encrypt_data(payload, self.encryption_key)}
+        else:
+            request_data = data
+        
+        with self._phase("encode"):
+            body = self.codec.dumps(request_data) if request_data is not None else None
+            if body is not None:
+                body, encoding = self.compression.compress_body(body)
+                if encoding is not None:
+                    headers["Content-Encoding"] = encoding
+        return url, headers, body, idempotency_key, None
+    
+    @staticmethod
+    def _annotate_error(
+        error: PayAgencyError,
+        method: str,
+        endpoint: str,
+        idempotency_key: Optional[str],
+        start: float,
+        attempts: int
+    ) -> None:
+        error.endpoint = endpoint
+        error.attempts = attempts
+        error.elapsed = time.perf_counter() - start
+        if isinstance(error, PayAgencyTimeoutError):
+            # The request may have been processed; only repeat it if that is safe
+            error.retryable = method.upper() in IDEMPOTENT_METHODS or idempotency_key is not None
+    
+    def _parse_response(self, response: TransportResponse, idempotency_key: Optional[str]) -> Dict[str, Any]:
+        self.compression.record(response.headers.get("Content-Encoding"), response.wire_bytes, len(response.content))
+        
+        # Check for HTTP errors
+        if response.status_code >= 400:
             try:
-                return response.json()
+                with self._phase("decode"):
+                    error_data = self.codec.loads(response.content)
             except ValueError:
-                raise PayAgencyAPIError(
-                    message="Invalid JSON response from server",
-                    status_code=response.status_code,
-                    response={"raw_response": response.text}
-                )
-                
-        except requests.RequestException as e:
-            raise PayAgencyNetworkError(
-                message=f"Network error: {str(e)}",
-                status_code=None,
-                response=None
+                error_data = None
+            if not isinstance(error_data, dict):
+                error_data = {"message": response.text or "Unknown error"}
+            
+            raise _api_error(response, error_data)
+        
+        # Parse response
+        try:
+            with self._phase("decode"):
+                result = self.codec.loads(response.content)
+        except ValueError:
+            raise PayAgencyAPIError(
+                message="Invalid JSON response from server",
+                status_code=response.status_code,
+                response={"raw_response": response.text}
             )
+        
+        store = self.idempotency_store
+        if store is not None and idempotency_key is not None:
+            store.set(self._store_key(idempotency_key), result)
+        
+        return result
+    
+    def _store_key(self, idempotency_key: str) -> str:
+        # Caller-supplied keys such as order IDs can repeat across merchants
+        return f"{self._idempotency_namespace}:{idempotency_key}"
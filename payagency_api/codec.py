@@ -0,0 +1,162 @@
+"""
+Pluggable JSON codecs
+
+The client serializes payloads (before encryption and for unencrypted
+routes) and parses responses with one codec. ``get_codec("auto")`` picks the
+fastest installed library: orjson, msgspec, ujson, then the standard library.
+"""
+
+import json
+from typing import Any, Dict, Type, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+try:
+    import ujson  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+
+class JsonCodec:
+    """
+    JSON codec using the standard library
+
+    Output is compact (no whitespace). Decoding errors raise ``ValueError``
+    for every codec.
+    """
+
+    name = "json"
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the codec's library is installed"""
+        return True
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Serialize an object
+
+        Args:
+            obj: Object to serialize
+
+        Returns:
+            UTF-8 encoded JSON
+        """
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Parse JSON
+
+        Args:
+            data: JSON document
+
+        Returns:
+            Parsed object
+
+        Raises:
+            ValueError: If the document is not valid JSON
+        """
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec using orjson"""
+
+    name = "orjson"
+
+    @classmethod
+    def available(cls) -> bool:
+        return orjson is not None
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """JSON codec using msgspec"""
+
+    name = "msgspec"
+
+    @classmethod
+    def available(cls) -> bool:
+        return msgspec is not None
+
+    def dumps(self, obj: Any) -> bytes:
+        encoded: bytes = msgspec.json.encode(obj)
+        return encoded
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e))
+
+
+class UjsonCodec(JsonCodec):
+    """JSON codec using ujson"""
+
+    name = "ujson"
+
+    @classmethod
+    def available(cls) -> bool:
+        return ujson is not None
+
+    def dumps(self, obj: Any) -> bytes:
+        encoded: str = ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+        return encoded.encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+
+CODECS: Dict[str, Type[JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "ujson": UjsonCodec,
+    "json": JsonCodec,
+}
+
+
+def get_codec(codec: Union[str, JsonCodec] = "auto") -> JsonCodec:
+    """
+    Resolve a JSON codec
+
+    Args:
+        codec: Codec name ("auto", "orjson", "msgspec", "ujson", "json") or instance
+
+    Returns:
+        Codec instance
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the named codec's library is not installed
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec == "auto":
+        for candidate in CODECS.values():
+            if candidate.available():
+                return candidate()
+
+    codec_class = CODECS.get(codec)
+    if codec_class is None:
+        raise ValueError(f"JSON codec must be 'auto' or one of {', '.join(CODECS)}")
+    if not codec_class.available():
+        raise ImportError(f"{codec} is not installed; install it with 'pip install {codec}'")
+    return codec_class()
@@ -0,0 +1,458 @@
+"""
+Compact columnar storage for transaction history
+
+``TransactionColumns`` stores transactions fetched with ``get_transactions``
+column by column instead of as one dict per transaction:
+
+- ``amount`` and ``converted_amount`` are exact scaled integers in ``array('q')``
+- low-cardinality fields (currency, status, transaction type, country, ...)
+  are dictionary-encoded into small integer code arrays whose interned
+  categories are stored once
+- remaining string fields (IDs, names, dates, ...) are nearly unique per row
+  and kept in plain lists
+
+Rows are materialized on demand through lightweight ``TransactionRow`` views.
+NumPy, pandas and Arrow conversions are available when those packages are
+installed.
+"""
+
+import sys
+from array import array
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .types.transaction import TransactionInfo, TransactionsResponse
+
+
+_NULL = -(2 ** 63)
+_MAX = 2 ** 63 - 1
+
+DECIMAL_FIELDS = ("amount", "converted_amount")
+
+CATEGORY_FIELDS = (
+    "currency",
+    "converted_currency",
+    "status",
+    "transaction_type",
+    "country",
+    "card_type",
+    "merchant_connector",
+)
+
+STRING_FIELDS = (
+    "transaction_id",
+    "order_id",
+    "first_name",
+    "last_name",
+    "email",
+    "card_number",
+    "created_at",
+    "transaction_date",
+    "chargeback_date",
+    "refund_date",
+    "suspicious_date",
+    "user",
+    "user_kyc",
+)
+
+FIELDS = DECIMAL_FIELDS + CATEGORY_FIELDS + STRING_FIELDS
+
+# Fields of a materialized row; "user_kyc" is folded back into "user"
+ROW_FIELDS = tuple(name for name in FIELDS if name != "user_kyc")
+
+
+def _parse_amount(value: Any) -> Optional[Decimal]:
+    if value is None or value == "":
+        return None
+
+    try:
+        number = Decimal(str(value))
+    except InvalidOperation:
+        number = None
+
+    if number is None or not number.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return number
+
+
+class _DecimalColumn:
+    """Exact decimal column stored as integers scaled by ``10 ** scale``"""
+
+    __slots__ = ("values", "scale")
+
+    def __init__(self) -> None:
+        self.values = array('q')
+        self.scale = 0
+
+    def scale_value(self, number: Optional[Decimal]) -> Tuple[int, int]:
+        """Scale a number for ``append`` without changing the column"""
+        if number is None:
+            return _NULL, self.scale
+
+        exponent = number.as_tuple().exponent
+        places = max(self.scale, -exponent if exponent < 0 else 0)  # type: ignore[operator]
+        value = int(number.scaleb(places))
+        if places > self.scale:
+            # Existing values are rescaled to the finer precision and must still fit
+            factor = 10 ** (places - self.scale)
+            largest = max((abs(v) for v in self.values if v != _NULL), default=0)
+            if largest * factor > _MAX:
+                raise ValueError(f"Amount precision out of range: {number}")
+        if not -_MAX <= value <= _MAX:
+            raise ValueError(f"Amount out of range: {number}")
+        return value, places
+
+    def append(self, scaled: Tuple[int, int]) -> None:
+        value, places = scaled
+        if places > self.scale:
+            factor = 10 ** (places - self.scale)
+            self.values = array('q', (v if v == _NULL else v * factor for v in self.values))
+            self.scale = places
+        self.values.append(value)
+
+    def get(self, index: int) -> Optional[Decimal]:
+        value = self.values[index]
+        if value == _NULL:
+            return None
+        return Decimal(value).scaleb(-self.scale)
+
+    def floats(self) -> List[float]:
+        divisor = 10 ** self.scale
+        return [float("nan") if v == _NULL else v / divisor for v in self.values]
+
+
+class _CategoryColumn:
+    """Dictionary-encoded string column; code 0 is reserved for None"""
+
+    __slots__ = ("codes", "categories", "_lookup")
+
+    def __init__(self) -> None:
+        self.codes = array('B')
+        self.categories: List[Optional[str]] = [None]
+        self._lookup: Dict[Optional[str], int] = {None: 0}
+
+    def append(self, value: Optional[str]) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(sys.intern(value) if isinstance(value, str) else value)
+            self._lookup[value] = code
+            if code > 0xFF and self.codes.typecode == 'B':
+                self.codes = array('H', self.codes)
+            elif code > 0xFFFF and self.codes.typecode == 'H':
+                self.codes = array('I', self.codes)
+        self.codes.append(code)
+
+    def get(self, index: int) -> Optional[str]:
+        return self.categories[self.codes[index]]
+
+
+class TransactionRow:
+    """
+    Read-only view of one transaction in a ``TransactionColumns`` table
+
+    Indexing a row returns values in the ``TransactionInfo`` shape, with
+    amounts formatted to the column's precision; use ``decimal()`` for exact
+    amounts.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "TransactionColumns", index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table._value(key, self._index)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a field value
+
+        Args:
+            key: Field name
+            default: Value returned for unknown fields
+
+        Returns:
+            Field value
+        """
+        if key not in ROW_FIELDS:
+            return default
+        return self[key]
+
+    def decimal(self, key: str = "amount") -> Optional[Decimal]:
+        """
+        Get an amount field as ``Decimal``
+
+        Args:
+            key: "amount" or "converted_amount"
+
+        Returns:
+            Exact amount, or None if missing
+        """
+        return self._table._decimals[key].get(self._index)
+
+    def to_dict(self) -> TransactionInfo:
+        """
+        Materialize the row as a ``TransactionInfo`` dict
+
+        Returns:
+            Transaction info
+        """
+        return {key: self[key] for key in ROW_FIELDS}  # type: ignore[return-value]
+
+    def __repr__(self) -> str:
+        return f"TransactionRow({self._index}, transaction_id={self['transaction_id']!r})"
+
+
+class TransactionColumns:
+    """
+    Columnar, memory-compact table of transactions
+
+    Args:
+        transactions: Initial transactions (optional)
+    """
+
+    def __init__(self, transactions: Optional[Iterable[TransactionInfo]] = None):
+        self._length = 0
+        self._decimals = {name: _DecimalColumn() for name in DECIMAL_FIELDS}
+        self._categories = {name: _CategoryColumn() for name in CATEGORY_FIELDS}
+        self._strings: Dict[str, List[Optional[str]]] = {name: [] for name in STRING_FIELDS}
+
+        if transactions is not None:
+            self.extend(transactions)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[TransactionsResponse]) -> "TransactionColumns":
+        """
+        Build a table from ``get_transactions`` responses
+
+        Args:
+            pages: Transactions responses
+
+        Returns:
+            Transaction table
+        """
+        table = cls()
+        for page in pages:
+            table.add_page(page)
+        return table
+
+    def add_page(self, page: TransactionsResponse) -> None:
+        """
+        Append all transactions of a ``get_transactions`` response
+
+        Args:
+            page: Transactions response
+        """
+        self.extend(page.get("data") or [])
+
+    def extend(self, transactions: Iterable[TransactionInfo]) -> None:
+        """
+        Append transactions
+
+        Args:
+            transactions: Transactions to append
+        """
+        for txn in transactions:
+            self.append(txn)
+
+    def append(self, txn: TransactionInfo) -> None:
+        """
+        Append a transaction
+
+        Args:
+            txn: Transaction to append
+
+        Raises:
+            ValueError: If an amount is not a valid decimal or does not fit the column
+        """
+        # Convert every field before appending any, so a bad row leaves the columns aligned
+        fields: Mapping[str, Any] = txn
+        scaled = [
+            column.scale_value(_parse_amount(fields.get(name))) for name, column in self._decimals.items()
+        ]
+
+        categories = []
+        for name in self._categories:
+            value = fields.get(name)
+            if name == "merchant_connector":
+                value = value.get("name") if value else None
+            categories.append(value)
+
+        user = fields.get("user") or {}
+        kyc = user.get("user_kyc") or {}
+        strings = []
+        for name in self._strings:
+            if name == "user":
+                strings.append(user.get("name"))
+            elif name == "user_kyc":
+                strings.append(kyc.get("name"))
+            else:
+                strings.append(fields.get(name))
+
+        for column, amount in zip(self._decimals.values(), scaled):
+            column.append(amount)
+        for category, value in zip(self._categories.values(), categories):
+            category.append(value)
+        for values, value in zip(self._strings.values(), strings):
+            values.append(value)
+        self._length += 1
+
+    def _value(self, key: str, index: int) -> Any:
+        if key in self._decimals:
+            amount = self._decimals[key].get(index)
+            # Fixed-point, as str() switches to exponent notation for small values
+            return None if amount is None else format(amount, "f")
+
+        if key in self._categories:
+            value = self._categories[key].get(index)
+            if key == "merchant_connector":
+                return None if value is None else {"name": value}
+            return value
+
+        if key == "user":
+            kyc = self._strings["user_kyc"][index]
+            return {"name": self._strings["user"][index], "user_kyc": {"name": kyc}}
+
+        if key in self._strings:
+            return self._strings[key][index]
+
+        raise KeyError(key)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> TransactionRow:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        for index in range(self._length):
+            yield TransactionRow(self, index)
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Get a column as a list
+
+        Amount columns are returned as ``Decimal`` values and ``user`` as the
+        user name.
+
+        Args:
+            name: Field name
+
+        Returns:
+            Column values
+        """
+        if name in self._decimals:
+            column = self._decimals[name]
+            return [column.get(i) for i in range(self._length)]
+
+        if name in self._categories:
+            category = self._categories[name]
+            return [category.categories[code] for code in category.codes]
+
+        if name in self._strings:
+            return list(self._strings[name])
+
+        raise KeyError(name)
+
+    def categories(self, name: str) -> List[Optional[str]]:
+        """
+        Get the distinct values of a dictionary-encoded column
+
+        Args:
+            name: Field name
+
+        Returns:
+            Distinct values, excluding None
+        """
+        return self._categories[name].categories[1:]
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Convert to NumPy arrays
+
+        Amounts become ``float64`` arrays (NaN for missing), other columns
+        object arrays.
+
+        Returns:
+            Mapping of column name to array
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("NumPy is required for to_numpy(); install it with 'pip install numpy'")
+
+        arrays: Dict[str, Any] = {}
+        for name, column in self._decimals.items():
+            arrays[name] = np.asarray(column.floats(), dtype=np.float64)
+        for name in CATEGORY_FIELDS + STRING_FIELDS:
+            arrays[name] = np.asarray(self.column(name), dtype=object)
+        return arrays
+
+    def to_pandas(self) -> Any:
+        """
+        Convert to a pandas DataFrame with categorical columns
+
+        Returns:
+            pandas DataFrame
+
+        Raises:
+            ImportError: If pandas is not installed
+        """
+        try:
+            import pandas as pd  # type: ignore[import-untyped]
+        except ImportError:
+            raise ImportError("pandas is required for to_pandas(); install it with 'pip install pandas'")
+
+        data: Dict[str, Any] = {}
+        for name, column in self._decimals.items():
+            data[name] = column.floats()
+        for name, category in self._categories.items():
+            # pandas uses -1 for missing values where code 0 is reserved here
+            codes = [code - 1 for code in category.codes]
+            data[name] = pd.Categorical.from_codes(codes, categories=category.categories[1:])
+        for name, values in self._strings.items():
+            data[name] = values
+        return pd.DataFrame(data, columns=list(FIELDS))
+
+    def to_arrow(self) -> Any:
+        """
+        Convert to a pyarrow Table with dictionary-encoded columns
+
+        Returns:
+            pyarrow Table
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa  # type: ignore[import-untyped]
+        except ImportError:
+            raise ImportError("pyarrow is required for to_arrow(); install it with 'pip install pyarrow'")
+
+        arrays: Dict[str, Any] = {}
+        for name, column in self._decimals.items():
+            arrays[name] = pa.array(self.column(name), type=pa.decimal128(38, column.scale))
+        for name, category in self._categories.items():
+            indices = pa.array([None if code == 0 else code - 1 for code in category.codes], type=pa.int32())
+            arrays[name] = pa.DictionaryArray.from_arrays(indices, pa.array(category.categories[1:], type=pa.string()))
+        for name, values in self._strings.items():
+            arrays[name] = pa.array(values, type=pa.string())
+        return pa.table([arrays[name] for name in FIELDS], names=list(FIELDS))
+
+    def to_dicts(self) -> List[TransactionInfo]:
+        """
+        Materialize all rows as ``TransactionInfo`` dicts
+
+        Returns:
+            Transactions
+        """
+        return [row.to_dict() for row in self]
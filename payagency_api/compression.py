@@ -0,0 +1,183 @@
+"""
+HTTP compression
+
+Responses are negotiated with an explicit ``Accept-Encoding`` header and
+decoded by the transport. Request bodies above a size threshold can be
+compressed (``Content-Encoding``) for gateways that accept it. A
+``CompressionPolicy`` also counts wire and decoded bytes, so the effect of
+compression can be measured rather than assumed.
+"""
+
+import gzip
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from . import forksafe
+
+
+REQUEST_ENCODINGS = ("gzip", "deflate")
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """
+    Response encodings the installed HTTP libraries can decode
+
+    gzip and deflate are always available; br is added when ``brotli`` is
+    installed (``pip install payagency-api[compression]``) and zstd when
+    urllib3's Zstandard support is.
+
+    Returns:
+        Encoding names in order of preference
+    """
+    # urllib3 (used by the requests and urllib3 transports) lists what it can decode
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    offered = [encoding.strip() for encoding in ACCEPT_ENCODING.split(",")]
+    return tuple(encoding for encoding in ("zstd", "br", "gzip", "deflate") if encoding in offered)
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    """
+    Compress a request body
+
+    Args:
+        body: Encoded request body
+        encoding: "gzip" or "deflate"
+        level: Compression level, 1 (fastest) to 9 (smallest) (default: 6)
+
+    Returns:
+        Compressed body
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, level)
+    raise ValueError(f"Request encoding must be one of {', '.join(REQUEST_ENCODINGS)}")
+
+
+def decompress(body: bytes, encoding: Optional[str]) -> bytes:
+    """
+    Decode a body compressed with ``compress()``
+
+    Args:
+        body: Compressed body
+        encoding: Content encoding (None or "identity" for uncompressed bodies)
+
+    Returns:
+        Decoded body
+    """
+    if not encoding or encoding == "identity":
+        return body
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+class CompressionPolicy:
+    """
+    Compression negotiation and byte accounting
+
+    Args:
+        accept_encoding: Response encodings to accept: "auto" (everything the
+            installed libraries can decode), a list of encodings, or None to
+            send no ``Accept-Encoding`` header (default: "auto")
+        request_encoding: Compress request bodies with "gzip" or "deflate";
+            only enable this if the gateway accepts compressed requests (optional)
+        min_size: Smallest request body in bytes worth compressing (default: 1024)
+        level: Compression level, 1 (fastest) to 9 (smallest) (default: 6)
+    """
+
+    def __init__(
+        self,
+        accept_encoding: Union[str, Iterable[str], None] = "auto",
+        request_encoding: Optional[str] = None,
+        min_size: int = 1024,
+        level: int = 6
+    ):
+        if request_encoding is not None and request_encoding not in REQUEST_ENCODINGS:
+            raise ValueError(f"Request encoding must be one of {', '.join(REQUEST_ENCODINGS)}")
+
+        if accept_encoding == "auto":
+            accept_encoding = available_encodings()
+        if isinstance(accept_encoding, str):
+            accept_encoding = [accept_encoding]
+        self.accept_encoding = ", ".join(accept_encoding) if accept_encoding else None
+        self.request_encoding = request_encoding
+        self.min_size = min_size
+        self.level = level
+        self._reset()
+        forksafe.register(self)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._responses = 0
+        self._wire_bytes = 0
+        self._decoded_bytes = 0
+        self._encodings: Dict[str, int] = {}
+        self._requests_compressed = 0
+        self._request_bytes = 0
+        self._request_wire_bytes = 0
+
+    def _after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent at fork time
+        self._reset()
+
+    def compress_body(self, body: bytes) -> Tuple[bytes, Optional[str]]:
+        """
+        Compress a request body if enabled and large enough
+
+        Args:
+            body: Encoded request body
+
+        Returns:
+            Body to send and its content encoding (None if not compressed)
+        """
+        if self.request_encoding is None or len(body) < self.min_size:
+            return body, None
+
+        compressed = compress(body, self.request_encoding, self.level)
+        with self._lock:
+            self._requests_compressed += 1
+            self._request_bytes += len(body)
+            self._request_wire_bytes += len(compressed)
+        return compressed, self.request_encoding
+
+    def record(self, encoding: Optional[str], wire_bytes: Optional[int], decoded_bytes: int) -> None:
+        """
+        Record the size of a response body
+
+        Args:
+            encoding: Response ``Content-Encoding`` (None if not compressed)
+            wire_bytes: Bytes received (None if the transport cannot tell; counted as ``decoded_bytes``)
+            decoded_bytes: Bytes after decoding
+        """
+        encoding = (encoding or "identity").lower()
+        with self._lock:
+            self._responses += 1
+            self._wire_bytes += decoded_bytes if wire_bytes is None else wire_bytes
+            self._decoded_bytes += decoded_bytes
+            self._encodings[encoding] = self._encodings.get(encoding, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Compression statistics
+
+        Returns:
+            Response count, wire and decoded response bytes, their ratio,
+            responses per content encoding, and compressed request counts and bytes
+        """
+        with self._lock:
+            return {
+                "accept_encoding": self.accept_encoding,
+                "responses": self._responses,
+                "wire_bytes": self._wire_bytes,
+                "decoded_bytes": self._decoded_bytes,
+                "ratio": self._wire_bytes / self._decoded_bytes if self._decoded_bytes else None,
+                "encodings": dict(self._encodings),
+                "requests_compressed": self._requests_compressed,
+                "request_bytes": self._request_bytes,
+                "request_wire_bytes": self._request_wire_bytes,
+            }
@@ -1,16 +1,57 @@
 """
 Custom exceptions for PayAgency API SDK
+
+Every exception carries ``retryable`` so retry and circuit-breaker code can
+decide without matching on messages:
+
+- ``PayAgencyAPIError``: the gateway answered with an error
+    - ``PayAgencyRateLimitError`` (429, retryable after ``retry_after``)
+    - ``PayAgencyServerError`` (5xx, retryable)
+    - ``PayAgencyDeclinedError`` (payment declined or blocked)
+    - ``PayAgencyInvalidRequestError`` (400/422, also a ``PayAgencyValidationError``)
+- ``PayAgencyNetworkError``: no usable response
+    - ``PayAgencyTimeoutError`` (retryable if the request is safe to repeat)
+    - ``PayAgencyConnectionError`` (request never sent, retryable)
+    - ``PayAgencyTLSError`` (certificate or handshake failure)
+- ``PayAgencyValidationError``: input rejected before sending
+- ``PayAgencyOverloadError``: shed by the client (retryable)
+- ``PayAgencyBatchError``: some requests of an async batch failed
 """
 
+from typing import Any, List, Optional, Tuple
+
 
 class PayAgencyError(Exception):
-    """Base exception for PayAgency SDK errors"""
-    
-    def __init__(self, message: str, status_code: int = None, response: dict = None):
+    """
+    Base exception for PayAgency SDK errors
+
+    ``endpoint``, ``attempts`` and ``elapsed`` are filled in by
+    ``make_request`` for errors raised while making a request.
+    """
+
+    retryable = False
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        response: Optional[dict] = None,
+        retryable: Optional[bool] = None,
+        retry_after: Optional[float] = None,
+        endpoint: Optional[str] = None,
+        attempts: int = 1,
+        elapsed: Optional[float] = None
+    ):
         super().__init__(message)
         self.message = message
         self.status_code = status_code
         self.response = response
+        if retryable is not None:
+            self.retryable = retryable
+        self.retry_after = retry_after
+        self.endpoint = endpoint
+        self.attempts = attempts
+        self.elapsed = elapsed
 
 
 class PayAgencyAPIError(PayAgencyError):
@@ -26,3 +67,76 @@ class PayAgencyNetworkError(PayAgencyError):
 class PayAgencyValidationError(PayAgencyError):
     """Exception raised for input validation errors"""
     pass
+
+
+class PayAgencyOverloadError(PayAgencyError):
+    """Exception raised when the client sheds a request to protect the gateway"""
+
+    retryable = True
+
+
+class PayAgencyRateLimitError(PayAgencyAPIError):
+    """Exception raised when the gateway throttles requests (HTTP 429)"""
+
+    retryable = True
+
+
+class PayAgencyServerError(PayAgencyAPIError):
+    """Exception raised for gateway-side failures (HTTP 5xx)"""
+
+    retryable = True
+
+
+class PayAgencyDeclinedError(PayAgencyAPIError):
+    """Exception raised when a payment or payout is declined or blocked"""
+    pass
+
+
+class PayAgencyInvalidRequestError(PayAgencyAPIError, PayAgencyValidationError):
+    """Exception raised when the gateway rejects a request as invalid (HTTP 400/422)"""
+    pass
+
+
+class PayAgencyTimeoutError(PayAgencyNetworkError):
+    """
+    Exception raised when a request times out
+
+    A timed-out request may have been processed, so it is only retryable when
+    repeating it is safe (idempotent method or idempotency key).
+    """
+    pass
+
+
+class PayAgencyConnectionError(PayAgencyNetworkError):
+    """Exception raised when a connection cannot be established; the request was not sent"""
+
+    retryable = True
+
+
+class PayAgencyTLSError(PayAgencyNetworkError):
+    """Exception raised for TLS certificate or handshake failures"""
+    pass
+
+
+class PayAgencyBatchError(PayAgencyError):
+    """
+    Exception raised when requests of an async batch fail
+
+    Carries the outcome of every request that was sent, so successes are not
+    lost with the failures.
+
+    Args:
+        message: Error message
+        results: ``(index, result)`` pairs of the requests that succeeded
+        errors: ``(index, error)`` pairs of the requests that failed
+    """
+
+    def __init__(
+        self,
+        message: str,
+        results: List[Tuple[int, Any]],
+        errors: List[Tuple[int, PayAgencyError]]
+    ):
+        super().__init__(message)
+        self.results = results
+        self.errors = errors
@@ -0,0 +1,97 @@
+"""
+Fork detection and process-pool helpers
+
+Objects holding sockets, database connections or locks register here and get
+their ``_after_fork()`` method called in a forked child, before any SDK code
+runs there. Where ``os.register_at_fork`` is unavailable, ``check_fork()`` does
+the same lazily by comparing process IDs.
+"""
+
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_registry: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_registry_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def register(obj: Any) -> None:
+    """
+    Register an object to be reset in forked children
+
+    Args:
+        obj: Object with an ``_after_fork()`` method
+    """
+    with _registry_lock:
+        _registry.add(obj)
+
+
+def _reinit_after_fork() -> None:
+    global _pid, _registry_lock
+
+    _pid = os.getpid()
+    # The lock may have been held by another thread of the parent at fork time
+    _registry_lock = threading.Lock()
+    for obj in list(_registry):
+        obj._after_fork()
+
+
+def check_fork() -> bool:
+    """
+    Reset registered objects if the process forked without an at-fork hook
+
+    Returns:
+        True if a fork was detected and objects were reset
+    """
+    if os.getpid() == _pid:
+        return False
+    _reinit_after_fork()
+    return True
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def process_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    processes: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    min_items: int = 64
+) -> List[R]:
+    """
+    Apply a function to items across a process pool, preserving order
+
+    Small inputs, or ``processes=1``, run in the calling process since pool
+    start-up would cost more than it saves. ``func`` and the items must be
+    picklable.
+
+    Args:
+        func: Module-level function to apply
+        items: Inputs
+        processes: Worker processes (default: CPU count)
+        chunksize: Items sent to a worker at a time (default: spread evenly, 4 chunks per worker)
+        min_items: Minimum number of items worth starting a pool for (default: 64)
+
+    Returns:
+        Results in input order
+    """
+    items = list(items)
+    workers = processes or os.cpu_count() or 1
+
+    if workers <= 1 or len(items) < min_items:
+        return [func(item) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
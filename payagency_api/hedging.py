@@ -0,0 +1,255 @@
+"""
+Hedged requests for idempotent operations
+
+A hedged request sends a duplicate of a slow request after a delay and takes
+whichever response arrives first, trading a little extra load for a much
+shorter latency tail. Only idempotent methods (GET by default) are hedged.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, TypeVar
+
+from . import forksafe
+
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """
+    When and how often to hedge requests
+
+    The hedge delay is either fixed (``delay``) or the ``percentile`` of the
+    latencies observed over the last ``window`` attempts; until
+    ``min_samples`` latencies are known, percentile-based policies do not
+    hedge. Every hedgeable request earns ``budget`` hedge tokens (up to
+    ``burst``) and each hedge spends one, so hedges stay below ``budget`` of
+    the request volume.
+
+    Attempts run on a pool of ``max_workers`` threads reused across requests.
+    An attempt is only handed to the pool while one of its threads is free,
+    so it never queues behind other requests: a request that cannot be hedged
+    (no delay known yet, no hedge token left, or every thread busy) runs on
+    the calling thread, and a hedge is skipped when the pool is full. A
+    synchronous attempt that lost the race cannot be interrupted; it runs to
+    completion, holding its thread, and its response is discarded.
+
+    Args:
+        delay: Fixed seconds to wait before hedging (optional, percentile-based by default)
+        percentile: Observed latency percentile used as the delay (default: 0.95)
+        min_delay: Lower bound for the percentile-based delay in seconds (default: 0.01)
+        budget: Maximum fraction of requests that may be hedged (default: 0.1)
+        burst: Maximum hedge tokens saved up (default: 10)
+        window: Number of recent latencies kept (default: 1000)
+        min_samples: Latencies needed before percentile-based hedging starts (default: 20)
+        methods: HTTP methods that may be hedged (default: GET)
+        max_workers: Threads used to send primary attempts and hedges (default: 16)
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        min_delay: float = 0.01,
+        budget: float = 0.1,
+        burst: float = 10,
+        window: int = 1000,
+        min_samples: int = 20,
+        methods: Iterable[str] = ("GET",),
+        max_workers: int = 16
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if budget < 0:
+            raise ValueError("budget must not be negative")
+
+        self.delay = delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.budget = budget
+        self.burst = burst
+        self.min_samples = min_samples
+        self.methods = frozenset(method.upper() for method in methods)
+        self.max_workers = max_workers
+
+        self._latencies: Deque[float] = deque(maxlen=window)
+        # The same latencies kept sorted, so the percentile is a lookup
+        self._sorted: List[float] = []
+        self._tokens = 0.0
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._init_executor()
+        forksafe.register(self)
+
+    def _init_executor(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._busy = 0
+
+    def _after_fork(self) -> None:
+        # The parent's worker threads do not exist in the child
+        self._init_executor()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="payagency-hedge"
+                )
+            return self._executor
+
+    def applies(self, method: str) -> bool:
+        """
+        Whether requests with a method may be hedged
+
+        Args:
+            method: HTTP method
+
+        Returns:
+            True if the method is hedgeable
+        """
+        return method.upper() in self.methods
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Current hedge delay
+
+        Returns:
+            Seconds to wait before hedging, or None if there are not enough samples yet
+        """
+        if self.delay is not None:
+            return self.delay
+
+        with self._lock:
+            count = len(self._sorted)
+            if count < self.min_samples:
+                return None
+            latency = self._sorted[min(count - 1, int(self.percentile * count))]
+
+        return max(self.min_delay, latency)
+
+    def record(self, latency: float) -> None:
+        """
+        Record the latency of a completed attempt
+
+        Args:
+            latency: Seconds taken
+        """
+        with self._lock:
+            if len(self._latencies) == self._latencies.maxlen:
+                del self._sorted[bisect.bisect_left(self._sorted, self._latencies[0])]
+            self._latencies.append(latency)
+            bisect.insort(self._sorted, latency)
+
+    def _start(self) -> None:
+        with self._lock:
+            self._requests += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+    def _has_token(self) -> bool:
+        with self._lock:
+            return self._tokens >= 1
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._hedged += 1
+            return True
+
+    def _timed(self, func: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        result = func()
+        self.record(time.perf_counter() - start)
+        return result
+
+    def _reserve_worker(self) -> bool:
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return False
+            self._busy += 1
+            return True
+
+    def _release_worker(self) -> None:
+        with self._lock:
+            self._busy -= 1
+
+    def _submit(self, func: Callable[[], T]) -> "Future[T]":
+        # The caller has reserved a worker, so the attempt starts immediately
+        def run() -> T:
+            try:
+                return self._timed(func)
+            finally:
+                self._release_worker()
+
+        return self._get_executor().submit(run)
+
+    def execute(self, func: Callable[[], T]) -> T:
+        """
+        Run a request, hedging it if it is slower than the hedge delay
+
+        Args:
+            func: Callable sending the request and returning its response
+
+        Returns:
+            The first successful response
+
+        Raises:
+            Exception: The primary attempt's error if every attempt failed
+        """
+        self._start()
+        delay = self.hedge_delay()
+        if delay is None or not self._has_token() or not self._reserve_worker():
+            return self._timed(func)
+
+        primary = self._submit(func)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._reserve_worker():
+            return primary.result()
+        if not self._take_token():
+            self._release_worker()
+            return primary.result()
+
+        hedge = self._submit(func)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary, hedge):
+                if future in done and future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    if future is hedge:
+                        with self._lock:
+                            self._hedge_wins += 1
+                    return future.result()
+
+        return primary.result()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hedging statistics
+
+        Returns:
+            Hedgeable requests, hedges sent, hedges that won and the current delay
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "delay": delay,
+            }
+
+    def close(self) -> None:
+        """Shut down the worker threads"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,233 @@
+"""
+Idempotency key generation and local dedup stores
+"""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from . import forksafe
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def idempotency_namespace(secret_key: str) -> str:
+    """
+    Derives a merchant's idempotency namespace from its secret key.
+
+    Clients sharing an idempotency store keep their records apart by this
+    namespace, so identical payloads from different merchants never share a
+    recorded response. The namespace is a one-way fingerprint; the secret key
+    itself is never stored.
+
+    Args:
+        secret_key: The merchant's API secret key
+
+    Returns:
+        Hex encoded fingerprint
+    """
+    return hashlib.sha256(f"payagency-idempotency\n{secret_key}".encode('utf-8')).hexdigest()[:32]
+
+
+def generate_idempotency_key(
+    method: str,
+    endpoint: str,
+    data: Optional[Dict[str, Any]],
+    namespace: Optional[str] = None
+) -> str:
+    """
+    Derives a deterministic idempotency key from a request.
+
+    The key is computed from the plaintext payload (before encryption, which
+    uses a random IV), so replaying the same submission after a crash yields
+    the same key.
+
+    Args:
+        method: HTTP method
+        endpoint: API endpoint
+        data: Request data
+        namespace: Merchant namespace from ``idempotency_namespace`` (optional)
+
+    Returns:
+        Hex encoded SHA-256 digest
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    prefix = f"{namespace}\n" if namespace else ""
+    digest = hashlib.sha256(f"{prefix}{method.upper()} {endpoint}\n{canonical}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Base class for idempotency stores.
+
+    A store maps idempotency keys to the response recorded for the first
+    successful submission using that key.
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the recorded response for a key
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            Recorded response, or None if the key is unknown
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Record the response for a key
+
+        Args:
+            key: Idempotency key
+            response: Response data
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """
+        Forget a key
+
+        Args:
+            key: Idempotency key
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Forget all keys"""
+        raise NotImplementedError
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """
+    Thread-safe in-memory LRU idempotency store
+
+    Responses are copied in and out, so callers mutating a returned response
+    do not change what later duplicates receive.
+
+    Args:
+        max_size: Maximum number of keys kept before evicting the least recently used
+        ttl: Seconds after which recorded responses expire (optional, never by default)
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        forksafe.register(self)
+
+    def _after_fork(self) -> None:
+        # Recorded responses stay valid in the child; only the lock is replaced
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, created_at = entry
+            if self.ttl is not None and time.monotonic() - created_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(response)
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        response = copy.deepcopy(response)
+        with self._lock:
+            self._entries[key] = (response, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """
+    SQLite-backed idempotency store that survives process restarts
+
+    Args:
+        path: Database file path (":memory:" for a non-persistent database)
+        ttl: Seconds after which recorded responses expire (optional, never by default)
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self._connect()
+        forksafe.register(self)
+
+    def _connect(self) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _after_fork(self) -> None:
+        # SQLite connections must not be carried across fork; open a new one
+        self._connect()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM idempotency WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        if self.ttl is not None and time.time() - row[1] > self.ttl:
+            self.delete(key)
+            return None
+
+        response: Dict[str, Any] = json.loads(row[0])
+        return response
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO idempotency (key, response, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(response), time.time()),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM idempotency WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM idempotency")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
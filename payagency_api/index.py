@@ -0,0 +1,357 @@
+"""
+In-memory lookup index over fetched transaction history
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .types.transaction import TransactionInfo, TransactionsResponse
+
+
+def _key_hash(value: str) -> int:
+    """Hash a lookup key to a fixed-size 64-bit integer"""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), "little")
+
+
+def hash_email(email: str) -> str:
+    """
+    Hash a customer email for lookups without keeping the address in memory
+
+    Args:
+        email: Customer email
+
+    Returns:
+        Hex encoded SHA-256 digest of the normalized email
+    """
+    return hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()
+
+
+class TransactionIndex:
+    """
+    O(1) lookup index by transaction ID, order ID and customer email hash
+
+    Keys are stored as 64-bit hashes mapped to row offsets, so the index itself
+    stays small regardless of key lengths. Without ``path``, rows are kept in
+    memory and at most ``max_rows`` of them: beyond that the least recently
+    added rows are evicted and can no longer be looked up. With ``path``,
+    rows are appended to a JSON-lines file that is read back through
+    ``mmap``, so history of any size is indexed in bounded memory; an
+    existing file is re-indexed on open, discarding a torn last line left by
+    an interrupted write. Re-adding a transaction (for example after a status
+    change) makes the newest row authoritative: in memory it replaces the old
+    row, while a persisted index appends it and rewrites the file once
+    superseded rows exceed ``compact_after`` and outnumber the live ones.
+
+    Args:
+        path: Row file path for a persisted, memory-mapped index (optional)
+        compact_after: Superseded rows tolerated in the row file before it
+            is compacted (default: 1000)
+        max_rows: Rows kept by an in-memory index before the oldest are
+            evicted (default: 100000)
+    """
+
+    def __init__(self, path: Optional[str] = None, compact_after: int = 1000, max_rows: int = 100000):
+        if max_rows <= 0:
+            raise ValueError("max_rows must be positive")
+
+        self.path = path
+        self.compact_after = compact_after
+        self.max_rows = max_rows
+        self._lock = threading.RLock()
+        # In-memory rows by offset, oldest first
+        self._rows: Dict[int, TransactionInfo] = {}
+        self._next_offset = 0
+        self._file: Any = None
+        self._map: Optional[mmap.mmap] = None
+        self._reset()
+
+        if path is not None:
+            self._file = open(path, "a+b")
+            try:
+                self._reindex()
+                self._maybe_compact()
+            except BaseException:
+                self.close()
+                raise
+
+    def _reset(self) -> None:
+        self._by_transaction_id: Dict[int, int] = {}
+        self._by_order_id: Dict[int, Union[int, List[int]]] = {}
+        self._by_email: Dict[int, Union[int, List[int]]] = {}
+        self._superseded = 0
+        self._size = 0
+
+    def __enter__(self) -> "TransactionIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the row file of a persisted index"""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __len__(self) -> int:
+        return len(self._by_transaction_id)
+
+    def add(self, txn: TransactionInfo) -> None:
+        """
+        Index a transaction
+
+        Args:
+            txn: Transaction to index
+        """
+        with self._lock:
+            transaction_id = txn.get("transaction_id")
+            if self._file is None and transaction_id:
+                previous = self._by_transaction_id.get(_key_hash(transaction_id))
+                if previous is not None and self._rows[previous].get("transaction_id") == transaction_id:
+                    # Re-inserted so the updated row counts as the newest
+                    self._unlink(self._rows.pop(previous), previous)
+                    self._rows[previous] = txn
+                    self._link(txn, previous)
+                    return
+
+            if self._file is not None:
+                offset = self._size
+                line = json.dumps(txn, separators=(',', ':')).encode('utf-8') + b"\n"
+                self._file.seek(0, os.SEEK_END)
+                self._file.write(line)
+                self._size += len(line)
+                if self._map is not None:
+                    self._map.close()
+                    self._map = None
+            else:
+                offset = self._next_offset
+                self._next_offset += 1
+                self._rows[offset] = txn
+
+            self._link(txn, offset)
+            self._maybe_compact()
+            self._evict()
+
+    def add_page(self, page: TransactionsResponse) -> None:
+        """
+        Index all transactions of a ``get_transactions`` response
+
+        Args:
+            page: Transactions response
+        """
+        for txn in page.get("data") or []:
+            self.add(txn)
+
+    def track(self, pages: Iterable[TransactionsResponse]) -> Iterator[TransactionsResponse]:
+        """
+        Index pages while passing them through, for building the index while paging
+
+        Args:
+            pages: Transactions responses, e.g. from ``txn.iter_transaction_pages()``
+
+        Returns:
+            Iterator over the same pages
+        """
+        for page in pages:
+            self.add_page(page)
+            yield page
+
+    def get(self, transaction_id: str) -> Optional[TransactionInfo]:
+        """
+        Get a transaction by ID
+
+        Args:
+            transaction_id: Transaction ID
+
+        Returns:
+            Latest indexed row, or None
+        """
+        with self._lock:
+            offset = self._by_transaction_id.get(_key_hash(transaction_id))
+            if offset is None:
+                return None
+            txn = self._read(offset)
+            return txn if txn.get("transaction_id") == transaction_id else None
+
+    def find_by_order_id(self, order_id: str) -> List[TransactionInfo]:
+        """
+        Get transactions for an order
+
+        Args:
+            order_id: Merchant order ID
+
+        Returns:
+            Matching transactions in indexing order
+        """
+        return self._find(self._by_order_id, _key_hash(order_id), "order_id", order_id)
+
+    def find_by_email(self, email: str) -> List[TransactionInfo]:
+        """
+        Get transactions for a customer email
+
+        Args:
+            email: Customer email
+
+        Returns:
+            Matching transactions in indexing order
+        """
+        digest = hash_email(email)
+        with self._lock:
+            return [
+                txn for txn in self._find(self._by_email, _key_hash(digest))
+                if txn.get("email") and hash_email(txn["email"]) == digest
+            ]
+
+    def compact(self) -> None:
+        """Rewrite the row file of a persisted index without superseded rows"""
+        with self._lock:
+            if self._file is None or self.path is None:
+                return
+
+            tmp_path = self.path + ".compact"
+            with open(tmp_path, "wb") as out:
+                self._file.seek(0)
+                offset = 0
+                for line in self._file:
+                    if line.strip():
+                        transaction_id = json.loads(line).get("transaction_id")
+                        if not transaction_id or self._by_transaction_id.get(_key_hash(transaction_id)) == offset:
+                            out.write(line)
+                    offset += len(line)
+                out.flush()
+                os.fsync(out.fileno())
+
+            self.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, "a+b")
+            self._reset()
+            self._reindex()
+
+    def _evict(self) -> None:
+        while self._file is None and len(self._rows) > self.max_rows:
+            offset = next(iter(self._rows))
+            self._unlink(self._rows.pop(offset), offset)
+
+    def _maybe_compact(self) -> None:
+        if self._file is not None and self._superseded > max(self.compact_after, len(self._by_transaction_id)):
+            self.compact()
+
+    def _link(self, txn: TransactionInfo, offset: int) -> None:
+        transaction_id = txn.get("transaction_id")
+        if transaction_id:
+            key = _key_hash(transaction_id)
+            if self._by_transaction_id.get(key, offset) != offset:
+                self._superseded += 1
+            self._by_transaction_id[key] = offset
+
+        order_id = txn.get("order_id")
+        if order_id:
+            self._append(self._by_order_id, _key_hash(order_id), offset)
+
+        email = txn.get("email")
+        if email:
+            self._append(self._by_email, _key_hash(hash_email(email)), offset)
+
+    def _unlink(self, txn: TransactionInfo, offset: int) -> None:
+        transaction_id = txn.get("transaction_id")
+        if transaction_id:
+            key = _key_hash(transaction_id)
+            if self._by_transaction_id.get(key) == offset:
+                del self._by_transaction_id[key]
+
+        order_id = txn.get("order_id")
+        if order_id:
+            self._remove(self._by_order_id, _key_hash(order_id), offset)
+
+        email = txn.get("email")
+        if email:
+            self._remove(self._by_email, _key_hash(hash_email(email)), offset)
+
+    @staticmethod
+    def _remove(mapping: Dict[int, Union[int, List[int]]], key: int, offset: int) -> None:
+        existing = mapping.get(key)
+        if existing == offset:
+            del mapping[key]
+        elif isinstance(existing, list) and offset in existing:
+            existing.remove(offset)
+            if len(existing) == 1:
+                mapping[key] = existing[0]
+
+    @staticmethod
+    def _append(mapping: Dict[int, Union[int, List[int]]], key: int, offset: int) -> None:
+        existing = mapping.get(key)
+        if existing is None:
+            mapping[key] = offset
+        elif isinstance(existing, list):
+            if offset not in existing:
+                existing.append(offset)
+        elif existing != offset:
+            mapping[key] = [existing, offset]
+
+    def _find(
+        self,
+        mapping: Dict[int, Union[int, List[int]]],
+        key: int,
+        field: Optional[str] = None,
+        value: Optional[str] = None
+    ) -> List[TransactionInfo]:
+        with self._lock:
+            offsets = mapping.get(key)
+            if offsets is None:
+                return []
+            if isinstance(offsets, int):
+                offsets = [offsets]
+
+            results = []
+            for offset in offsets:
+                txn = self._read(offset)
+                if field is not None and txn.get(field) != value:
+                    continue  # hash collision
+                transaction_id = txn.get("transaction_id")
+                if transaction_id and self._by_transaction_id.get(_key_hash(transaction_id)) != offset:
+                    continue  # superseded by a newer row
+                results.append(txn)
+            return results
+
+    def _read(self, offset: int) -> TransactionInfo:
+        if self._file is None:
+            return self._rows[offset]
+
+        if self._map is None:
+            self._file.flush()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        end = self._map.find(b"\n", offset)
+        txn: TransactionInfo = json.loads(self._map[offset:end if end != -1 else None])
+        return txn
+
+    def _reindex(self) -> None:
+        end = os.fstat(self._file.fileno()).st_size
+        self._file.seek(0)
+        offset = 0
+        for line in self._file:
+            # Rows are written whole with their newline, so a last line without
+            # one, or one that does not parse, is an interrupted write
+            txn = None
+            torn = not line.endswith(b"\n")
+            if not torn and line.strip():
+                try:
+                    txn = json.loads(line)
+                except ValueError:
+                    if offset + len(line) < end:
+                        raise
+                    torn = True
+            if torn:
+                self._file.truncate(offset)
+                break
+            if txn is not None:
+                self._link(txn, offset)
+            offset += len(line)
+        self._size = offset
@@ -0,0 +1,292 @@
+"""
+Adaptive per-endpoint concurrency limits
+
+A ``ConcurrencyLimiter`` caps the requests in flight to each endpoint and
+adjusts the cap from what it observes, in the style of Netflix's
+concurrency-limits: latency growth and throttling (429), server errors (5xx)
+or network failures shrink the limit, healthy responses grow it. Calls over
+the limit wait in a bounded queue, and are shed with
+``PayAgencyOverloadError`` when the queue is full or the wait times out.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from . import forksafe
+from .exceptions import PayAgencyOverloadError
+
+
+class AdaptiveLimit:
+    """
+    Base class for limit algorithms
+
+    Args:
+        initial_limit: Starting concurrency limit (default: 10)
+        min_limit: Lowest limit (default: 1)
+        max_limit: Highest limit (default: 200)
+    """
+
+    def __init__(self, initial_limit: float = 10, min_limit: float = 1, max_limit: float = 200):
+        if not min_limit <= initial_limit <= max_limit:
+            raise ValueError("initial_limit must be between min_limit and max_limit")
+
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+
+    def update(self, rtt: float, inflight: int, dropped: bool) -> float:
+        """
+        Update the limit from a completed request
+
+        Args:
+            rtt: Seconds the request took
+            inflight: Requests in flight when it started, itself included
+            dropped: Whether the request was throttled, failed server-side or timed out
+
+        Returns:
+            New limit
+        """
+        self.limit = min(self.max_limit, max(self.min_limit, self._next(rtt, inflight, dropped)))
+        return self.limit
+
+    def _next(self, rtt: float, inflight: int, dropped: bool) -> float:
+        raise NotImplementedError
+
+
+class AIMDLimit(AdaptiveLimit):
+    """
+    Additive increase, multiplicative decrease
+
+    The limit grows by one per successful request while at least half of it
+    is in use, and is multiplied by ``backoff`` on every drop. Requests
+    slower than ``latency_timeout`` count as drops.
+
+    Args:
+        backoff: Factor applied to the limit on a drop (default: 0.9)
+        latency_timeout: Seconds after which a successful request counts as a drop (optional)
+        **kwargs: ``AdaptiveLimit`` arguments
+    """
+
+    def __init__(self, backoff: float = 0.9, latency_timeout: Optional[float] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+
+        self.backoff = backoff
+        self.latency_timeout = latency_timeout
+
+    def _next(self, rtt: float, inflight: int, dropped: bool) -> float:
+        if dropped or (self.latency_timeout is not None and rtt > self.latency_timeout):
+            return self.limit * self.backoff
+        if inflight * 2 >= self.limit:
+            return self.limit + 1
+        return self.limit
+
+
+class GradientLimit(AdaptiveLimit):
+    """
+    Latency-gradient limit
+
+    Compares each request's latency with a long-term average: while latency
+    stays within ``tolerance`` of the average the limit grows by about
+    ``sqrt(limit)``, and it shrinks in proportion as latency climbs (queueing
+    at the gateway). Drops multiply the limit by ``backoff``.
+
+    Args:
+        tolerance: Latency growth tolerated before shrinking (default: 1.5)
+        smoothing: Weight of each new estimate (default: 0.2)
+        long_window: Samples averaged for the baseline latency (default: 600)
+        backoff: Factor applied to the limit on a drop (default: 0.9)
+        **kwargs: ``AdaptiveLimit`` arguments
+    """
+
+    def __init__(
+        self,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        long_window: int = 600,
+        backoff: float = 0.9,
+        **kwargs: Any
+    ):
+        super().__init__(**kwargs)
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.backoff = backoff
+        self._alpha = 2 / (long_window + 1)
+        self._long_rtt: Optional[float] = None
+
+    def _next(self, rtt: float, inflight: int, dropped: bool) -> float:
+        if dropped:
+            return self.limit * self.backoff
+
+        if self._long_rtt is None:
+            self._long_rtt = rtt
+        else:
+            self._long_rtt += self._alpha * (rtt - self._long_rtt)
+
+        # Drift the baseline down when latency recovers so it does not stay inflated
+        if self._long_rtt / max(rtt, 1e-9) > 2:
+            self._long_rtt *= 0.95
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / max(rtt, 1e-9)))
+        estimate = self.limit * gradient + math.sqrt(self.limit)
+        if inflight * 2 < self.limit:
+            # Not using the limit, so there is no evidence it could be higher
+            estimate = min(estimate, self.limit)
+        return self.limit * (1 - self.smoothing) + estimate * self.smoothing
+
+
+class _EndpointState:
+    __slots__ = ("limit", "inflight", "queued", "shed", "dropped", "condition")
+
+    def __init__(self, limit: AdaptiveLimit, lock: threading.Lock):
+        self.limit = limit
+        self.inflight = 0
+        self.queued = 0
+        self.shed = 0
+        self.dropped = 0
+        self.condition = threading.Condition(lock)
+
+
+class Permit:
+    """
+    A slot in an endpoint's concurrency limit, held for one request
+
+    Call ``drop()`` if the request was throttled or failed server-side; a
+    request ending in an exception counts as dropped automatically.
+    """
+
+    __slots__ = ("dropped",)
+
+    def __init__(self) -> None:
+        self.dropped = False
+
+    def drop(self) -> None:
+        """Mark the request as dropped"""
+        self.dropped = True
+
+
+class ConcurrencyLimiter:
+    """
+    Per-endpoint adaptive concurrency limiter
+
+    Args:
+        limit: Factory creating each endpoint's limit algorithm (default: ``AIMDLimit``)
+        max_queue: Calls allowed to wait per endpoint when at the limit, 0 to shed immediately (default: 100)
+        queue_timeout: Seconds a call may wait before being shed (optional, no timeout by default)
+        max_endpoints: Endpoints tracked before idle ones are forgotten (default: 256)
+    """
+
+    def __init__(
+        self,
+        limit: Callable[[], AdaptiveLimit] = AIMDLimit,
+        max_queue: int = 100,
+        queue_timeout: Optional[float] = None,
+        max_endpoints: int = 256
+    ):
+        self.limit_factory = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_endpoints = max_endpoints
+        self._reset()
+        forksafe.register(self)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: "OrderedDict[str, _EndpointState]" = OrderedDict()
+
+    def _after_fork(self) -> None:
+        # In-flight counts and waiters belong to the parent's threads
+        self._reset()
+
+    def _state(self, endpoint: str) -> _EndpointState:
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            state = self._endpoints[endpoint] = _EndpointState(self.limit_factory(), self._lock)
+            if len(self._endpoints) > self.max_endpoints:
+                for key, idle in list(self._endpoints.items()):
+                    if idle.inflight == 0 and idle.queued == 0 and key != endpoint:
+                        del self._endpoints[key]
+                        break
+        else:
+            self._endpoints.move_to_end(endpoint)
+        return state
+
+    @contextmanager
+    def acquire(self, endpoint: str) -> Iterator[Permit]:
+        """
+        Hold a slot in an endpoint's limit for the duration of a request
+
+        Args:
+            endpoint: API endpoint
+
+        Yields:
+            Permit for reporting the request outcome
+
+        Raises:
+            PayAgencyOverloadError: If the endpoint's queue is full or the wait timed out
+        """
+        with self._lock:
+            state = self._state(endpoint)
+            if state.inflight >= int(state.limit.limit):
+                if state.queued >= self.max_queue:
+                    state.shed += 1
+                    raise PayAgencyOverloadError(f"Concurrency limit reached for {endpoint}")
+
+                state.queued += 1
+                try:
+                    admitted = state.condition.wait_for(
+                        lambda: state.inflight < int(state.limit.limit), timeout=self.queue_timeout
+                    )
+                finally:
+                    state.queued -= 1
+                if not admitted:
+                    state.shed += 1
+                    raise PayAgencyOverloadError(f"Timed out waiting for a concurrency slot for {endpoint}")
+
+            state.inflight += 1
+            inflight = state.inflight
+
+        permit = Permit()
+        start = time.perf_counter()
+        try:
+            yield permit
+        except GeneratorExit:
+            # A streaming body closed by its consumer, whether fully read or
+            # abandoned, is not a sign of overload
+            raise
+        except BaseException:
+            permit.dropped = True
+            raise
+        finally:
+            rtt = time.perf_counter() - start
+            with self._lock:
+                state.inflight -= 1
+                if permit.dropped:
+                    state.dropped += 1
+                state.limit.update(rtt, inflight, permit.dropped)
+                state.condition.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-endpoint limiter state
+
+        Returns:
+            Mapping of endpoint to its current limit, in-flight and queued
+            requests, and counts of shed and dropped requests
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    "limit": state.limit.limit,
+                    "inflight": state.inflight,
+                    "queued": state.queued,
+                    "shed": state.shed,
+                    "dropped": state.dropped,
+                }
+                for endpoint, state in self._endpoints.items()
+            }
@@ -0,0 +1,578 @@
+"""
+Load generator for capacity planning
+
+Usage:
+    python -m payagency_api.loadgen --base-url http://localhost:8080 \\
+        --rps 200 --duration 30 --mix s2s=5,hosted=2,transactions=3
+
+Drives a weighted mix of SDK operations either at a target request rate
+(``--rps``, open loop: latency is measured from when each request was due,
+so a saturated client shows up as latency rather than a lower send rate) or
+with a fixed number of busy workers (``--concurrency`` alone, closed loop).
+The report gives throughput, latency percentiles and a histogram per
+operation, errors by type, and client CPU time per request.
+
+``--offline`` replaces the network with an ``InMemoryTransport`` (with
+``--latency`` seconds of simulated server time), isolating the SDK's own
+overhead; ``--profile`` adds the SDK's CPU and wall time per request phase
+(see ``payagency_api.profiling``). Credentials are read from
+``--encryption-key``/``--secret-key`` or the ``PAYAGENCY_ENCRYPTION_KEY``/
+``PAYAGENCY_SECRET_KEY`` environment variables.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .client import PayAgencyApi
+from .exceptions import PayAgencyError
+from .profiling import Profiler
+from .transports import InMemoryTransport, TransportRequest
+
+
+def _customer(index: int) -> Any:
+    return {
+        "first_name": "James",
+        "last_name": "Dean",
+        "email": f"james{index}@example.com",
+        "address": "64 Hertingfordbury Rd",
+        "country": "GB",
+        "city": "Newport",
+        "state": "GB",
+        "zip": "TF10 8DF",
+        "ip_address": "127.0.0.1",
+        "phone_number": "7654233212",
+        "amount": 100 + index % 1000,
+        "currency": "GBP",
+        "redirect_url": "https://pay.agency",
+        "webhook_url": "https://pay.agency/webhook",
+        "order_id": f"LOAD-{os.getpid()}-{index}",
+    }
+
+
+def _card(index: int) -> Any:
+    return {
+        **_customer(index),
+        "card_number": "4111111111111111",
+        "card_expiry_month": "12",
+        "card_expiry_year": "2030",
+        "card_cvv": "029",
+    }
+
+
+def _s2s(client: PayAgencyApi, index: int) -> Any:
+    return client.payment.s2s(_card(index))
+
+
+def _hosted(client: PayAgencyApi, index: int) -> Any:
+    return client.payment.hosted(_customer(index))
+
+
+def _apm(client: PayAgencyApi, index: int) -> Any:
+    return client.payment.apm(_customer(index))
+
+
+def _payout(client: PayAgencyApi, index: int) -> Any:
+    data = _card(index)
+    del data["card_cvv"], data["redirect_url"]
+    data["wallet_id"] = "WAL123456789"
+    return client.payout.create_payout(data)
+
+
+def _crypto(client: PayAgencyApi, index: int) -> Any:
+    data = _customer(index)
+    del data["city"], data["state"], data["zip"]
+    data.update(crypto_currency="USDT", crypto_network="TRC20")
+    return client.crypto.payin(data)
+
+
+def _transactions(client: PayAgencyApi, index: int) -> Any:
+    return client.txn.get_transactions()
+
+
+OPERATIONS: Dict[str, Callable[[PayAgencyApi, int], Any]] = {
+    "s2s": _s2s,
+    "hosted": _hosted,
+    "apm": _apm,
+    "payout": _payout,
+    "crypto": _crypto,
+    "transactions": _transactions,
+}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parse an operation mix such as "s2s=5,transactions=1"
+
+    Args:
+        text: Comma-separated ``operation=weight`` pairs (a bare name has weight 1)
+
+    Returns:
+        Mapping of operation to weight
+
+    Raises:
+        ValueError: For unknown operations or non-positive weights
+    """
+    mix: Dict[str, float] = {}
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] <= 0:
+            raise ValueError(f"Weight of {name!r} must be positive")
+    if not mix:
+        raise ValueError("The mix must name at least one operation")
+    return mix
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with logarithmic buckets
+
+    Buckets grow by 2%, so percentiles are accurate to about 2% from one
+    microsecond up, in constant memory however many samples are recorded.
+    """
+
+    _BASE = 1e-6
+    _LOG_GROWTH = math.log(1.02)
+
+    def __init__(self) -> None:
+        self._buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Record one latency
+
+        Args:
+            seconds: Latency in seconds
+        """
+        self._buckets[int(math.log(max(seconds, self._BASE) / self._BASE) / self._LOG_GROWTH)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add another histogram's samples
+
+        Args:
+            other: Histogram to merge in
+        """
+        self._buckets.update(other._buckets)
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def _upper_bound(self, index: int) -> float:
+        return self._BASE * math.exp((index + 1) * self._LOG_GROWTH)
+
+    def percentile(self, quantile: float) -> float:
+        """
+        Latency below which a fraction of samples fall
+
+        Args:
+            quantile: Fraction between 0 and 1 (e.g. 0.99)
+
+        Returns:
+            Latency in seconds (0 if there are no samples)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds"""
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Latency summary
+
+        Returns:
+            Mean, p50, p90, p99, p99.9 and max latency in milliseconds
+        """
+        summary = {"mean": self.mean * 1000}
+        for name, quantile in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999)):
+            summary[name] = self.percentile(quantile) * 1000
+        summary["max"] = self.max * 1000
+        return {name: round(value, 3) for name, value in summary.items()}
+
+    def bins(self) -> List[Tuple[float, int]]:
+        """
+        Coarse histogram for display
+
+        Returns:
+            ``(upper bound in milliseconds, count)`` pairs in power-of-two
+            millisecond bins, from the first to the last non-empty bin
+        """
+        counts: Counter = Counter()
+        for index, count in self._buckets.items():
+            millis = self._upper_bound(index) * 1000
+            counts[max(0, math.ceil(math.log2(millis))) if millis > 1 else 0] += count
+        if not counts:
+            return []
+        return [(2.0 ** exponent, counts[exponent]) for exponent in range(min(counts), max(counts) + 1)]
+
+
+class LoadReport:
+    """Results of a load run"""
+
+    def __init__(
+        self,
+        mode: str,
+        elapsed: float,
+        cpu_seconds: float,
+        operations: Dict[str, LatencyHistogram],
+        errors: Dict[str, Counter]
+    ):
+        self.mode = mode
+        self.elapsed = elapsed
+        self.cpu_seconds = cpu_seconds
+        self.operations = operations
+        self.errors = errors
+
+        self.latency = LatencyHistogram()
+        for histogram in operations.values():
+            self.latency.merge(histogram)
+
+    @property
+    def requests(self) -> int:
+        """Requests completed, successfully or not"""
+        return self.latency.count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Report as plain data
+
+        Returns:
+            JSON-serializable report
+        """
+        total_errors: Counter = Counter()
+        for counts in self.errors.values():
+            total_errors.update(counts)
+
+        return {
+            "mode": self.mode,
+            "elapsed": round(self.elapsed, 3),
+            "requests": self.requests,
+            "throughput": round(self.requests / self.elapsed, 2) if self.elapsed else 0.0,
+            "errors": dict(total_errors),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "cpu_ms_per_request": round(self.cpu_seconds * 1000 / self.requests, 4) if self.requests else None,
+            "cpu_cores": round(self.cpu_seconds / self.elapsed, 3) if self.elapsed else 0.0,
+            "latency_ms": self.latency.summary(),
+            "operations": {
+                name: {
+                    "requests": histogram.count,
+                    "errors": sum(self.errors[name].values()),
+                    "latency_ms": histogram.summary(),
+                }
+                for name, histogram in self.operations.items()
+            },
+            "histogram_ms": self.latency.bins(),
+        }
+
+    def format(self) -> str:
+        """
+        Report as text
+
+        Returns:
+            Human-readable report
+        """
+        data = self.to_dict()
+        lines = [
+            f"{data['requests']} requests in {data['elapsed']:.2f}s ({data['mode']}): "
+            f"{data['throughput']:.1f} req/s",
+            f"client CPU: {data['cpu_seconds']:.3f}s, {data['cpu_ms_per_request'] or 0:.3f} ms/request, "
+            f"{data['cpu_cores']:.2f} cores",
+            "",
+            f"{'operation':<14}{'requests':>9}{'errors':>8}{'mean':>9}{'p50':>9}{'p90':>9}"
+            f"{'p99':>9}{'p99.9':>9}{'max':>9}  (ms)",
+        ]
+        rows = [(name, operation) for name, operation in data["operations"].items()]
+        rows.append(("all", {"requests": data["requests"], "errors": sum(data["errors"].values()),
+                             "latency_ms": data["latency_ms"]}))
+        for name, operation in rows:
+            latency = operation["latency_ms"]
+            lines.append(
+                f"{name:<14}{operation['requests']:>9}{operation['errors']:>8}"
+                + "".join(f"{latency[key]:>9.2f}" for key in ("mean", "p50", "p90", "p99", "p99.9", "max"))
+            )
+
+        if data["histogram_ms"]:
+            lines += ["", "latency histogram:"]
+            peak = max(count for _, count in data["histogram_ms"])
+            for upper, count in data["histogram_ms"]:
+                lines.append(f"  <= {upper:>8g} ms {count:>8}  {'#' * math.ceil(40 * count / peak) if count else ''}")
+
+        if data["errors"]:
+            lines += ["", "errors:"]
+            for name, count in sorted(data["errors"].items(), key=lambda item: -item[1]):
+                lines.append(f"  {name:<40}{count:>8}")
+        return "\n".join(lines)
+
+
+class LoadGenerator:
+    """
+    Run a weighted mix of SDK operations against a client
+
+    Operations are interleaved deterministically in proportion to their
+    weights. With ``rps`` the run is open loop: requests are started on a
+    fixed schedule by up to ``concurrency`` workers, and latency counts from
+    each request's scheduled time. Without it, ``concurrency`` workers each
+    send requests back to back.
+
+    Args:
+        client: Client to drive
+        mix: Mapping of operation name (see ``OPERATIONS``) to weight
+        rps: Target requests per second (optional, closed loop by default)
+        concurrency: Worker threads (default: 10)
+        duration: Seconds to run (default: 10)
+        max_requests: Stop after this many requests (optional)
+    """
+
+    def __init__(
+        self,
+        client: PayAgencyApi,
+        mix: Dict[str, float],
+        rps: Optional[float] = None,
+        concurrency: int = 10,
+        duration: float = 10.0,
+        max_requests: Optional[int] = None
+    ):
+        if rps is not None and rps <= 0:
+            raise ValueError("rps must be positive")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.client = client
+        self.mix = mix
+        self.rps = rps
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_requests = max_requests
+
+        self._names = list(mix)
+        total = sum(mix.values())
+        self._cumulative = list(itertools.accumulate(weight / total for weight in mix.values()))
+        self._lock = threading.Lock()
+        self._histograms = {name: LatencyHistogram() for name in self._names}
+        self._errors: Dict[str, Counter] = {name: Counter() for name in self._names}
+
+    def _operation(self, index: int) -> str:
+        # Golden-ratio sequence: spreads each operation evenly through the run
+        position = (index * 0.6180339887498949) % 1.0
+        return self._names[min(bisect_right(self._cumulative, position), len(self._names) - 1)]
+
+    def _execute(self, index: int, scheduled: float) -> None:
+        name = self._operation(index)
+        error = None
+        try:
+            OPERATIONS[name](self.client, index)
+        except PayAgencyError as e:
+            error = type(e).__name__ if e.status_code is None else f"{type(e).__name__} ({e.status_code})"
+        except Exception as e:
+            error = type(e).__name__
+        latency = time.perf_counter() - scheduled
+
+        with self._lock:
+            self._histograms[name].record(latency)
+            if error is not None:
+                self._errors[name][error] += 1
+
+    def _within_limits(self, index: int, now: float, deadline: float) -> bool:
+        return now < deadline and (self.max_requests is None or index < self.max_requests)
+
+    def _run_closed(self, deadline: float) -> None:
+        counter = itertools.count()
+
+        def worker() -> None:
+            while True:
+                index = next(counter)
+                start = time.perf_counter()
+                if not self._within_limits(index, start, deadline):
+                    return
+                self._execute(index, start)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_open(self, start: float, deadline: float, rps: float) -> None:
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="payagency-loadgen") as executor:
+            for index in itertools.count():
+                scheduled = start + index / rps
+                if not self._within_limits(index, scheduled, deadline):
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._execute, index, scheduled)
+
+    def run(self) -> LoadReport:
+        """
+        Run the load
+
+        Returns:
+            Load report
+        """
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        deadline = start + self.duration
+
+        if self.rps is None:
+            self._run_closed(deadline)
+            mode = f"closed loop, {self.concurrency} workers"
+        else:
+            self._run_open(start, deadline, self.rps)
+            mode = f"open loop, {self.rps:g} req/s target, {self.concurrency} workers"
+
+        return LoadReport(
+            mode,
+            time.perf_counter() - start,
+            time.process_time() - cpu_start,
+            self._histograms,
+            self._errors,
+        )
+
+
+def offline_response(request: TransportRequest) -> Dict[str, Any]:
+    """
+    Canned gateway response used by ``--offline``
+
+    Args:
+        request: Request sent
+
+    Returns:
+        A successful response shaped like the gateway's
+    """
+    if request.method == "GET":
+        transactions = [
+            {
+                "transaction_id": f"TXN_{n}",
+                "status": "SUCCESS",
+                "amount": 100 + n,
+                "currency": "GBP",
+                "created_at": "2026-01-01T00:00:00Z",
+            }
+            for n in range(20)
+        ]
+        return {"status": "SUCCESS", "message": "Transactions fetched", "data": transactions}
+    return {
+        "status": "SUCCESS",
+        "message": "Request processed",
+        "data": {"transaction_id": "TXN_LOAD", "amount": 100, "currency": "GBP"},
+    }
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m payagency_api.loadgen",
+        description="Drive a mix of PayAgency SDK operations and report throughput, latency and client CPU.",
+    )
+    parser.add_argument("--base-url", help="Gateway or stand-in base URL (default: the SDK default)")
+    parser.add_argument("--offline", action="store_true", help="Use an in-memory transport instead of the network")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated server seconds per request with --offline")
+    parser.add_argument("--encryption-key", default=os.environ.get("PAYAGENCY_ENCRYPTION_KEY"))
+    parser.add_argument("--secret-key", default=os.environ.get("PAYAGENCY_SECRET_KEY"))
+    parser.add_argument("--mix", default=",".join(OPERATIONS),
+                        help="Operations and weights, e.g. s2s=5,transactions=1 (default: all, equally)")
+    parser.add_argument("--rps", type=float, help="Target requests per second (default: closed loop)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Worker threads (default: 10)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run (default: 10)")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--transport", default="requests", choices=("requests", "urllib3", "http2"))
+    parser.add_argument("--profile", action="store_true", help="Report CPU and wall time per SDK phase")
+    parser.add_argument("--profile-dump", metavar="PATH", help="Write the phase profile as a pstats file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command-line entry point
+
+    Args:
+        argv: Arguments (default: ``sys.argv[1:]``)
+
+    Returns:
+        Exit status
+    """
+    args = _parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    encryption_key, secret_key = args.encryption_key, args.secret_key
+    if args.offline:
+        encryption_key = encryption_key or "0" * 32
+        secret_key = secret_key or "PA_TEST_loadgen"
+        transport: Any = InMemoryTransport(offline_response, latency=args.latency, history=1)
+    else:
+        transport = args.transport
+    if not encryption_key or not secret_key:
+        print("error: set --encryption-key and --secret-key (or use --offline)", file=sys.stderr)
+        return 2
+
+    profiler = Profiler() if args.profile or args.profile_dump else None
+    client = PayAgencyApi(
+        encryption_key,
+        secret_key,
+        base_url=args.base_url,
+        transport=transport,
+        pool_maxsize=args.concurrency,
+        profiler=profiler,
+    )
+    try:
+        report = LoadGenerator(
+            client,
+            mix,
+            rps=args.rps,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            max_requests=args.requests,
+        ).run()
+    finally:
+        client.close()
+
+    if profiler is None:
+        print(json.dumps(report.to_dict(), indent=2) if args.json else report.format())
+        return 0
+
+    profile = profiler.report()
+    if args.profile_dump:
+        profile.dump_stats(args.profile_dump)
+    if args.json:
+        print(json.dumps({**report.to_dict(), "profile": profile.to_dict()}, indent=2))
+    else:
+        print(report.format() + "\n\n" + profile.format())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
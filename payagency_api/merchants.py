@@ -0,0 +1,228 @@
+"""
+Clients for many merchants over shared connections
+
+A platform holding credentials for many sub-merchants would otherwise create
+one ``PayAgencyApi`` per merchant, each with its own connection pool. A
+``PayAgencyClientPool`` creates lightweight per-merchant clients on first use
+that all send through one transport, so the number of open sockets depends
+on traffic rather than on the number of merchants. Each request still
+carries its merchant's ``Authorization`` header and is encrypted with its
+merchant's key. Clients unused for ``idle_timeout`` seconds, or beyond
+``max_clients``, are dropped (least recently used first) and recreated from
+the merchant's credentials when next needed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from . import forksafe
+from .client import PayAgencyApi, build_transport
+from .codec import get_codec
+from .compression import CompressionPolicy
+from .transports import Transport
+from .utils import validate_config
+
+
+Credentials = Tuple[str, str]
+
+
+class PayAgencyClientPool:
+    """
+    Per-merchant clients sharing one transport
+
+    Merchants are registered with ``add()`` or resolved on demand by a
+    ``credentials`` loader returning ``(encryption_key, secret_key)``.
+    The transport, JSON codec and compression policy are shared, as are any
+    ``hedging``, ``concurrency_limiter``, ``scheduler`` or
+    ``idempotency_store`` passed in ``client_options``. Idempotency records
+    are kept per merchant within a shared store, so identical submissions
+    from two merchants are never answered with each other's response. Call ``close()`` on the pool rather than on its
+    clients, which would close the shared transport.
+
+    Args:
+        credentials: Mapping of merchant ID to credentials, or a loader called
+            with a merchant ID that returns them or raises ``KeyError`` (optional)
+        max_clients: Merchant clients kept at once (default: 1000)
+        idle_timeout: Seconds after which an unused client is dropped (optional, never by default)
+        transport: "requests" (default), "urllib3", "http2" (requires httpx) or a Transport
+        session_mode: "shared", "thread" or "sharded" (default: "shared")
+        session_shards: Number of sessions in "sharded" mode (default: 4)
+        pool_maxsize: Connections kept per session (default: 10)
+        **client_options: Other ``PayAgencyApi`` arguments, applied to every merchant
+    """
+
+    def __init__(
+        self,
+        credentials: Union[Mapping[str, Credentials], Callable[[str], Credentials], None] = None,
+        max_clients: int = 1000,
+        idle_timeout: Optional[float] = None,
+        transport: Union[str, Transport] = "requests",
+        session_mode: str = "shared",
+        session_shards: int = 4,
+        pool_maxsize: int = 10,
+        **client_options: Any
+    ):
+        if max_clients < 1:
+            raise ValueError("max_clients must be at least 1")
+
+        self._credentials: Dict[str, Credentials] = {}
+        self._loader: Optional[Callable[[str], Credentials]] = None
+        if callable(credentials):
+            self._loader = credentials
+        elif credentials is not None:
+            for merchant_id, (encryption_key, secret_key) in credentials.items():
+                validate_config(encryption_key, secret_key)
+                self._credentials[merchant_id] = (encryption_key, secret_key)
+
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self._transport = build_transport(transport, session_mode, session_shards, pool_maxsize)
+
+        client_options["json_codec"] = get_codec(client_options.get("json_codec", "auto"))
+        if client_options.get("compression") is None:
+            client_options["compression"] = CompressionPolicy()
+        self.client_options = client_options
+
+        self._reset()
+        forksafe.register(self)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[str, Tuple[PayAgencyApi, float]]" = OrderedDict()
+        self._created = 0
+        self._evicted = 0
+        self._hits = 0
+
+    def _after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent at fork
+        # time; clients are cheap to recreate and the transport resets itself
+        self._reset()
+
+    @property
+    def transport(self) -> Transport:
+        """HTTP transport shared by all merchants"""
+        return self._transport
+
+    def add(self, merchant_id: str, encryption_key: str, secret_key: str) -> None:
+        """
+        Register or replace a merchant's credentials
+
+        Args:
+            merchant_id: Merchant identifier
+            encryption_key: The merchant's 32-character encryption key
+            secret_key: The merchant's API secret key
+
+        Raises:
+            ValueError: If the credentials are invalid
+        """
+        validate_config(encryption_key, secret_key)
+        with self._lock:
+            self._credentials[merchant_id] = (encryption_key, secret_key)
+            self._clients.pop(merchant_id, None)
+
+    def remove(self, merchant_id: str) -> None:
+        """
+        Forget a merchant's credentials and client
+
+        Args:
+            merchant_id: Merchant identifier
+        """
+        with self._lock:
+            self._credentials.pop(merchant_id, None)
+            self._clients.pop(merchant_id, None)
+
+    def get(self, merchant_id: str) -> PayAgencyApi:
+        """
+        Get a merchant's client, creating it if needed
+
+        Args:
+            merchant_id: Merchant identifier
+
+        Returns:
+            Client sending through the shared transport with the merchant's credentials
+
+        Raises:
+            KeyError: If the merchant is unknown
+            ValueError: If the loaded credentials are invalid
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(merchant_id)
+            if entry is not None:
+                self._clients[merchant_id] = (entry[0], now)
+                self._clients.move_to_end(merchant_id)
+                self._hits += 1
+                return entry[0]
+            credentials = self._credentials.get(merchant_id)
+
+        if credentials is None:
+            if self._loader is None:
+                raise KeyError(f"Unknown merchant: {merchant_id}")
+            credentials = self._loader(merchant_id)
+
+        encryption_key, secret_key = credentials
+        client = PayAgencyApi(encryption_key, secret_key, transport=self._transport, **self.client_options)
+
+        with self._lock:
+            # Another thread may have created the client meanwhile
+            entry = self._clients.get(merchant_id)
+            if entry is not None:
+                client = entry[0]
+            else:
+                self._created += 1
+            self._clients[merchant_id] = (client, now)
+            self._clients.move_to_end(merchant_id)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+                self._evicted += 1
+        return client
+
+    def __getitem__(self, merchant_id: str) -> PayAgencyApi:
+        return self.get(merchant_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_timeout is None:
+            return
+        while self._clients:
+            _, last_used = next(iter(self._clients.values()))
+            if now - last_used < self.idle_timeout:
+                return
+            self._clients.popitem(last=False)
+            self._evicted += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool metrics
+
+        Returns:
+            Registered merchants, live clients, clients created and evicted,
+            cache hits, and the shared transport's metrics
+        """
+        with self._lock:
+            return {
+                "merchants": len(self._credentials),
+                "clients": len(self._clients),
+                "created": self._created,
+                "evicted": self._evicted,
+                "hits": self._hits,
+                "transport": self._transport.stats(),
+            }
+
+    def close(self) -> None:
+        """Drop all clients and close the shared transport"""
+        with self._lock:
+            self._clients.clear()
+        self._transport.close()
+
+    def __enter__(self) -> "PayAgencyClientPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,289 @@
+"""
+Optional response model classes
+
+The SDK returns plain dicts typed with ``TypedDict``. The models in this module
+wrap those dicts without copying them: each model uses ``__slots__``, validates
+that required keys are present when it is created, and decodes nested objects
+and money amounts lazily, on first access.
+
+Example:
+    page = TransactionPage(client.txn.get_transactions())
+    for txn in page:
+        print(txn.transaction_id, txn.amount)  # amount is a Decimal
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union, overload
+
+from .exceptions import PayAgencyAPIError
+
+
+class _Field:
+    """Descriptor reading a key from the wrapped dict"""
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key or ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        if not self.key:
+            self.key = name
+
+    def __get__(self, obj: Optional["ResponseModel"], owner: type) -> Any:
+        if obj is None:
+            return self
+        return obj._raw.get(self.key)
+
+
+class _DecimalField(_Field):
+    """Descriptor converting a string or number amount to ``Decimal`` on access"""
+
+    def __get__(self, obj: Optional["ResponseModel"], owner: type) -> Any:
+        if obj is None:
+            return self
+
+        value = obj._raw.get(self.key)
+        if value is None or value == "":
+            return None
+
+        try:
+            return Decimal(str(value))
+        except InvalidOperation:
+            raise PayAgencyAPIError(
+                message=f"Malformed {type(obj).__name__} response: invalid amount in '{self.key}'",
+                response=obj._raw,
+            )
+
+
+class _NestedField(_Field):
+    """Descriptor wrapping a nested dict in a model on first access"""
+
+    def __init__(self, model: Type["ResponseModel"], key: Optional[str] = None):
+        super().__init__(key)
+        self.model = model
+
+    def __get__(self, obj: Optional["ResponseModel"], owner: type) -> Any:
+        if obj is None:
+            return self
+
+        if obj._decoded is None:
+            obj._decoded = {}
+        elif self.key in obj._decoded:
+            return obj._decoded[self.key]
+
+        value = obj._raw.get(self.key)
+        decoded = self.model(value) if value is not None else None
+        obj._decoded[self.key] = decoded
+        return decoded
+
+
+class ResponseModel:
+    """
+    Base class for response models
+
+    Args:
+        raw: Response dict to wrap
+
+    Raises:
+        PayAgencyAPIError: If the response is not an object or lacks required keys
+    """
+
+    __slots__ = ("_raw", "_decoded")
+
+    _required: Tuple[str, ...] = ()
+
+    def __init__(self, raw: Dict[str, Any]):
+        if not isinstance(raw, dict):
+            raise PayAgencyAPIError(
+                message=f"Malformed {type(self).__name__} response: expected an object",
+                response={"raw_response": raw},
+            )
+
+        missing = [key for key in self._required if key not in raw]
+        if missing:
+            raise PayAgencyAPIError(
+                message=f"Malformed {type(self).__name__} response: missing {', '.join(missing)}",
+                response=raw,
+            )
+
+        self._raw = raw
+        self._decoded: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_response(cls, raw: Dict[str, Any]) -> "ResponseModel":
+        """
+        Wrap a response dict
+
+        Args:
+            raw: Response dict
+
+        Returns:
+            Model instance
+        """
+        return cls(raw)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the wrapped response dict
+
+        Returns:
+            The original response dict
+        """
+        return self._raw
+
+    def __getitem__(self, key: str) -> Any:
+        return self._raw[key]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResponseModel):
+            return type(self) is type(other) and self._raw == other._raw
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._raw!r})"
+
+
+class MerchantConnector(ResponseModel):
+    """Merchant connector information"""
+
+    __slots__ = ()
+
+    name = _Field()
+
+
+class UserKyc(ResponseModel):
+    """User KYC information"""
+
+    __slots__ = ()
+
+    name = _Field()
+
+
+class User(ResponseModel):
+    """User information"""
+
+    __slots__ = ()
+
+    name = _Field()
+    user_kyc = _NestedField(UserKyc)
+
+
+class Transaction(ResponseModel):
+    """Transaction information"""
+
+    __slots__ = ()
+
+    _required = ("transaction_id", "amount", "currency", "status")
+
+    first_name = _Field()
+    last_name = _Field()
+    converted_amount = _DecimalField()
+    converted_currency = _Field()
+    transaction_id = _Field()
+    amount = _DecimalField()
+    currency = _Field()
+    status = _Field()
+    card_type = _Field()
+    card_number = _Field()
+    transaction_type = _Field()
+    order_id = _Field()
+    country = _Field()
+    email = _Field()
+    created_at = _Field()
+    transaction_date = _Field()
+    chargeback_date = _Field()
+    refund_date = _Field()
+    suspicious_date = _Field()
+    merchant_connector = _NestedField(MerchantConnector)
+    user = _NestedField(User)
+
+
+class TransactionMeta(ResponseModel):
+    """Transaction pagination metadata"""
+
+    __slots__ = ()
+
+    has_next_page = _Field("hasNextPage")
+    has_previous_page = _Field("hasPreviousPage")
+    next_cursor = _Field("nextCursor")
+    prev_cursor = _Field("prevCursor")
+
+    @property
+    def total_count(self) -> Optional[int]:
+        """Total number of transactions matching the query"""
+        # Older API versions spell the key "totatCount"
+        return self._raw.get("totalCount", self._raw.get("totatCount"))
+
+
+class TransactionPage(ResponseModel):
+    """
+    A page of transactions
+
+    Iterating or indexing the page wraps each transaction on access, so the
+    page holds no per-transaction objects beyond the response dicts.
+    """
+
+    __slots__ = ()
+
+    _required = ("data",)
+
+    message = _Field()
+    meta = _NestedField(TransactionMeta)
+
+    def __init__(self, raw: Dict[str, Any]):
+        super().__init__(raw)
+
+        if not isinstance(raw["data"], list):
+            raise PayAgencyAPIError(
+                message="Malformed TransactionPage response: 'data' must be a list",
+                response=raw,
+            )
+
+    @property
+    def transactions(self) -> List[Transaction]:
+        """All transactions on the page, wrapped"""
+        return [Transaction(item) for item in self._raw["data"]]
+
+    def __len__(self) -> int:
+        return len(self._raw["data"])
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for item in self._raw["data"]:
+            yield Transaction(item)
+
+    @overload
+    def __getitem__(self, key: int) -> Transaction: ...
+
+    @overload
+    def __getitem__(self, key: str) -> Any: ...
+
+    def __getitem__(self, key: Union[int, str]) -> Any:
+        if isinstance(key, int):
+            return Transaction(self._raw["data"][key])
+        return self._raw[key]
+
+
+class PaymentData(ResponseModel):
+    """Payment response data"""
+
+    __slots__ = ()
+
+    amount = _DecimalField()
+    currency = _Field()
+    order_id = _Field()
+    transaction_id = _Field()
+    customer = _Field()
+    refund = _Field()
+    chargeback = _Field()
+
+
+class PaymentResult(ResponseModel):
+    """Payment, payout or payout status response"""
+
+    __slots__ = ()
+
+    _required = ("status",)
+
+    status = _Field()
+    message = _Field()
+    redirect_url = _Field()
+    data = _NestedField(PaymentData)
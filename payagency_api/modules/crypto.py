@@ -2,8 +2,10 @@
 Cryptocurrency operations module
 """
 
-from typing import TYPE_CHECKING
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Iterable, Optional, Tuple, Union
 
+from ..exceptions import PayAgencyError
 from ..types.crypto import (
     CryptoPaymentInput,
     CryptoPaymentResponse,
@@ -39,7 +41,15 @@ class Crypto:
             
         Returns:
             Crypto payment response
+            
+        Raises:
+            PayAgencyValidationError: If the payment data is invalid
         """
+        self.client.validate(CryptoPaymentInput, data)
+        return self._send_payment(data)
+    
+    def _send_payment(self, data: Any) -> CryptoPaymentResponse:
+        # Callers have validated the data against their own input type
         endpoints = {
             "test": "/api/v1/test/crypto",
             "live": "/api/v1/live/crypto",
@@ -75,10 +85,15 @@ class Crypto:
             
         Returns:
             Crypto payment response
+            
+        Raises:
+            PayAgencyValidationError: If the OnRamp data is invalid
         """
+        self.client.validate(CryptoOnRampInput, data)
         # Add transaction_type to the data
         full_data = {**data, "transaction_type": "ONRAMP"}
-        return self.payment(full_data)
+        # Already validated against the narrower input type
+        return self._send_payment(full_data)
     
     def off_ramp(self, data: CryptoOffRampInput) -> CryptoPaymentResponse:
         """
@@ -89,10 +104,15 @@ class Crypto:
             
         Returns:
             Crypto payment response
+            
+        Raises:
+            PayAgencyValidationError: If the OffRamp data is invalid
         """
+        self.client.validate(CryptoOffRampInput, data)
         # Add transaction_type to the data
         full_data = {**data, "transaction_type": "OFFRAMP"}
-        return self.payment(full_data)
+        # Already validated against the narrower input type
+        return self._send_payment(full_data)
     
     def on_ramp_link(self, data: CryptoOnRampLinkInput) -> PaymentLinkResponse:
         """
@@ -131,15 +151,56 @@ class Crypto:
             
         Returns:
             Crypto PayIn response
+            
+        Raises:
+            PayAgencyValidationError: If the PayIn data is invalid
         """
         endpoints = {
             "test": "/api/v1/test/crypto/payin",
             "live": "/api/v1/live/crypto/payin",
         }
         
+        self.client.validate(CryptoPayinInput, data)
         endpoint = endpoints[self.client.environment]
         return self.client.make_request("POST", endpoint, data)
     
+    def apayin_batch(
+        self,
+        items: Union[Iterable[CryptoPayinInput], AsyncIterable[CryptoPayinInput]],
+        concurrency: int = 10,
+        executor: Optional[Executor] = None,
+        return_exceptions: bool = True
+    ) -> AsyncIterator[Tuple[int, Union[CryptoPayinResponse, PayAgencyError]]]:
+        """
+        Submit many direct crypto payins concurrently using the async transport
+        
+        Serialization and encryption run in ``executor`` so they do not
+        block the event loop (see ``PayAgencyApi.abatch_request``).
+        
+        Args:
+            items: PayIn data, as an iterable or async iterable
+            concurrency: Requests in flight at once (default: 10)
+            executor: Executor for serialization and encryption (optional)
+            return_exceptions: Yield a failed request's error as its result
+                instead of raising it (default: True)
+            
+        Returns:
+            Async iterator of ``(index, response)`` pairs in completion order
+            
+        Raises:
+            ValueError: If concurrency is less than 1 or no async transport is configured
+        """
+        endpoints = {
+            "test": "/api/v1/test/crypto/payin",
+            "live": "/api/v1/live/crypto/payin",
+        }
+        
+        endpoint = endpoints[self.client.environment]
+        return self.client.abatch_request(
+            "POST", endpoint, items, schema=CryptoPayinInput, concurrency=concurrency,
+            executor=executor, return_exceptions=return_exceptions
+        )
+    
     def payin_link(self, data: CryptoPayinLinkInput) -> PaymentLinkResponse:
         """
         Create PayIn link
@@ -2,8 +2,10 @@
 Payment operations module
 """
 
-from typing import TYPE_CHECKING
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, AsyncIterable, AsyncIterator, Iterable, Optional, Tuple, Union
 
+from ..exceptions import PayAgencyError
 from ..types.payment import S2SInput, HostedInput, APMInput, PaymentResponse
 
 if TYPE_CHECKING:
@@ -16,15 +18,57 @@ class Payment:
     def __init__(self, client: "PayAgencyApi"):
         self.client = client
     
-    def s2s(self, data: S2SInput) -> PaymentResponse:
+    def s2s(self, data: S2SInput, idempotency_key: Optional[str] = None) -> PaymentResponse:
         """
         Server-to-Server card payment
         
         Args:
             data: S2S payment data
+            idempotency_key: Idempotency key for safe retries (optional; derived
+                from the payload when the client has an idempotency store)
             
         Returns:
             Payment response
+            
+        Raises:
+            PayAgencyValidationError: If the payment data is invalid
+        """
+        endpoints = {
+            "test": "/api/v1/test/card",
+            "live": "/api/v1/live/card",
+        }
+        
+        self.client.validate(S2SInput, data)
+        endpoint = endpoints[self.client.environment]
+        return self.client.make_request(
+            "POST", endpoint, data, idempotency_key=idempotency_key, idempotent=True
+        )
+    
+    def as2s_batch(
+        self,
+        items: Union[Iterable[S2SInput], AsyncIterable[S2SInput]],
+        concurrency: int = 10,
+        executor: Optional[Executor] = None,
+        return_exceptions: bool = True
+    ) -> AsyncIterator[Tuple[int, Union[PaymentResponse, PayAgencyError]]]:
+        """
+        Submit many S2S card payments concurrently using the async transport
+        
+        Serialization and encryption run in ``executor`` so they do not
+        block the event loop (see ``PayAgencyApi.abatch_request``).
+        
+        Args:
+            items: S2S payment data, as an iterable or async iterable
+            concurrency: Requests in flight at once (default: 10)
+            executor: Executor for serialization and encryption (optional)
+            return_exceptions: Yield a failed request's error as its result
+                instead of raising it (default: True)
+            
+        Returns:
+            Async iterator of ``(index, response)`` pairs in completion order
+            
+        Raises:
+            ValueError: If concurrency is less than 1 or no async transport is configured
         """
         endpoints = {
             "test": "/api/v1/test/card",
@@ -32,40 +76,59 @@ class Payment:
         }
         
         endpoint = endpoints[self.client.environment]
-        return self.client.make_request("POST", endpoint, data)
+        return self.client.abatch_request(
+            "POST", endpoint, items, schema=S2SInput, concurrency=concurrency,
+            executor=executor, return_exceptions=return_exceptions, idempotent=True
+        )
     
-    def hosted(self, data: HostedInput) -> PaymentResponse:
+    def hosted(self, data: HostedInput, idempotency_key: Optional[str] = None) -> PaymentResponse:
         """
         Hosted payment
         
         Args:
             data: Hosted payment data
+            idempotency_key: Idempotency key for safe retries (optional; derived
+                from the payload when the client has an idempotency store)
             
         Returns:
             Payment response
+            
+        Raises:
+            PayAgencyValidationError: If the payment data is invalid
         """
         endpoints = {
             "test": "/api/v1/test/hosted/card",
             "live": "/api/v1/live/hosted/card",
         }
         
+        self.client.validate(HostedInput, data)
         endpoint = endpoints[self.client.environment]
-        return self.client.make_request("POST", endpoint, data)
+        return self.client.make_request(
+            "POST", endpoint, data, idempotency_key=idempotency_key, idempotent=True
+        )
     
-    def apm(self, data: APMInput) -> PaymentResponse:
+    def apm(self, data: APMInput, idempotency_key: Optional[str] = None) -> PaymentResponse:
         """
         Alternative Payment Method
         
         Args:
             data: APM payment data
+            idempotency_key: Idempotency key for safe retries (optional; derived
+                from the payload when the client has an idempotency store)
             
         Returns:
             Payment response
+            
+        Raises:
+            PayAgencyValidationError: If the payment data is invalid
         """
         endpoints = {
             "test": "/api/v1/test/apm",
             "live": "/api/v1/live/apm",  
         }
         
+        self.client.validate(APMInput, data)
         endpoint = endpoints[self.client.environment]
-        return self.client.make_request("POST", endpoint, data)
+        return self.client.make_request(
+            "POST", endpoint, data, idempotency_key=idempotency_key, idempotent=True
+        )
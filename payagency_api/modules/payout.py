@@ -2,7 +2,7 @@
 Payout operations module
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from ..types.payout import (
     PayoutInput,
@@ -23,23 +23,31 @@ class Payout:
     def __init__(self, client: "PayAgencyApi"):
         self.client = client
     
-    def create_payout(self, data: PayoutInput) -> PayoutResponse:
+    def create_payout(self, data: PayoutInput, idempotency_key: Optional[str] = None) -> PayoutResponse:
         """
         Create a payout
         
         Args:
             data: Payout data
+            idempotency_key: Idempotency key for safe retries (optional; derived
+                from the payload when the client has an idempotency store)
             
         Returns:
             Payout response
+            
+        Raises:
+            PayAgencyValidationError: If the payout data is invalid
         """
         endpoints = {
             "test": "/api/v1/test/payout",
             "live": "/api/v1/live/payout",
         }
         
+        self.client.validate(PayoutInput, data)
         endpoint = endpoints[self.client.environment]
-        return self.client.make_request("POST", endpoint, data)
+        return self.client.make_request(
+            "POST", endpoint, data, idempotency_key=idempotency_key, idempotent=True
+        )
     
     def get_wallets(self) -> WalletsResponse:
         """
@@ -2,21 +2,29 @@
 Transaction operations module
 """
 
-from typing import TYPE_CHECKING
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterator, Mapping, Optional
 
-from ..types.transaction import TransactionsInput, TransactionsResponse
+from ..scheduling import REPORTING
+from ..streaming import JsonItemStream
+from ..types.transaction import TransactionInfo, TransactionsInput, TransactionsResponse
 
 if TYPE_CHECKING:
     from ..client import PayAgencyApi
 
 
 class Transaction:
-    """Transaction operations"""
+    """
+    Transaction operations
+    
+    History requests are scheduled as "reporting" unless a
+    ``request_priority()`` block says otherwise.
+    """
     
     def __init__(self, client: "PayAgencyApi"):
         self.client = client
     
-    def get_transactions(self, data: TransactionsInput = None) -> TransactionsResponse:
+    def get_transactions(self, data: Optional[TransactionsInput] = None) -> TransactionsResponse:
         """
         Get transaction history
         
@@ -36,11 +44,11 @@ class Transaction:
         if data:
             # Convert to query parameters
             params = {k: v for k, v in data.items() if v is not None}
-            return self.client.make_request("GET", endpoint, params=params)
+            return self.client.make_request("GET", endpoint, params=params, priority=REPORTING)
         else:
-            return self.client.make_request("GET", endpoint)
+            return self.client.make_request("GET", endpoint, priority=REPORTING)
     
-    def get_wallet_transactions(self, data: TransactionsInput = None) -> TransactionsResponse:
+    def get_wallet_transactions(self, data: Optional[TransactionsInput] = None) -> TransactionsResponse:
         """
         Get wallet transaction history
         
@@ -60,6 +68,220 @@ class Transaction:
         if data:
             # Convert to query parameters
             params = {k: v for k, v in data.items() if v is not None}
-            return self.client.make_request("GET", endpoint, params=params)
+            return self.client.make_request("GET", endpoint, params=params, priority=REPORTING)
         else:
-            return self.client.make_request("GET", endpoint)
+            return self.client.make_request("GET", endpoint, priority=REPORTING)
+    
+    def stream_transactions(self, data: Optional[TransactionsInput] = None) -> JsonItemStream:
+        """
+        Stream a page of transaction history, parsing transactions as they arrive
+        
+        Only one transaction is held in memory at a time; the page's ``meta``
+        (with ``nextCursor``) is available from the stream once iteration
+        has finished.
+        
+        Args:
+            data: Transaction query parameters (optional)
+            
+        Returns:
+            Stream of transactions
+        """
+        endpoints = {
+            "test": "/api/v1/test-transactions",
+            "live": "/api/v1/live-transactions",
+        }
+        
+        endpoint = endpoints[self.client.environment]
+        params = {k: v for k, v in (data or {}).items() if v is not None}
+        return self.client.stream_request("GET", endpoint, params=params or None, priority=REPORTING)
+    
+    def stream_wallet_transactions(self, data: Optional[TransactionsInput] = None) -> JsonItemStream:
+        """
+        Stream a page of wallet transaction history, parsing transactions as they arrive
+        
+        Args:
+            data: Transaction query parameters (optional)
+            
+        Returns:
+            Stream of transactions
+        """
+        endpoints = {
+            "test": "/api/v1/test-wallet-transactions",
+            "live": "/api/v1/live-wallet-transactions",
+        }
+        
+        endpoint = endpoints[self.client.environment]
+        params = {k: v for k, v in (data or {}).items() if v is not None}
+        return self.client.stream_request("GET", endpoint, params=params or None, priority=REPORTING)
+    
+    def iter_transaction_pages(self, data: Optional[TransactionsInput] = None) -> Iterator[TransactionsResponse]:
+        """
+        Iterate over transaction history pages, following cursors
+        
+        Args:
+            data: Transaction query parameters (optional)
+            
+        Returns:
+            Iterator of transactions responses
+        """
+        return self._iter_pages(self.get_transactions, data)
+    
+    def iter_wallet_transaction_pages(self, data: Optional[TransactionsInput] = None) -> Iterator[TransactionsResponse]:
+        """
+        Iterate over wallet transaction history pages, following cursors
+        
+        Args:
+            data: Transaction query parameters (optional)
+            
+        Returns:
+            Iterator of transactions responses
+        """
+        return self._iter_pages(self.get_wallet_transactions, data)
+    
+    def aiter_transactions(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        data: Optional[TransactionsInput] = None,
+        prefetch: int = 2
+    ) -> AsyncIterator[TransactionInfo]:
+        """
+        Iterate asynchronously over transaction history, following cursors
+        
+        Requires an ``async_transport``. A background task fetches pages
+        ahead of the consumer, holding at most ``prefetch`` unread pages;
+        when the consumer falls behind, fetching pauses until it catches up.
+        Breaking out of the loop, closing the iterator or cancelling the
+        consuming task cancels the outstanding fetch.
+        
+        Args:
+            start: Earliest transaction date (``transaction_start_date``, optional)
+            end: Latest transaction date (``transaction_end_date``, optional)
+            data: Other transaction query parameters (optional)
+            prefetch: Pages fetched ahead of the consumer (default: 2)
+            
+        Returns:
+            Async iterator of transactions
+            
+        Raises:
+            ValueError: If prefetch is less than 1
+        """
+        endpoints = {
+            "test": "/api/v1/test-transactions",
+            "live": "/api/v1/live-transactions",
+        }
+        
+        return self._aiter(endpoints[self.client.environment], start, end, data, prefetch)
+    
+    def aiter_wallet_transactions(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        data: Optional[TransactionsInput] = None,
+        prefetch: int = 2
+    ) -> AsyncIterator[TransactionInfo]:
+        """
+        Iterate asynchronously over wallet transaction history, following cursors
+        
+        Takes the same arguments as ``aiter_transactions``.
+        
+        Returns:
+            Async iterator of wallet transactions
+            
+        Raises:
+            ValueError: If prefetch is less than 1
+        """
+        endpoints = {
+            "test": "/api/v1/test-wallet-transactions",
+            "live": "/api/v1/live-wallet-transactions",
+        }
+        
+        return self._aiter(endpoints[self.client.environment], start, end, data, prefetch)
+    
+    def _aiter(
+        self,
+        endpoint: str,
+        start: Optional[str],
+        end: Optional[str],
+        data: Optional[TransactionsInput],
+        prefetch: int
+    ) -> AsyncIterator[TransactionInfo]:
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+        if self.client.async_transport is None:
+            raise ValueError("aiter_transactions requires an async_transport")
+        
+        query: Dict[str, Any] = dict(data or {})
+        if start is not None:
+            query["transaction_start_date"] = start
+        if end is not None:
+            query["transaction_end_date"] = end
+        return self._aiter_items(endpoint, {k: v for k, v in query.items() if v is not None}, prefetch)
+    
+    async def _aiter_items(
+        self,
+        endpoint: str,
+        query: Dict[str, Any],
+        prefetch: int
+    ) -> AsyncIterator[TransactionInfo]:
+        # Each entry is a page, the exception that ended fetching, or None at the end
+        pages: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+        closed = False
+        
+        async def fetch() -> None:
+            next_query: Optional[Dict[str, Any]] = query
+            try:
+                while next_query is not None:
+                    page = await self.client.amake_request("GET", endpoint, params=next_query or None)
+                    await pages.put(page)
+                    next_query = self._next_query(next_query, page)
+            except asyncio.CancelledError:
+                # An Exception subclass before Python 3.8
+                raise
+            except Exception as e:
+                # Nobody reads the queue once the consumer stopped, so a put
+                # could wait forever on a full queue
+                if not closed:
+                    await pages.put(e)
+                return
+            await pages.put(None)
+        
+        fetcher = asyncio.ensure_future(fetch())
+        try:
+            while True:
+                page = await pages.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                for item in page.get("data") or []:
+                    yield item
+        finally:
+            closed = True
+            if not fetcher.done():
+                fetcher.cancel()
+                await asyncio.wait([fetcher])
+    
+    @staticmethod
+    def _next_query(query: Dict[str, Any], page: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        # Query for the page after ``page``, or None if it was the last
+        meta = page.get("meta") or {}
+        next_cursor = meta.get("nextCursor")
+        if not meta.get("hasNextPage") or not next_cursor or next_cursor == query.get("nextCursor"):
+            return None
+        
+        query = {**query, "nextCursor": next_cursor}
+        query.pop("prevCursor", None)
+        return query
+    
+    @staticmethod
+    def _iter_pages(
+        fetch: Callable[[Any], TransactionsResponse],
+        data: Optional[TransactionsInput]
+    ) -> Iterator[TransactionsResponse]:
+        query: Optional[Dict[str, Any]] = dict(data or {})
+        
+        while query is not None:
+            page = fetch(query or None)
+            yield page
+            query = Transaction._next_query(query, page)
@@ -0,0 +1,299 @@
+"""
+Per-phase CPU and wall time attribution
+
+With a ``Profiler`` on the client, every request is split into phases and
+each phase's wall time and CPU time (of the calling thread) is accumulated
+per operation ("METHOD endpoint"):
+
+- ``validate``: input validation against the TypedDict schema
+- ``idempotency``: idempotency key derivation and store lookup
+- ``headers``: request header building
+- ``serialize``: JSON encoding of the payload
+- ``encrypt``: payload encryption
+- ``encode``: JSON encoding (and compression) of the request body
+- ``send``: the transport call, including waiting for the network
+- ``decode``: JSON decoding of the response
+
+``report()`` returns a ``ProfileReport``, which renders a table, writes a
+pstats file readable by ``pstats``/snakeviz, or produces collapsed stacks for
+flame graph tools (speedscope, flamegraph.pl).
+"""
+
+import marshal
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import forksafe
+
+
+PHASES = ("validate", "idempotency", "headers", "serialize", "encrypt", "encode", "send", "decode")
+
+_operation: ContextVar[Optional[str]] = ContextVar("payagency_profile_operation", default=None)
+# Phases timed before the request's operation is known (validation), by name
+_pending: ContextVar[Optional[List[Tuple[str, float, float]]]] = ContextVar(
+    "payagency_profile_pending", default=None
+)
+
+
+class _Timing:
+    __slots__ = ("calls", "wall", "cpu")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def add(self, wall: float, cpu: float) -> None:
+        self.calls += 1
+        self.wall += wall
+        self.cpu += cpu
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "wall": self.wall, "cpu": self.cpu}
+
+
+class Profiler:
+    """
+    Accumulates per-operation, per-phase timings
+
+    CPU time is ``time.thread_time()`` of the thread running the phase, so
+    concurrent requests do not inflate each other's figures; for requests
+    made with ``amake_request`` the operation total also includes other
+    tasks running on the event loop while the request awaited the network.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._operations: Dict[str, _Timing] = {}
+        self._phases: Dict[Tuple[str, str], _Timing] = {}
+        forksafe.register(self)
+
+    def _after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent at fork time
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, phase: Optional[str], wall: float, cpu: float) -> None:
+        """
+        Add a timing
+
+        Args:
+            operation: Operation name
+            phase: Phase name, or None for the operation as a whole
+            wall: Wall seconds
+            cpu: CPU seconds
+        """
+        with self._lock:
+            if phase is None:
+                timing = self._operations.get(operation)
+                if timing is None:
+                    timing = self._operations[operation] = _Timing()
+            else:
+                timing = self._phases.get((operation, phase))
+                if timing is None:
+                    timing = self._phases[(operation, phase)] = _Timing()
+            timing.add(wall, cpu)
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        """
+        Time a request; phases inside are attributed to it
+
+        Args:
+            name: Operation name
+        """
+        token = _operation.set(name)
+        pending = _pending.get() or []
+        _pending.set(None)
+        for phase, wall, cpu in pending:
+            self.record(name, phase, wall, cpu)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(
+                name,
+                None,
+                time.perf_counter() - wall_start + sum(wall for _, wall, _ in pending),
+                time.thread_time() - cpu_start + sum(cpu for _, _, cpu in pending),
+            )
+            _operation.reset(token)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time one phase of the current operation
+
+        Phases timed outside an operation (such as validation, which runs
+        before the request is built) are attributed to the next operation
+        started in the same thread or task, unless they raised.
+
+        Args:
+            name: Phase name
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            operation = _operation.get()
+            if operation is not None:
+                self.record(operation, name, wall, cpu)
+            elif not failed:
+                _pending.set([*(_pending.get() or []), (name, wall, cpu)])
+
+    def report(self) -> "ProfileReport":
+        """
+        Snapshot the timings
+
+        Returns:
+            Profile report
+        """
+        with self._lock:
+            operations = {
+                name: {**timing.to_dict(), "phases": {}} for name, timing in self._operations.items()
+            }
+            for (name, phase), timing in self._phases.items():
+                operation = operations.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "phases": {}})
+                operation["phases"][phase] = timing.to_dict()
+        return ProfileReport(operations)
+
+    def reset(self) -> None:
+        """Discard all timings"""
+        with self._lock:
+            self._operations.clear()
+            self._phases.clear()
+
+
+class ProfileReport:
+    """
+    Timings by operation and phase
+
+    ``operations`` maps each operation to its ``calls``, ``wall`` and ``cpu``
+    seconds and a ``phases`` mapping of the same figures per phase. Time not
+    covered by any phase (client bookkeeping, scheduling waits) is reported
+    as the ``other`` phase.
+    """
+
+    def __init__(self, operations: Dict[str, Dict[str, Any]]):
+        self.operations = operations
+        for operation in operations.values():
+            phases = operation["phases"]
+            if operation["calls"]:
+                phases["other"] = {
+                    "calls": operation["calls"],
+                    "wall": max(0.0, operation["wall"] - sum(p["wall"] for p in phases.values())),
+                    "cpu": max(0.0, operation["cpu"] - sum(p["cpu"] for p in phases.values())),
+                }
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report as plain data
+
+        Returns:
+            Copy of ``operations``
+        """
+        return {
+            name: {**operation, "phases": {phase: dict(t) for phase, t in operation["phases"].items()}}
+            for name, operation in self.operations.items()
+        }
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Phase timings summed over all operations
+
+        Returns:
+            Mapping of phase to calls, wall and CPU seconds
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for operation in self.operations.values():
+            for phase, timing in operation["phases"].items():
+                total = totals.setdefault(phase, {"calls": 0, "wall": 0.0, "cpu": 0.0})
+                for key in total:
+                    total[key] += timing[key]
+        return totals
+
+    def format(self) -> str:
+        """
+        Report as a text table
+
+        Returns:
+            Per-operation phase breakdown, with per-call times in microseconds
+        """
+        lines = [f"{'operation / phase':<44}{'calls':>8}{'cpu ms':>10}{'cpu us/call':>13}{'wall us/call':>14}{'cpu %':>7}"]
+        for name, operation in sorted(self.operations.items()):
+            calls = operation["calls"] or 1
+            lines.append(
+                f"{name:<44}{operation['calls']:>8}{operation['cpu'] * 1000:>10.2f}"
+                f"{operation['cpu'] / calls * 1e6:>13.1f}{operation['wall'] / calls * 1e6:>14.1f}{'':>7}"
+            )
+            order = {phase: index for index, phase in enumerate(PHASES + ("other",))}
+            for phase, timing in sorted(operation["phases"].items(), key=lambda item: order.get(item[0], 99)):
+                share = timing["cpu"] / operation["cpu"] * 100 if operation["cpu"] else 0.0
+                per_call = timing["calls"] or 1
+                lines.append(
+                    f"  {phase:<42}{timing['calls']:>8}{timing['cpu'] * 1000:>10.2f}"
+                    f"{timing['cpu'] / per_call * 1e6:>13.1f}{timing['wall'] / per_call * 1e6:>14.1f}{share:>6.1f}%"
+                )
+        return "\n".join(lines)
+
+    def folded(self, clock: str = "cpu") -> str:
+        """
+        Collapsed stacks for flame graph tools
+
+        Args:
+            clock: "cpu" or "wall" (default: "cpu")
+
+        Returns:
+            One ``payagency;operation;phase microseconds`` line per phase
+        """
+        if clock not in ("cpu", "wall"):
+            raise ValueError("clock must be 'cpu' or 'wall'")
+        lines = []
+        for name, operation in sorted(self.operations.items()):
+            for phase, timing in operation["phases"].items():
+                micros = int(round(timing[clock] * 1e6))
+                if micros:
+                    lines.append(f"payagency;{name};{phase} {micros}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def dump_stats(self, path: str, clock: str = "cpu") -> None:
+        """
+        Write the report in ``cProfile``'s stats format
+
+        Each operation appears as a function calling one function per phase,
+        so the file can be opened with ``pstats.Stats`` or snakeviz.
+
+        Args:
+            path: File path
+            clock: "cpu" or "wall" (default: "cpu")
+        """
+        if clock not in ("cpu", "wall"):
+            raise ValueError("clock must be 'cpu' or 'wall'")
+
+        stats: Dict[Tuple[str, int, str], Tuple[int, int, float, float, Dict[Any, Any]]] = {}
+        for name, operation in self.operations.items():
+            operation_key = ("payagency_api", 0, name)
+            phases_time = 0.0
+            for phase, timing in operation["phases"].items():
+                if phase == "other":
+                    continue
+                calls, seconds = timing["calls"], timing[clock]
+                phases_time += seconds
+                stats[("payagency_api", 0, f"{name} [{phase}]")] = (
+                    calls, calls, seconds, seconds, {operation_key: (calls, calls, seconds, seconds)}
+                )
+            total = operation[clock]
+            calls = operation["calls"]
+            stats[operation_key] = (calls, calls, max(0.0, total - phases_time), total, {})
+
+        with open(path, "wb") as file:
+            marshal.dump(stats, file)
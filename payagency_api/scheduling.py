@@ -0,0 +1,199 @@
+"""
+Priority scheduling of requests over a shared connection budget
+
+A ``PriorityScheduler`` admits at most ``capacity`` requests at a time
+(normally the connection pool size). Each request belongs to a priority
+class; classes can reserve slots that other classes may not take, and
+waiting requests are admitted by weighted fair queueing, so a heavy
+reporting export cannot starve interactive checkouts.
+
+The priority of a request comes from ``request_priority()`` when active,
+otherwise from the calling API method (transaction history defaults to
+"reporting"), otherwise "interactive".
+"""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from . import forksafe
+from .exceptions import PayAgencyOverloadError
+
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+REPORTING = "reporting"
+PRIORITIES = (INTERACTIVE, BATCH, REPORTING)
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 8, BATCH: 2, REPORTING: 1}
+
+_current_priority: ContextVar[Optional[str]] = ContextVar("payagency_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Run requests made in a block (in this thread or task) with a priority
+
+    Args:
+        priority: "interactive", "batch" or "reporting"
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Priority must be one of {', '.join(PRIORITIES)}")
+
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def resolve_priority(default: Optional[str] = None) -> str:
+    """
+    Resolve the priority of a request
+
+    Args:
+        default: Priority of the calling API method (optional)
+
+    Returns:
+        The active ``request_priority()``, else ``default``, else "interactive"
+    """
+    return _current_priority.get() or default or INTERACTIVE
+
+
+class _Waiter:
+    __slots__ = ("granted",)
+
+    def __init__(self) -> None:
+        self.granted = False
+
+
+class PriorityScheduler:
+    """
+    Admission control with per-class reserved capacity and weighted fair queueing
+
+    Args:
+        capacity: Requests admitted at once across all classes (default: 10)
+        reserved: Slots held back for each class (default: 2 for "interactive")
+        weights: Share of admissions each class gets while several are waiting
+            (default: interactive 8, batch 2, reporting 1)
+        queue_timeout: Seconds a request may wait before being shed (optional, no timeout by default)
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10,
+        reserved: Optional[Dict[str, int]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        queue_timeout: Optional[float] = None
+    ):
+        reserved = {INTERACTIVE: 2} if reserved is None else reserved
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        unknown = (set(reserved) | set(weights)) - set(PRIORITIES)
+        if unknown:
+            raise ValueError(f"Unknown priority classes: {', '.join(sorted(unknown))}")
+        if sum(reserved.values()) > capacity:
+            raise ValueError("Reserved slots exceed capacity")
+
+        self.capacity = capacity
+        self.reserved = {priority: reserved.get(priority, 0) for priority in PRIORITIES}
+        self.weights = weights
+        self.queue_timeout = queue_timeout
+        self._reset()
+        forksafe.register(self)
+
+    def _reset(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._inflight = {priority: 0 for priority in PRIORITIES}
+        self._queues: Dict[str, Deque[_Waiter]] = {priority: deque() for priority in PRIORITIES}
+        self._finish = {priority: 0.0 for priority in PRIORITIES}
+        self._clock = 0.0
+        self._admitted = {priority: 0 for priority in PRIORITIES}
+        self._shed = {priority: 0 for priority in PRIORITIES}
+
+    def _after_fork(self) -> None:
+        # Admitted and queued requests belong to the parent's threads
+        self._reset()
+
+    def _admissible(self, priority: str) -> bool:
+        free = self.capacity - sum(self._inflight.values())
+        held_for_others = sum(
+            max(0, self.reserved[other] - self._inflight[other])
+            for other in PRIORITIES if other != priority
+        )
+        return free - held_for_others > 0
+
+    def _admit(self, priority: str, start: float) -> None:
+        # Start-time fair queueing: each admission costs a class 1/weight of
+        # virtual time, and the clock follows the start tag of the last admission
+        self._finish[priority] = start + 1 / self.weights[priority]
+        self._clock = max(self._clock, start)
+        self._inflight[priority] += 1
+        self._admitted[priority] += 1
+
+    def _dispatch(self) -> None:
+        while True:
+            candidates = [p for p in PRIORITIES if self._queues[p] and self._admissible(p)]
+            if not candidates:
+                return
+            priority = min(candidates, key=lambda p: self._finish[p] + 1 / self.weights[p])
+            self._queues[priority].popleft().granted = True
+            self._admit(priority, self._finish[priority])
+            self._condition.notify_all()
+
+    @contextmanager
+    def acquire(self, priority: str = INTERACTIVE) -> Iterator[None]:
+        """
+        Hold a slot for the duration of a request
+
+        Args:
+            priority: "interactive", "batch" or "reporting" (default: "interactive")
+
+        Raises:
+            PayAgencyOverloadError: If the request waited longer than ``queue_timeout``
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Priority must be one of {', '.join(PRIORITIES)}")
+
+        with self._condition:
+            if not self._queues[priority]:
+                # A class that was idle does not get credit for the time it was idle
+                self._finish[priority] = max(self._finish[priority], self._clock)
+
+            if not self._queues[priority] and self._admissible(priority):
+                self._admit(priority, self._finish[priority])
+            else:
+                waiter = _Waiter()
+                self._queues[priority].append(waiter)
+                self._condition.wait_for(lambda: waiter.granted, timeout=self.queue_timeout)
+                if not waiter.granted:
+                    self._queues[priority].remove(waiter)
+                    self._shed[priority] += 1
+                    raise PayAgencyOverloadError(f"Timed out waiting for a {priority} request slot")
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._inflight[priority] -= 1
+                self._dispatch()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-class scheduler state
+
+        Returns:
+            Mapping of priority class to in-flight, queued, admitted and shed request counts
+        """
+        with self._condition:
+            return {
+                priority: {
+                    "inflight": self._inflight[priority],
+                    "queued": len(self._queues[priority]),
+                    "admitted": self._admitted[priority],
+                    "shed": self._shed[priority],
+                }
+                for priority in PRIORITIES
+            }
@@ -0,0 +1,250 @@
+"""
+Thread-safe HTTP session management
+"""
+
+import itertools
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import forksafe
+
+
+SESSION_MODES = ("shared", "thread", "sharded")
+
+
+class LockMetrics:
+    """Thread-safe counters for lock acquisitions and wait time"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        """
+        Record one lock acquisition
+
+        Args:
+            wait: Seconds spent waiting for the lock
+        """
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+            if wait > 0.0001:
+                self.contended += 1
+
+    def reset(self) -> None:
+        """Reset all counters"""
+        with self._lock:
+            self.acquisitions = 0
+            self.contended = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current counters
+
+        Returns:
+            Acquisitions, contended acquisitions (waited >0.1ms), total, mean
+            and max wait in seconds
+        """
+        with self._lock:
+            return {
+                "acquisitions": self.acquisitions,
+                "contended": self.contended,
+                "total_wait": self.total_wait,
+                "mean_wait": self.total_wait / self.acquisitions if self.acquisitions else 0.0,
+                "max_wait": self.max_wait,
+            }
+
+
+class _SessionOwner:
+    """Marker kept in thread-local storage; collected when its thread exits"""
+
+
+def _discard_session(
+    lock: threading.Lock, sessions: List[requests.Session], session: requests.Session
+) -> None:
+    with lock:
+        if session in sessions:
+            sessions.remove(session)
+    session.close()
+
+
+class SessionPool:
+    """
+    Provides ``requests`` sessions to concurrent callers
+
+    ``requests.Session`` is not documented as thread-safe. Its connection pool
+    (urllib3) is, but cookie handling and adapter state are not guarded. The
+    pool supports three modes:
+
+    - ``shared``: one session for all threads, no locking (the historical
+      behaviour; suitable because the API uses no cookies)
+    - ``thread``: one session per thread, created lazily; no locking on the
+      request path. A thread's session is closed and forgotten when the
+      thread exits
+    - ``sharded``: ``shards`` sessions; each request checks out the least
+      busy one, preferring the thread's own shard. The lock is held only
+      while choosing, so concurrency is not capped by the number of shards
+
+    Lock wait time is recorded in ``metrics`` for session creation (``thread``)
+    and per-request shard selection (``sharded``). ``shared`` mode takes no
+    lock, so its metrics stay at zero.
+
+    In a forked child (pre-fork servers, ``multiprocessing``), sessions
+    inherited from the parent are discarded and rebuilt before first use, so
+    parent and child never share a socket.
+
+    Args:
+        mode: Session mode (default: "shared")
+        shards: Number of sessions in "sharded" mode (default: 4)
+        pool_maxsize: Connections kept per host and session (default: 10)
+    """
+
+    def __init__(self, mode: str = "shared", shards: int = 4, pool_maxsize: int = 10):
+        if mode not in SESSION_MODES:
+            raise ValueError(f"Session mode must be one of {', '.join(SESSION_MODES)}")
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+
+        self.mode = mode
+        self.shards = shards
+        self.pool_maxsize = pool_maxsize
+        self.metrics = LockMetrics()
+
+        self._build()
+        forksafe.register(self)
+
+    def _build(self) -> None:
+        self._registry_lock = threading.Lock()
+        self._sessions: List[requests.Session] = []
+        self._local = threading.local()
+        self._shard_inflight: List[int] = []
+        self._shard_counter = itertools.count()
+
+        if self.mode == "shared":
+            self._sessions.append(self._new_session())
+        elif self.mode == "sharded":
+            for _ in range(self.shards):
+                self._sessions.append(self._new_session())
+                self._shard_inflight.append(0)
+
+    def _after_fork(self) -> None:
+        # Sockets inherited from the parent must not be used or closed here;
+        # drop them and start with fresh sessions and counters
+        self.metrics = LockMetrics()
+        self._build()
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """Session used by the calling thread"""
+        forksafe.check_fork()
+
+        if self.mode == "shared":
+            return self._sessions[0]
+
+        if self.mode == "sharded":
+            return self._sessions[self._shard_index()]
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._new_session()
+            start = time.perf_counter()
+            with self._registry_lock:
+                self.metrics.record(time.perf_counter() - start)
+                self._sessions.append(session)
+            self._local.session = session
+            # Thread-local values are released when their thread exits; the
+            # finalizer holds no reference to the pool so it can be collected
+            self._local.owner = owner = _SessionOwner()
+            weakref.finalize(owner, _discard_session, self._registry_lock, self._sessions, session)
+        return session
+
+    @property
+    def sessions(self) -> List[requests.Session]:
+        """All sessions created so far"""
+        with self._registry_lock:
+            return list(self._sessions)
+
+    def _shard_index(self) -> int:
+        # Thread idents are aligned addresses, so assign shards round-robin instead
+        index = getattr(self._local, "shard", None)
+        if index is None:
+            index = next(self._shard_counter) % self.shards
+            self._local.shard = index
+        return index
+
+    @contextmanager
+    def acquire(self) -> Iterator[requests.Session]:
+        """
+        Check out the calling thread's session for one request
+
+        Returns:
+            Context manager yielding the session
+        """
+        if self.mode != "sharded":
+            yield self.session
+            return
+
+        forksafe.check_fork()
+        preferred = self._shard_index()
+        start = time.perf_counter()
+        with self._registry_lock:
+            self.metrics.record(time.perf_counter() - start)
+            inflight = self._shard_inflight
+            index = min(range(self.shards), key=lambda i: (inflight[i], (i - preferred) % self.shards))
+            inflight[index] += 1
+            session = self._sessions[index]
+        try:
+            yield session
+        finally:
+            with self._registry_lock:
+                inflight[index] -= 1
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request using the calling thread's session
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Arguments passed to ``requests.Session.request``
+
+        Returns:
+            Response
+        """
+        with self.acquire() as session:
+            return session.request(method=method, url=url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get session and lock contention metrics
+
+        Returns:
+            Mode, number of sessions and lock metrics
+        """
+        return {"mode": self.mode, "sessions": len(self.sessions), **self.metrics.snapshot()}
+
+    def close(self) -> None:
+        """Close all pooled connections; sessions reconnect on next use"""
+        for session in self.sessions:
+            session.close()
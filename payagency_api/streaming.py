@@ -0,0 +1,157 @@
+"""
+Incremental JSON parsing of streamed responses
+
+``JsonItemStream`` reads a JSON object chunk by chunk and yields the
+elements of one of its array members (``"data"`` for transaction pages) as
+soon as each element has arrived, so only one element is held in memory at
+a time. The object's other members (``"meta"``, ``"message"``) are collected
+into ``fields`` as they are passed.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .exceptions import PayAgencyAPIError
+
+
+_WHITESPACE = " \t\n\r"
+
+
+def _invalid(detail: str) -> PayAgencyAPIError:
+    return PayAgencyAPIError(message=f"Invalid JSON response from server: {detail}")
+
+
+class JsonItemStream:
+    """
+    Stream the elements of an array member of a JSON object
+
+    Iterating parses the document; ``fields`` is complete once iteration
+    has finished. The stream can only be iterated once; use it as a context
+    manager, or call ``close()``, when stopping early.
+
+    Args:
+        chunks: Document bytes, in chunks of any size
+        key: Name of the array member to stream (default: "data")
+
+    Raises:
+        PayAgencyAPIError: While iterating, if the document is not a JSON object or is truncated
+    """
+
+    def __init__(self, chunks: Iterable[bytes], key: str = "data"):
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._scanner = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._started = False
+
+    def _fill(self, wanted: int = 1) -> bool:
+        # Read until at least ``wanted`` more characters are buffered (or EOF)
+        if self._pos > 65536:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+        target = len(self._buffer) + wanted
+        while not self._eof and len(self._buffer) < target:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                self._buffer += self._decoder.decode(b"", final=True)
+            else:
+                self._buffer += self._decoder.decode(chunk)
+        return len(self._buffer) >= target
+
+    def _peek(self) -> str:
+        # Next non-whitespace character, skipping whitespace
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                raise _invalid("unexpected end of document")
+
+    def _expect(self, characters: str) -> str:
+        character = self._peek()
+        if character not in characters:
+            raise _invalid(f"expected one of {characters!r}, got {character!r}")
+        self._pos += 1
+        return character
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._scanner.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise _invalid("malformed or truncated value")
+            else:
+                # A number or literal ending exactly at the buffer end may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            # Grow the buffer geometrically so large values are not rescanned per chunk
+            self._fill(max(1, len(self._buffer) - self._pos))
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._started:
+            raise ValueError("JsonItemStream can only be iterated once")
+        self._started = True
+
+        try:
+            yield from self._parse()
+        finally:
+            # Release the response (and any slot held for it) as soon as parsing stops
+            self.close()
+
+    def _parse(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            name = self._value()
+            if not isinstance(name, str):
+                raise _invalid("object keys must be strings")
+            self._expect(":")
+
+            if name == self.key and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._expect(",]") == "]":
+                            break
+            else:
+                self.fields[name] = self._value()
+
+            if self._expect(",}") == "}":
+                return
+
+    def close(self) -> None:
+        """Stop reading and release the underlying response"""
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "JsonItemStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def meta(self) -> Optional[Dict[str, Any]]:
+        """The document's ``meta`` member, once iteration has finished"""
+        return self.fields.get("meta")
@@ -0,0 +1,323 @@
+"""
+Incremental transaction sync into a local SQLite database
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
+
+from .types.transaction import TransactionInfo, TransactionsInput
+
+if TYPE_CHECKING:
+    from .client import PayAgencyApi
+
+
+SOURCES = ("transactions", "wallet_transactions")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS transactions ("
+    "source TEXT NOT NULL, "
+    "transaction_id TEXT NOT NULL, "
+    "order_id TEXT, "
+    "status TEXT, "
+    "created_at TEXT, "
+    "amount TEXT, "
+    "currency TEXT, "
+    "data TEXT NOT NULL, "
+    "synced_at REAL NOT NULL, "
+    "PRIMARY KEY (source, transaction_id))",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_transaction_id ON transactions (transaction_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_order_id ON transactions (order_id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_status ON transactions (status)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions (source, created_at)",
+    "CREATE TABLE IF NOT EXISTS sync_state ("
+    "source TEXT PRIMARY KEY, "
+    "high_water_mark TEXT, "
+    "query TEXT, "
+    "cursor TEXT, "
+    "updated_at REAL NOT NULL)",
+)
+
+
+class TransactionSync:
+    """
+    Incrementally mirrors transaction history into SQLite
+
+    The first run pulls the full history (or everything since ``start_date``).
+    Later runs only request transactions from the stored high-water mark,
+    minus ``overlap_days`` to pick up status changes on recent rows, and upsert
+    them by ``transaction_id``. The cursor is saved after every page, so an
+    interrupted run resumes where it stopped; the high-water mark only moves
+    once a run has finished, to the newest ``created_at`` stored.
+
+    The overlap bounds how late an update is noticed: a transaction whose
+    status changes more than ``overlap_days`` after it was created is not
+    re-fetched by delta runs. Run ``sync(full=True)`` periodically (e.g.
+    nightly) if such changes (refunds, chargebacks) must be mirrored.
+
+    Args:
+        client: PayAgency API client
+        path: Database file path
+        source: "transactions" or "wallet_transactions"
+        overlap_days: Days re-fetched before the high-water mark (default: 1)
+    """
+
+    def __init__(
+        self,
+        client: "PayAgencyApi",
+        path: str,
+        source: str = "transactions",
+        overlap_days: int = 1
+    ):
+        if source not in SOURCES:
+            raise ValueError(f"source must be one of {', '.join(SOURCES)}")
+
+        self.client = client
+        self.path = path
+        self.source = source
+        self.overlap_days = overlap_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def __enter__(self) -> "TransactionSync":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """Latest ``created_at`` seen by a completed sync"""
+        return self._state()["high_water_mark"]
+
+    def sync(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        full: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fetch new and changed transactions into the database
+
+        Args:
+            start_date: Earliest transaction date (YYYY-MM-DD) for the first
+                or a full run (optional)
+            end_date: Latest transaction date (YYYY-MM-DD) (optional)
+            full: Re-fetch everything since ``start_date`` instead of only
+                the overlap before the high-water mark, discarding an
+                interrupted run's cursor (default: False)
+
+        Returns:
+            Sync summary with pages, fetched, inserted and updated counts and
+            the new high-water mark
+        """
+        state = self._state()
+
+        if state["cursor"] is not None and not full:
+            # Resume an interrupted run with its original query
+            query: TransactionsInput = json.loads(state["query"] or "{}")
+            query["nextCursor"] = state["cursor"]
+        else:
+            query = {}
+            since = None if full else self._delta_start(state["high_water_mark"])
+            since = since or start_date
+            if since:
+                query["transaction_start_date"] = since
+            if end_date:
+                query["transaction_end_date"] = end_date
+
+        base_query = {k: v for k, v in query.items() if k != "nextCursor"}
+        high_water_mark = state["high_water_mark"]
+        summary: Dict[str, Any] = {"pages": 0, "fetched": 0, "inserted": 0, "updated": 0}
+
+        txn = self.client.txn
+        pages = (
+            txn.iter_transaction_pages(query)
+            if self.source == "transactions"
+            else txn.iter_wallet_transaction_pages(query)
+        )
+
+        for page in pages:
+            # Responses may omit members their type declares
+            fields: Mapping[str, Any] = page
+            rows: List[TransactionInfo] = fields.get("data") or []
+            meta: Mapping[str, Any] = fields.get("meta") or {}
+            cursor = meta.get("nextCursor") if meta.get("hasNextPage") else None
+
+            with self._lock:
+                inserted, updated = self._upsert(rows)
+                if cursor is None:
+                    # Pages fetched before an interruption are in the table too
+                    high_water_mark = self._newest_created_at() or high_water_mark
+                self._save_state(high_water_mark, base_query, cursor)
+                self._conn.commit()
+
+            summary["pages"] += 1
+            summary["fetched"] += len(rows)
+            summary["inserted"] += inserted
+            summary["updated"] += updated
+
+        summary["high_water_mark"] = high_water_mark
+        return summary
+
+    def get(self, transaction_id: str) -> Optional[TransactionInfo]:
+        """
+        Get a transaction by ID
+
+        Args:
+            transaction_id: Transaction ID
+
+        Returns:
+            Transaction info, or None if not synced
+        """
+        rows = self._select("transaction_id = ?", (transaction_id,), limit=1)
+        return rows[0] if rows else None
+
+    def find_by_order_id(self, order_id: str) -> List[TransactionInfo]:
+        """
+        Get transactions for an order
+
+        Args:
+            order_id: Merchant order ID
+
+        Returns:
+            Matching transactions, newest first
+        """
+        return self._select("order_id = ?", (order_id,))
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[TransactionInfo]:
+        """
+        Query synced transactions
+
+        Args:
+            status: Transaction status filter (optional)
+            since: Inclusive lower bound on ``created_at`` (optional)
+            until: Exclusive upper bound on ``created_at`` (optional)
+            limit: Maximum number of rows (optional)
+
+        Returns:
+            Matching transactions, newest first
+        """
+        clauses = []
+        params: List[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        return self._select(" AND ".join(clauses) or "1", tuple(params), limit=limit)
+
+    def count(self) -> int:
+        """
+        Count synced transactions
+
+        Returns:
+            Number of rows for this source
+        """
+        with self._lock:
+            count: int = self._conn.execute(
+                "SELECT COUNT(*) FROM transactions WHERE source = ?", (self.source,)
+            ).fetchone()[0]
+        return count
+
+    def _delta_start(self, high_water_mark: Optional[str]) -> Optional[str]:
+        if not high_water_mark:
+            return None
+        try:
+            day = date.fromisoformat(high_water_mark[:10])
+        except ValueError:
+            return None
+        return (day - timedelta(days=self.overlap_days)).isoformat()
+
+    def _newest_created_at(self) -> Optional[str]:
+        newest: Optional[str] = self._conn.execute(
+            "SELECT MAX(created_at) FROM transactions WHERE source = ?", (self.source,)
+        ).fetchone()[0]
+        return newest
+
+    def _state(self) -> Dict[str, Optional[str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water_mark, query, cursor FROM sync_state WHERE source = ?",
+                (self.source,),
+            ).fetchone()
+        if row is None:
+            return {"high_water_mark": None, "query": None, "cursor": None}
+        return {"high_water_mark": row[0], "query": row[1], "cursor": row[2]}
+
+    def _save_state(self, high_water_mark: Optional[str], query: Dict[str, Any], cursor: Optional[str]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state (source, high_water_mark, query, cursor, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.source, high_water_mark, json.dumps(query), cursor, time.time()),
+        )
+
+    def _upsert(self, rows: List[TransactionInfo]) -> Tuple[int, int]:
+        inserted = updated = 0
+        now = time.time()
+
+        for row in rows:
+            transaction_id = row.get("transaction_id")
+            if not transaction_id:
+                continue
+
+            data = json.dumps(row, sort_keys=True)
+            existing = self._conn.execute(
+                "SELECT data FROM transactions WHERE source = ? AND transaction_id = ?",
+                (self.source, transaction_id),
+            ).fetchone()
+
+            if existing is not None and existing[0] == data:
+                continue
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transactions "
+                "(source, transaction_id, order_id, status, created_at, amount, currency, data, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.source,
+                    transaction_id,
+                    row.get("order_id"),
+                    row.get("status"),
+                    row.get("created_at"),
+                    row.get("amount"),
+                    row.get("currency"),
+                    data,
+                    now,
+                ),
+            )
+            if existing is None:
+                inserted += 1
+            else:
+                updated += 1
+
+        return inserted, updated
+
+    def _select(self, where: str, params: tuple, limit: Optional[int] = None) -> List[TransactionInfo]:
+        sql = f"SELECT data FROM transactions WHERE source = ? AND ({where}) ORDER BY created_at DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(sql, (self.source,) + params).fetchall()
+        return [json.loads(row[0]) for row in rows]
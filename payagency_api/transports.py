@@ -0,0 +1,898 @@
+"""
+Pluggable HTTP transports
+
+``PayAgencyApi.make_request`` builds the URL, headers and encoded body, and
+hands them to a transport, which sends them and returns the status, headers
+and decoded body bytes (with the number of bytes received, where the HTTP
+library exposes it, in ``wire_bytes``). Transports raise ``PayAgencyNetworkError`` for
+connection-level failures; HTTP status handling stays in the client.
+``stream()`` returns a ``StreamingResponse`` whose body is read in chunks;
+transports without native streaming deliver the whole body as one chunk.
+
+Built-in transports:
+
+- ``RequestsTransport``: ``requests`` sessions from a ``SessionPool`` (default)
+- ``Urllib3Transport``: ``urllib3.PoolManager`` directly, skipping the
+  ``requests`` layer
+- ``HttpxTransport``: ``httpx`` with HTTP/2 multiplexing
+- ``AsyncHttpxTransport``: ``httpx.AsyncClient`` for ``amake_request``
+- ``InMemoryTransport`` / ``AsyncInMemoryTransport``: no network, for tests
+  and benchmarks
+"""
+
+import asyncio
+import json
+import socket
+import ssl
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Mapping, Optional, Tuple, Type, Union
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+from . import forksafe
+from .compression import decompress
+from .exceptions import (
+    PayAgencyConnectionError,
+    PayAgencyNetworkError,
+    PayAgencyTimeoutError,
+    PayAgencyTLSError,
+)
+from .sessions import SessionPool
+
+
+class TransportRequest:
+    """A request as handed to a transport"""
+
+    __slots__ = ("method", "url", "headers", "body", "params")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None
+    ):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.params = params
+
+    @property
+    def path(self) -> str:
+        """URL path without host or query string"""
+        return urlsplit(self.url).path
+
+    def json(self) -> Any:
+        """
+        Decode the body as JSON
+
+        Returns:
+            Decoded body, or None if there is no body
+        """
+        if not self.body:
+            return None
+        return json.loads(decompress(self.body, self.headers.get("Content-Encoding")))
+
+
+class TransportResponse:
+    """
+    A response returned by a transport
+
+    ``content`` is the decoded body; ``wire_bytes`` is the size of the body as
+    received (before ``Content-Encoding`` was removed), or None if unknown.
+    """
+
+    __slots__ = ("status_code", "headers", "content", "wire_bytes")
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        content: bytes,
+        wire_bytes: Optional[int] = None
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.wire_bytes = wire_bytes
+
+    @property
+    def text(self) -> str:
+        """Body decoded as UTF-8"""
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        """
+        Decode the body as JSON
+
+        Returns:
+            Decoded body
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        return json.loads(self.content)
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class StreamingResponse:
+    """
+    A response whose body is read incrementally
+
+    Use as a context manager, or call ``close()``, to release the connection.
+    """
+
+    __slots__ = ("status_code", "headers", "_chunks", "_close", "_wire_bytes")
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        chunks: Iterator[bytes],
+        close: Optional[Callable[[], None]] = None,
+        wire_bytes: Optional[Callable[[], Optional[int]]] = None
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self._chunks = chunks
+        self._close = close
+        self._wire_bytes = wire_bytes
+
+    @property
+    def wire_bytes(self) -> Optional[int]:
+        """Bytes of the body received so far, before decoding (None if unknown)"""
+        return self._wire_bytes() if self._wire_bytes is not None else None
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """
+        Iterate over the body
+
+        Returns:
+            Iterator of body chunks
+        """
+        return self._chunks
+
+    def read(self) -> TransportResponse:
+        """
+        Read the rest of the body
+
+        Returns:
+            Transport response with the remaining body
+        """
+        content = b"".join(self._chunks)
+        return TransportResponse(self.status_code, self.headers, content, self.wire_bytes)
+
+    def close(self) -> None:
+        """Release the connection"""
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def __enter__(self) -> "StreamingResponse":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class Transport:
+    """Base class for synchronous transports"""
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        """
+        Send a request
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            body: Encoded request body (optional)
+            params: Query parameters (optional)
+            timeout: Timeout in seconds (optional)
+
+        Returns:
+            Transport response
+
+        Raises:
+            PayAgencyNetworkError: For connection-level failures (``PayAgencyConnectionError``,
+                ``PayAgencyTimeoutError`` or ``PayAgencyTLSError`` where the cause is known)
+        """
+        raise NotImplementedError
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> StreamingResponse:
+        """
+        Send a request and return before the body is read
+
+        The default implementation reads the whole body with ``send()``.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            body: Encoded request body (optional)
+            params: Query parameters (optional)
+            timeout: Timeout in seconds (optional)
+            chunk_size: Preferred size of body chunks in bytes (default: 64 KiB)
+
+        Returns:
+            Streaming response
+
+        Raises:
+            PayAgencyNetworkError: For connection-level failures, including while reading the body
+        """
+        response = self.send(method, url, headers, body=body, params=params, timeout=timeout)
+        return StreamingResponse(response.status_code, response.headers, iter([response.content]))
+
+    def preconnect(self, url: str, connections: int, timeout: Optional[float] = None) -> int:
+        """
+        Open idle keep-alive connections to a URL's host ahead of use
+
+        The default implementation opens none.
+
+        Args:
+            url: URL whose host to connect to
+            connections: Connections wanted
+            timeout: Connect timeout in seconds (optional)
+
+        Returns:
+            Connections now open and pooled for the host
+
+        Raises:
+            PayAgencyNetworkError: If a connection cannot be opened
+        """
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get transport metrics
+
+        Returns:
+            Transport-specific metrics
+        """
+        return {}
+
+    def close(self) -> None:
+        """Close all connections"""
+
+
+class AsyncTransport:
+    """Base class for asynchronous transports"""
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        """
+        Send a request
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            body: Encoded request body (optional)
+            params: Query parameters (optional)
+            timeout: Timeout in seconds (optional)
+
+        Returns:
+            Transport response
+
+        Raises:
+            PayAgencyNetworkError: For connection-level failures (``PayAgencyConnectionError``,
+                ``PayAgencyTimeoutError`` or ``PayAgencyTLSError`` where the cause is known)
+        """
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Close all connections"""
+
+
+# Exception class names used by requests, urllib3 and httpx, matched by name
+# so that optional libraries need not be imported to classify their errors
+_CONNECT_ERRORS = frozenset({
+    "NewConnectionError", "ConnectTimeoutError", "NameResolutionError", "ConnectTimeout", "ConnectError",
+})
+_TIMEOUT_ERRORS = frozenset({
+    "ReadTimeoutError", "ReadTimeout", "WriteTimeout", "PoolTimeout", "Timeout", "TimeoutException",
+})
+
+
+def _causes(error: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    pending = [error]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+        linked = [current.__cause__, current.__context__, getattr(current, "reason", None), *current.args]
+        pending.extend(item for item in linked if isinstance(item, BaseException))
+
+
+def _network_error(error: Exception) -> PayAgencyNetworkError:
+    """
+    Map an HTTP library exception to the SDK's network error taxonomy
+
+    TLS failures take precedence over connection failures (the request was
+    never sent), which take precedence over timeouts (the request may have
+    been processed). Anything else is a plain ``PayAgencyNetworkError``.
+    """
+    causes = list(_causes(error))
+    names = {cls.__name__ for cause in causes for cls in type(cause).__mro__}
+
+    error_class: Type[PayAgencyNetworkError]
+    if "SSLError" in names or any(isinstance(cause, ssl.SSLError) for cause in causes):
+        error_class = PayAgencyTLSError
+    elif names & _CONNECT_ERRORS or any(
+        isinstance(cause, (ConnectionRefusedError, socket.gaierror)) for cause in causes
+    ):
+        error_class = PayAgencyConnectionError
+    elif names & _TIMEOUT_ERRORS or any(isinstance(cause, TimeoutError) for cause in causes):
+        error_class = PayAgencyTimeoutError
+    else:
+        error_class = PayAgencyNetworkError
+
+    return error_class(
+        message=f"Network error: {str(error)}",
+        status_code=None,
+        response=None
+    )
+
+
+def _raw_bytes_read(response: requests.Response) -> Optional[int]:
+    # ``raw`` is normally the urllib3 response, which counts bytes before
+    # decoding; responses from other adapters may not support ``tell()``
+    try:
+        read = response.raw.tell()
+    except (AttributeError, OSError):
+        return None
+    return read if isinstance(read, int) else None
+
+
+def _fill_pool(pool: Any, connections: int, timeout: Optional[float]) -> int:
+    # Check out distinct connections from a urllib3 pool, connect those not
+    # yet connected and return them all to the pool as idle keep-alive
+    # connections. urllib3 has no public API for this.
+    taken = []
+    try:
+        for _ in range(min(connections, pool.pool.maxsize)):
+            taken.append(pool._get_conn())
+        for conn in taken:
+            if getattr(conn, "sock", None) is None:
+                if timeout is not None:
+                    conn.timeout = timeout
+                conn.connect()
+        return len(taken)
+    finally:
+        for conn in taken:
+            pool._put_conn(conn)
+
+
+class RequestsTransport(Transport):
+    """
+    Transport built on ``requests`` sessions
+
+    Args:
+        session_mode: "shared", "thread" or "sharded" (default: "shared")
+        session_shards: Number of sessions in "sharded" mode (default: 4)
+        pool_maxsize: Connections kept per session (default: 10)
+    """
+
+    def __init__(self, session_mode: str = "shared", session_shards: int = 4, pool_maxsize: int = 10):
+        self.pool = SessionPool(mode=session_mode, shards=session_shards, pool_maxsize=pool_maxsize)
+
+    @property
+    def session(self) -> requests.Session:
+        """Session used by the calling thread"""
+        return self.pool.session
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        try:
+            response = self.pool.request(
+                method=method,
+                url=url,
+                data=body,
+                params=params,
+                headers=headers,
+                timeout=timeout
+            )
+        except requests.RequestException as e:
+            raise _network_error(e)
+
+        content = response.content
+        return TransportResponse(response.status_code, response.headers, content, _raw_bytes_read(response))
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> StreamingResponse:
+        try:
+            response = self.pool.request(
+                method=method,
+                url=url,
+                data=body,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                stream=True
+            )
+        except requests.RequestException as e:
+            raise _network_error(e)
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                yield from response.iter_content(chunk_size)
+            except requests.RequestException as e:
+                raise _network_error(e)
+
+        return StreamingResponse(
+            response.status_code, response.headers, chunks(), response.close, lambda: _raw_bytes_read(response)
+        )
+
+    def preconnect(self, url: str, connections: int, timeout: Optional[float] = None) -> int:
+        forksafe.check_fork()
+
+        # Thread mode can only warm the calling thread's session; sharded
+        # mode spreads the connections over the shards
+        sessions = [self.pool.session] if self.pool.mode == "thread" else self.pool.sessions
+        per_session = -(-connections // len(sessions))
+
+        opened = 0
+        try:
+            for session in sessions:
+                # Look the pool up the way Session.request does, so the
+                # connections land in the pool requests will use
+                settings = session.merge_environment_settings(url, {}, None, None, None)
+                adapter = session.get_adapter(url)
+                if not isinstance(adapter, requests.adapters.HTTPAdapter):
+                    continue
+                if hasattr(adapter, "get_connection_with_tls_context"):
+                    pool = adapter.get_connection_with_tls_context(
+                        requests.Request("GET", url).prepare(),
+                        settings["verify"],
+                        proxies=settings["proxies"],
+                        cert=settings["cert"],
+                    )
+                else:
+                    pool = adapter.get_connection(url, settings["proxies"])
+                opened += _fill_pool(pool, min(per_session, connections - opened), timeout)
+        except (OSError, requests.RequestException) as e:
+            raise _network_error(e)
+        return opened
+
+    def stats(self) -> Dict[str, Any]:
+        return self.pool.stats()
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport using ``urllib3.PoolManager`` directly
+
+    Skips the per-request overhead of ``requests`` (hooks, cookie handling,
+    environment proxy lookup). The pool manager is thread-safe and rebuilt in
+    forked children.
+
+    Args:
+        pool_maxsize: Connections kept per host (default: 10)
+    """
+
+    def __init__(self, pool_maxsize: int = 10):
+        import urllib3
+
+        self._urllib3 = urllib3
+        self.pool_maxsize = pool_maxsize
+        self.manager = self._new_manager()
+        forksafe.register(self)
+
+    def _new_manager(self) -> Any:
+        return self._urllib3.PoolManager(maxsize=self.pool_maxsize, retries=False)
+
+    def _after_fork(self) -> None:
+        self.manager = self._new_manager()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        forksafe.check_fork()
+
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+        try:
+            response = self.manager.request(
+                method,
+                url,
+                body=body,
+                headers=dict(headers),
+                timeout=timeout,
+                retries=False,
+            )
+        except self._urllib3.exceptions.HTTPError as e:
+            raise _network_error(e)
+
+        content = response.data
+        return TransportResponse(response.status, response.headers, content, response.tell())
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> StreamingResponse:
+        forksafe.check_fork()
+
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+        try:
+            response = self.manager.request(
+                method,
+                url,
+                body=body,
+                headers=dict(headers),
+                timeout=timeout,
+                retries=False,
+                preload_content=False,
+            )
+        except self._urllib3.exceptions.HTTPError as e:
+            raise _network_error(e)
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                yield from response.stream(chunk_size)
+            except self._urllib3.exceptions.HTTPError as e:
+                raise _network_error(e)
+
+        return StreamingResponse(response.status, response.headers, chunks(), response.release_conn, response.tell)
+
+    def preconnect(self, url: str, connections: int, timeout: Optional[float] = None) -> int:
+        forksafe.check_fork()
+
+        try:
+            return _fill_pool(self.manager.connection_from_url(url), connections, timeout)
+        except (OSError, self._urllib3.exceptions.HTTPError) as e:
+            raise _network_error(e)
+
+    def close(self) -> None:
+        self.manager.clear()
+
+
+class HttpxTransport(Transport):
+    """
+    HTTP/2 transport built on ``httpx``
+
+    Requests to the same host are multiplexed over a small number of HTTP/2
+    connections instead of one HTTP/1.1 connection per in-flight request.
+    The underlying ``httpx.Client`` is thread-safe and is rebuilt in forked
+    children.
+
+    Requires ``pip install payagency-api[http2]``.
+
+    Args:
+        http2: Whether to negotiate HTTP/2 (default: True)
+        max_connections: Maximum open connections (default: 10)
+    """
+
+    def __init__(self, http2: bool = True, max_connections: int = 10):
+        self._httpx = _import_httpx()
+        self.http2 = http2
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._requests = 0
+        self.client = self._new_client()
+        forksafe.register(self)
+
+    def _new_client(self) -> Any:
+        return self._httpx.Client(http2=self.http2, limits=_httpx_limits(self._httpx, self.max_connections))
+
+    def _after_fork(self) -> None:
+        # Never touch the parent's sockets from the child
+        self._lock = threading.Lock()
+        self.client = self._new_client()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        forksafe.check_fork()
+
+        with self._lock:
+            self._requests += 1
+
+        try:
+            response = self.client.request(
+                method, url, content=body, params=params, headers=headers, timeout=timeout
+            )
+        except self._httpx.TransportError as e:
+            raise _network_error(e)
+
+        return TransportResponse(
+            response.status_code, response.headers, response.content, response.num_bytes_downloaded
+        )
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> StreamingResponse:
+        forksafe.check_fork()
+
+        with self._lock:
+            self._requests += 1
+
+        request = self.client.build_request(
+            method, url, content=body, params=params, headers=headers, timeout=timeout
+        )
+        try:
+            response = self.client.send(request, stream=True)
+        except self._httpx.TransportError as e:
+            raise _network_error(e)
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                yield from response.iter_bytes(chunk_size)
+            except self._httpx.TransportError as e:
+                raise _network_error(e)
+
+        return StreamingResponse(
+            response.status_code, response.headers, chunks(), response.close,
+            lambda: response.num_bytes_downloaded
+        )
+
+    def preconnect(self, url: str, connections: int, timeout: Optional[float] = None) -> int:
+        # httpx cannot open a connection without a request; one HEAD request
+        # opens one, which with HTTP/2 carries every request to the host
+        forksafe.check_fork()
+
+        origin = urlsplit(url)._replace(path="/", query="", fragment="").geturl()
+        try:
+            self.client.request("HEAD", origin, timeout=timeout)
+        except self._httpx.TransportError as e:
+            raise _network_error(e)
+        return 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": "http2" if self.http2 else "httpx", "requests": self._requests}
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class AsyncHttpxTransport(AsyncTransport):
+    """
+    Asynchronous transport built on ``httpx.AsyncClient``
+
+    Requires ``pip install payagency-api[http2]``.
+
+    Args:
+        http2: Whether to negotiate HTTP/2 (default: True)
+        max_connections: Maximum open connections (default: 10)
+    """
+
+    def __init__(self, http2: bool = True, max_connections: int = 10):
+        self._httpx = _import_httpx()
+        self.client = self._httpx.AsyncClient(
+            http2=http2, limits=_httpx_limits(self._httpx, max_connections)
+        )
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        try:
+            response = await self.client.request(
+                method, url, content=body, params=params, headers=headers, timeout=timeout
+            )
+        except self._httpx.TransportError as e:
+            raise _network_error(e)
+
+        return TransportResponse(
+            response.status_code, response.headers, response.content, response.num_bytes_downloaded
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def _import_httpx() -> Any:
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError(
+            "httpx is required for the httpx transports; "
+            "install it with 'pip install payagency-api[http2]'"
+        )
+    return httpx
+
+
+def _httpx_limits(httpx: Any, max_connections: int) -> Any:
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
+HandlerResult = Union[TransportResponse, Tuple[int, Any], Dict[str, Any]]
+
+
+class InMemoryTransport(Transport):
+    """
+    Transport serving responses from a Python callable, without any network
+
+    The handler receives a ``TransportRequest`` and returns a
+    ``TransportResponse``, a ``(status_code, json_body)`` tuple, or a JSON
+    body (sent with status 200). Without a handler every request gets
+    ``{"status": "SUCCESS"}``. Sent requests are kept in ``requests``.
+
+    Args:
+        handler: Response handler (optional)
+        latency: Seconds to sleep per request, to simulate the network (default: 0)
+        history: Number of requests kept in ``requests`` (default: 1000)
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[TransportRequest], HandlerResult]] = None,
+        latency: float = 0.0,
+        history: int = 1000
+    ):
+        self.handler = handler
+        self.latency = latency
+        self.requests: Deque[TransportRequest] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def _respond(self, request: TransportRequest) -> TransportResponse:
+        with self._lock:
+            self._count += 1
+            self.requests.append(request)
+
+        result: HandlerResult = self.handler(request) if self.handler else {"status": "SUCCESS"}
+        if isinstance(result, TransportResponse):
+            return result
+
+        status_code, payload = result if isinstance(result, tuple) else (200, result)
+        return TransportResponse(
+            status_code,
+            {"Content-Type": "application/json"},
+            json.dumps(payload).encode('utf-8'),
+        )
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(TransportRequest(method, url, headers, body, params))
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> StreamingResponse:
+        response = self.send(method, url, headers, body=body, params=params, timeout=timeout)
+        content = response.content
+        chunks = (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+        return StreamingResponse(response.status_code, response.headers, chunks)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": "in-memory", "requests": self._count}
+
+
+class AsyncInMemoryTransport(AsyncTransport):
+    """
+    Asynchronous counterpart of ``InMemoryTransport``
+
+    Args:
+        handler: Response handler (optional)
+        latency: Seconds to sleep per request (default: 0)
+        history: Number of requests kept in ``requests`` (default: 1000)
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[TransportRequest], HandlerResult]] = None,
+        latency: float = 0.0,
+        history: int = 1000
+    ):
+        self._sync = InMemoryTransport(handler, history=history)
+        self.latency = latency
+
+    @property
+    def requests(self) -> Deque[TransportRequest]:
+        """Requests sent so far"""
+        return self._sync.requests
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._sync._respond(TransportRequest(method, url, headers, body, params))
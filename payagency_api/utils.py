@@ -2,19 +2,24 @@
 Utility functions for encryption and other operations
 """
 
-import json
 import os
-from typing import Dict, Any
+from functools import partial
+from typing import Dict, Any, Iterable, List, Optional, Union
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 
+from .codec import JsonCodec
+from .forksafe import process_map
 
-def encrypt_data(data: str, key: str) -> str:
+_DEFAULT_CODEC = JsonCodec()
+
+
+def encrypt_data(data: Union[str, bytes], key: str) -> str:
     """
     Encrypts data using AES-256-CBC.
     
     Args:
-        data: The data to encrypt
+        data: The data to encrypt (text, or UTF-8 encoded bytes)
         key: The encryption key (32 characters)
         
     Returns:
@@ -31,7 +36,7 @@ def encrypt_data(data: str, key: str) -> str:
     encryptor = cipher.encryptor()
     
     # Pad data to be multiple of 16 bytes
-    data_bytes = data.encode('utf-8')
+    data_bytes = data if isinstance(data, bytes) else data.encode('utf-8')
     padding_length = 16 - (len(data_bytes) % 16)
     padded_data = data_bytes + bytes([padding_length] * padding_length)
     
@@ -42,7 +47,31 @@ def encrypt_data(data: str, key: str) -> str:
     return iv.hex() + ":" + encrypted.hex()
 
 
-def prepare_request_data(data: Dict[str, Any], encryption_key: str, skip_encryption: bool = False) -> Dict[str, Any]:
+def decrypt_data(encrypted: str, key: str) -> bytes:
+    """
+    Decrypts data encrypted with ``encrypt_data``.
+    
+    Args:
+        encrypted: Hex IV and ciphertext separated by ":"
+        key: The encryption key (32 characters)
+        
+    Returns:
+        The decrypted data
+    """
+    iv_hex, data_hex = encrypted.split(":", 1)
+    cipher = Cipher(algorithms.AES(key.encode('utf-8')), modes.CBC(bytes.fromhex(iv_hex)), backend=default_backend())
+    decryptor = cipher.decryptor()
+    
+    padded_data = decryptor.update(bytes.fromhex(data_hex)) + decryptor.finalize()
+    return padded_data[:-padded_data[-1]]
+
+
+def prepare_request_data(
+    data: Dict[str, Any],
+    encryption_key: str,
+    skip_encryption: bool = False,
+    codec: Optional[JsonCodec] = None
+) -> Dict[str, Any]:
     """
     Prepares request data for API call, optionally encrypting it.
     
@@ -50,6 +79,7 @@ def prepare_request_data(data: Dict[str, Any], encryption_key: str, skip_encrypt
         data: The data to prepare
         encryption_key: The encryption key
         skip_encryption: Whether to skip encryption
+        codec: JSON codec used to serialize the payload (default: standard library)
         
     Returns:
         The prepared data
@@ -57,12 +87,42 @@ def prepare_request_data(data: Dict[str, Any], encryption_key: str, skip_encrypt
     if skip_encryption:
         return data
     
-    json_data = json.dumps(data, separators=(',', ':'))
+    json_data = (codec or _DEFAULT_CODEC).dumps(data)
     encrypted_payload = encrypt_data(json_data, encryption_key)
     
     return {"payload": encrypted_payload}
 
 
+def prepare_request_data_batch(
+    items: Iterable[Dict[str, Any]],
+    encryption_key: str,
+    skip_encryption: bool = False,
+    processes: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    codec: Optional[JsonCodec] = None
+) -> List[Dict[str, Any]]:
+    """
+    Prepares many request payloads, serializing and encrypting them in a process pool.
+    
+    Args:
+        items: The data to prepare
+        encryption_key: The encryption key
+        skip_encryption: Whether to skip encryption
+        processes: Worker processes (default: CPU count; 1 runs in the calling process)
+        chunksize: Payloads sent to a worker at a time (optional)
+        codec: JSON codec used to serialize payloads (default: standard library)
+        
+    Returns:
+        The prepared data, in input order
+    """
+    items = list(items)
+    if skip_encryption:
+        return items
+    
+    prepare = partial(prepare_request_data, encryption_key=encryption_key, codec=codec)
+    return process_map(prepare, items, processes=processes, chunksize=chunksize)
+
+
 def validate_config(encryption_key: str, secret_key: str) -> None:
     """
     Validates the configuration parameters.
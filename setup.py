@@ -30,6 +30,20 @@ setup(
         "typing-extensions>=4.0.0",
     ],
     extras_require={
+        "http2": [
+            "httpx[http2]>=0.23",
+        ],
+        "fast-json": [
+            "orjson>=3.6",
+        ],
+        "compression": [
+            "brotli>=1.0.9",
+        ],
+        "analytics": [
+            "numpy>=1.17",
+            "pandas>=1.0",
+            "pyarrow>=5.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.10",
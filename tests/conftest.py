@@ -7,6 +7,32 @@ import pytest
 from unittest.mock import Mock, patch
 
 from payagency_api import PayAgencyApi
+from payagency_api.transports import InMemoryTransport
+
+
+@pytest.fixture
+def make_client(request):
+    """
+    Factory creating clients with test credentials
+
+    The factory's keyword arguments, and a dict given through indirect
+    parametrization, are passed to PayAgencyApi; a handler is served by an
+    InMemoryTransport.
+    """
+    defaults = getattr(request, "param", {})
+
+    def factory(handler=None, **kwargs):
+        options = {
+            "encryption_key": "12345678901234567890123456789012",
+            "secret_key": "PA_TEST_mock_secret_key",
+            **defaults,
+            **kwargs,
+        }
+        if handler is not None:
+            options["transport"] = InMemoryTransport(handler)
+        return PayAgencyApi(**options)
+
+    return factory
 
 
 @pytest.fixture
@@ -72,3 +98,66 @@ def sample_payout_data():
         "card_expiry_month": "12",
         "card_expiry_year": "2027",
     }
+
+
+@pytest.fixture
+def sample_transactions_response():
+    """Sample transactions response for testing"""
+    return {
+        "message": "Transactions fetched",
+        "data": [
+            {
+                "first_name": "John",
+                "last_name": "Doe",
+                "transaction_id": "TXN_1",
+                "order_id": "ORDER_1",
+                "amount": "100.50",
+                "converted_amount": "91.20",
+                "currency": "USD",
+                "converted_currency": "EUR",
+                "status": "SUCCESS",
+                "card_type": "VISA",
+                "card_number": "411111XXXXXX1111",
+                "transaction_type": "CARD",
+                "country": "US",
+                "email": "john@example.com",
+                "created_at": "2024-01-01T10:00:00.000Z",
+                "transaction_date": "2024-01-01T10:00:00.000Z",
+                "chargeback_date": None,
+                "refund_date": None,
+                "suspicious_date": None,
+                "merchant_connector": {"name": "Acquirer"},
+                "user": {"name": "Merchant", "user_kyc": {"name": "KYC Name"}},
+            },
+            {
+                "first_name": "Jane",
+                "last_name": "Roe",
+                "transaction_id": "TXN_2",
+                "order_id": None,
+                "amount": "5",
+                "converted_amount": None,
+                "currency": "GBP",
+                "converted_currency": None,
+                "status": "FAILED",
+                "card_type": None,
+                "card_number": None,
+                "transaction_type": "CARD",
+                "country": "GB",
+                "email": "jane@example.com",
+                "created_at": "2024-01-02T10:00:00.000Z",
+                "transaction_date": "2024-01-02T10:00:00.000Z",
+                "chargeback_date": None,
+                "refund_date": None,
+                "suspicious_date": None,
+                "merchant_connector": {"name": "Acquirer"},
+                "user": {"name": "Merchant", "user_kyc": {"name": "KYC Name"}},
+            },
+        ],
+        "meta": {
+            "hasNextPage": True,
+            "hasPreviousPage": False,
+            "nextCursor": "abc",
+            "prevCursor": None,
+            "totalCount": 2,
+        },
+    }
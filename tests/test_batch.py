@@ -0,0 +1,194 @@
+"""
+Tests for batch payload preparation
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.backends import default_backend
+
+from payagency_api import (
+    InMemoryIdempotencyStore,
+    PayAgencyAPIError,
+    PayAgencyBatchError,
+    PayAgencyValidationError,
+)
+from payagency_api.transports import AsyncTransport, InMemoryTransport, TransportRequest, TransportResponse
+from payagency_api.utils import prepare_request_data_batch
+
+
+KEY = "12345678901234567890123456789012"
+
+
+def _decrypt(payload):
+    iv_hex, data_hex = payload.split(":")
+    cipher = Cipher(algorithms.AES(KEY.encode()), modes.CBC(bytes.fromhex(iv_hex)), backend=default_backend())
+    decryptor = cipher.decryptor()
+    padded = decryptor.update(bytes.fromhex(data_hex)) + decryptor.finalize()
+    return json.loads(padded[:-padded[-1]])
+
+
+class TestBatchPreparation:
+    """Test batch serialization and encryption"""
+
+    def test_batch_preserves_order(self):
+        """Test pooled encryption returns decryptable bodies in input order"""
+        items = [{"order_id": f"ORDER-{i}", "amount": i} for i in range(100)]
+
+        bodies = prepare_request_data_batch(items, KEY, processes=2)
+
+        assert [_decrypt(body["payload"]) for body in bodies] == items
+
+    def test_skip_encryption_returns_items(self):
+        """Test skip_encryption passes payloads through"""
+        items = [{"amount": 1}]
+
+        assert prepare_request_data_batch(items, KEY, skip_encryption=True) == items
+
+    def test_prepared_bodies_sent_as_is(self, make_client):
+        """Test make_request sends prepared bodies without re-encrypting"""
+        client = make_client(transport=InMemoryTransport())
+
+        body = client.prepare_batch([{"amount": 1}], processes=1)[0]
+        client.make_request("POST", "/api/v1/test/payout", body, prepared=True)
+
+        assert client.transport.requests[0].json() == body
+
+
+class _SlowEchoTransport(AsyncTransport):
+    """Echoes each payment's amount after ``amount`` milliseconds, tracking requests in flight"""
+
+    def __init__(self):
+        self.inflight = 0
+        self.max_inflight = 0
+        self.paths = []
+
+    async def send(self, method, url, headers, body=None, params=None, timeout=None):
+        request = TransportRequest(method, url, headers, body, params)
+        self.paths.append(request.path)
+        amount = _decrypt(request.json()["payload"])["amount"]
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(amount / 1000)
+        finally:
+            self.inflight -= 1
+        if amount == 13:
+            return TransportResponse(400, {}, b'{"message": "Invalid amount"}')
+        return TransportResponse(200, {}, json.dumps({"status": "SUCCESS", "amount": amount}).encode())
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """Thread pool counting submitted calls"""
+
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+class TestAsyncBatch:
+    """Test async batch submission"""
+
+    def test_s2s_batch(self, make_client, sample_payment_data):
+        """Test results arrive in completion order with their input index, within the concurrency limit"""
+        client = make_client(async_transport=_SlowEchoTransport())
+        amounts = [40, 10, 30, 20, 5, 25]
+        items = [{**sample_payment_data, "amount": amount} for amount in amounts]
+
+        async def collect():
+            return [pair async for pair in client.payment.as2s_batch(items, concurrency=3)]
+
+        results = asyncio.run(collect())
+
+        assert sorted(index for index, _ in results) == list(range(len(amounts)))
+        assert all(response["amount"] == amounts[index] for index, response in results)
+        assert results[0] == (1, {"status": "SUCCESS", "amount": 10})
+        assert client.async_transport.max_inflight == 3
+        assert set(client.async_transport.paths) == {"/api/v1/test/card"}
+
+    def test_payin_batch_async_source(self, make_client):
+        """Test an async source is consumed and failures are yielded per item"""
+        client = make_client(async_transport=_SlowEchoTransport())
+        executor = _CountingExecutor(max_workers=2)
+        payin = {
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john@example.com",
+            "address": "123 Test St",
+            "phone_number": "1234567890",
+            "ip_address": "127.0.0.1",
+            "crypto_currency": "USDT",
+            "currency": "USD",
+            "crypto_network": "TRC20",
+            "country": "US",
+            "redirect_url": "https://example.com",
+        }
+
+        async def source():
+            for amount in (5, 13, 7):
+                yield {**payin, "amount": amount}
+            yield {key: value for key, value in payin.items() if key != "country"}
+
+        async def collect():
+            return dict([pair async for pair in client.crypto.apayin_batch(source(), executor=executor)])
+
+        results = asyncio.run(collect())
+        executor.shutdown()
+
+        assert results[0]["amount"] == 5 and results[2]["amount"] == 7
+        assert isinstance(results[1], PayAgencyAPIError) and results[1].status_code == 400
+        assert isinstance(results[3], PayAgencyValidationError)
+        assert executor.submitted == 3
+        assert set(client.async_transport.paths) == {"/api/v1/test/crypto/payin"}
+
+    def test_raise_keeps_successes(self, make_client, sample_payment_data):
+        """Test return_exceptions=False finishes requests in flight and reports every outcome"""
+        client = make_client(async_transport=_SlowEchoTransport())
+        items = [{**sample_payment_data, "amount": amount} for amount in (13, 50, 50, 50)]
+        yielded = []
+
+        async def collect():
+            async for pair in client.payment.as2s_batch(items, concurrency=2, return_exceptions=False):
+                yielded.append(pair)
+
+        with pytest.raises(PayAgencyBatchError, match="1 of 2 batch requests failed") as exc_info:
+            asyncio.run(collect())
+
+        assert yielded == [(1, {"status": "SUCCESS", "amount": 50})]
+        assert exc_info.value.results == yielded
+        assert [index for index, _ in exc_info.value.errors] == [0]
+        assert "Invalid amount" in str(exc_info.value.errors[0][1])
+        assert len(client.async_transport.paths) == 2
+        assert client.async_transport.inflight == 0
+
+    def test_recorded_items_are_not_encrypted(self, make_client, sample_payment_data):
+        """Test the idempotency store is checked before an item is encrypted"""
+        client = make_client(
+            async_transport=_SlowEchoTransport(),
+            idempotency_store=InMemoryIdempotencyStore(),
+        )
+        items = [{**sample_payment_data, "amount": amount} for amount in (5, 10)]
+
+        async def collect(executor):
+            return dict([pair async for pair in client.payment.as2s_batch(items, executor=executor)])
+
+        with _CountingExecutor(max_workers=2) as first, _CountingExecutor(max_workers=2) as second:
+            assert asyncio.run(collect(first)) == asyncio.run(collect(second))
+
+        assert first.submitted == 4
+        assert second.submitted == 2
+        assert len(client.async_transport.paths) == 2
+
+    def test_invalid_arguments(self, make_client):
+        """Test concurrency and the async transport are checked up front"""
+        with pytest.raises(ValueError, match="concurrency"):
+            make_client(async_transport=_SlowEchoTransport()).payment.as2s_batch([], concurrency=0)
+
+        client = make_client()
+        with pytest.raises(ValueError, match="async_transport"):
+            client.crypto.apayin_batch([])
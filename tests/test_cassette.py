@@ -0,0 +1,137 @@
+"""
+Tests for recording and replaying API traffic
+"""
+
+import gzip
+from unittest.mock import patch
+
+import pytest
+
+from payagency_api import PayAgencyNetworkError, PayAgencyTimeoutError
+from payagency_api.cassette import Cassette, ReplayTransport, redact_card_data
+from payagency_api.transports import InMemoryTransport
+from payagency_api.utils import decrypt_data, encrypt_data
+
+
+ENCRYPTION_KEY = "12345678901234567890123456789012"
+
+
+def _gateway(request):
+    if request.path.endswith("-transactions"):
+        return {"data": [{"transaction_id": "TXN_1", "card_number": "4111111111111111"}]}
+    return {"status": "SUCCESS", "transaction_id": "TXN_1"}
+
+
+class TestRedaction:
+    """Test card data redaction"""
+
+    def test_redact_card_data(self, sample_payment_data):
+        """Test card fields and card-like strings are redacted"""
+        redacted = redact_card_data({**sample_payment_data, "notes": ["4111 1111 1111 1111", "1234567890123"]})
+
+        assert redacted["card_number"] == "************1111"
+        assert redacted["card_cvv"] == redacted["card_expiry_month"] == redacted["card_expiry_year"] == "[REDACTED]"
+        assert redacted["notes"] == ["************1111", "1234567890123"]
+        assert redacted["phone_number"] == sample_payment_data["phone_number"]
+        assert sample_payment_data["card_number"] == "4111111111111111"
+
+    def test_decrypt_data(self):
+        """Test decrypt_data reverses encrypt_data"""
+        assert decrypt_data(encrypt_data('{"amount": 1}', ENCRYPTION_KEY), ENCRYPTION_KEY) == b'{"amount": 1}'
+
+
+class TestRecordReplay:
+    """Test recording to and replaying from cassettes"""
+
+    def test_record(self, make_client, tmp_path, sample_payment_data):
+        """Test requests are recorded decrypted and redacted"""
+        path = str(tmp_path / "flows.cassette.gz")
+        client = make_client(_gateway)
+
+        with client.record(path) as cassette:
+            client.payment.s2s(sample_payment_data)
+            client.txn.get_transactions({"status": "SUCCESS"})
+
+        assert isinstance(client.transport, InMemoryTransport)
+        assert len(cassette) == 2
+
+        loaded = Cassette.load(path)
+        payment, transactions = loaded.interactions
+        assert payment["method"] == "POST"
+        assert payment["path"] == "/api/v1/test/card"
+        assert payment["request"]["first_name"] == "John"
+        assert payment["request"]["card_number"] == "************1111"
+        assert payment["response"] == {"status": "SUCCESS", "transaction_id": "TXN_1"}
+        assert transactions["params"] == {"status": "SUCCESS"}
+        assert transactions["response"]["data"][0]["card_number"] == "************1111"
+        assert transactions["elapsed"] >= 0 and transactions["offset"] >= payment["offset"]
+
+        with gzip.open(path, "rb") as file:
+            assert b"4111111111111111" not in file.read()
+
+    def test_load_rejects_other_files(self, tmp_path):
+        """Test loading a file that is not a cassette fails"""
+        path = tmp_path / "other.gz"
+        with gzip.open(path, "wt") as file:
+            file.write('{"hello": "world"}\n')
+
+        with pytest.raises(ValueError, match="cassette"):
+            Cassette.load(str(path))
+
+    def test_replay(self, make_client, tmp_path, sample_payment_data):
+        """Test recorded responses are served back in order"""
+        path = str(tmp_path / "flows.cassette.gz")
+        recorder = make_client(_gateway)
+        with recorder.record(path):
+            recorder.payment.s2s(sample_payment_data)
+            recorder.txn.get_transactions()
+
+        client = make_client(transport=ReplayTransport(path))
+
+        assert client.txn.get_transactions()["data"][0]["transaction_id"] == "TXN_1"
+        assert client.payment.s2s(sample_payment_data)["status"] == "SUCCESS"
+        with pytest.raises(PayAgencyNetworkError, match="No recorded response"):
+            client.payment.s2s(sample_payment_data)
+        assert client.transport.stats() == {"mode": "replay", "recorded": 2, "served": 2, "remaining": 0}
+
+    def test_replay_loop_and_params(self, make_client):
+        """Test looping replay and matching on query parameters"""
+        cassette = Cassette([
+            {"method": "GET", "path": "/p", "params": {"page": 1}, "status": 200,
+             "headers": {}, "response": {"page": 1}, "elapsed": 0.5},
+            {"method": "GET", "path": "/p", "params": {"page": 2}, "status": 200,
+             "headers": {}, "response": {"page": 2}, "elapsed": 0.5},
+        ])
+        client = make_client(transport=ReplayTransport(cassette, loop=True, match_params=True))
+
+        pages = [client.make_request("GET", "/p", params={"page": page})["page"] for page in (2, 2, 1)]
+
+        assert pages == [2, 2, 1]
+
+    def test_replay_timing(self, make_client):
+        """Test recorded latency is replayed scaled by speed"""
+        cassette = Cassette([
+            {"method": "GET", "path": "/p", "params": None, "status": 200,
+             "headers": {}, "response": {}, "elapsed": 0.5},
+        ])
+        client = make_client(transport=ReplayTransport(cassette, speed=10))
+
+        with patch("payagency_api.cassette.time.sleep") as sleep:
+            client.make_request("GET", "/p")
+
+        sleep.assert_called_once_with(0.05)
+
+    def test_errors_are_replayed(self, make_client):
+        """Test recorded network errors are raised again on replay"""
+        def timeout(request):
+            raise PayAgencyTimeoutError("Network error: read timed out")
+
+        recorder = make_client(timeout)
+        with recorder.record() as cassette:
+            with pytest.raises(PayAgencyTimeoutError):
+                recorder.make_request("GET", "/api/v1/test/transactions")
+
+        client = make_client(transport=ReplayTransport(cassette))
+
+        with pytest.raises(PayAgencyTimeoutError, match="read timed out"):
+            client.make_request("GET", "/api/v1/test/transactions")
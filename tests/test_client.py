@@ -2,10 +2,13 @@
 Tests for PayAgency API client
 """
 
+import socket
+
 import pytest
 from unittest.mock import patch, Mock
 
 from payagency_api import PayAgencyApi, PayAgencyError, PayAgencyAPIError
+from payagency_api.transports import InMemoryTransport
 from payagency_api.utils import validate_config, get_environment, normalize_base_url
 
 
@@ -74,6 +77,7 @@ class TestPayAgencyApi:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"status": "SUCCESS"}
+        mock_response.content = b'{"status": "SUCCESS"}'
         mock_request.return_value = mock_response
         
         result = mock_client.make_request("POST", "/test", {"test": "data"})
@@ -87,6 +91,7 @@ class TestPayAgencyApi:
         mock_response = Mock()
         mock_response.status_code = 400
         mock_response.json.return_value = {"message": "Bad request"}
+        mock_response.content = b'{"message": "Bad request"}'
         mock_request.return_value = mock_response
         
         with pytest.raises(PayAgencyAPIError) as exc_info:
@@ -96,6 +101,58 @@ class TestPayAgencyApi:
         assert "Bad request" in str(exc_info.value)
 
 
+class TestWarmup:
+    """Test client warmup"""
+
+    def test_warmup_report(self):
+        """Test warmup resolves the host, initializes encryption and runs preloads"""
+        client = PayAgencyApi(
+            encryption_key="12345678901234567890123456789012",
+            secret_key="PA_TEST_test_key",
+            base_url="127.0.0.1",
+            transport=InMemoryTransport(lambda request: {"data": [{"currency": "USDT"}]}),
+        )
+
+        report = client.warmup(preload={
+            "currencies": lambda api: api.crypto.get_currencies({"country": "GB", "amount": 100}),
+        })
+
+        assert report["addresses"] == ["127.0.0.1"]
+        assert report["connections"] == 0
+        assert report["validators"] > 0
+        assert report["preload"] == {"currencies": {"data": [{"currency": "USDT"}]}}
+        assert report["errors"] == {}
+        assert set(report["timings"]) == {
+            "dns", "connections", "encryption", "validators", "preload.currencies", "total"
+        }
+        assert client.transport.requests[0].path == "/api/v1/test/crypto/currencies"
+
+    def test_warmup_reports_failures(self):
+        """Test failed steps are reported instead of raised"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        client = PayAgencyApi(
+            encryption_key="12345678901234567890123456789012",
+            secret_key="PA_TEST_test_key",
+            base_url=f"127.0.0.1:{port}",
+            transport="urllib3",
+            validate_inputs=False,
+        )
+
+        def fail(api):
+            raise RuntimeError("cache unavailable")
+
+        report = client.warmup(connections=2, timeout=1, preload={"templates": fail})
+
+        assert report["connections"] == 0
+        assert report["validators"] == 0
+        assert report["preload"] == {"templates": None}
+        assert report["errors"]["connections"].startswith("PayAgencyConnectionError")
+        assert report["errors"]["preload.templates"] == "RuntimeError: cache unavailable"
+
+
 class TestUtils:
     """Test utility functions"""
     
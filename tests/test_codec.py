@@ -0,0 +1,88 @@
+"""
+Tests for JSON codec selection
+"""
+
+import json
+
+import pytest
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.backends import default_backend
+
+from payagency_api import PayAgencyApi, PayAgencyAPIError
+from payagency_api.codec import CODECS, JsonCodec, get_codec
+from payagency_api.transports import InMemoryTransport, TransportResponse
+
+
+ENCRYPTION_KEY = "12345678901234567890123456789012"
+AVAILABLE = [name for name, codec_class in CODECS.items() if codec_class.available()]
+
+
+def _decrypt(payload):
+    iv_hex, data_hex = payload.split(":")
+    cipher = Cipher(algorithms.AES(ENCRYPTION_KEY.encode()), modes.CBC(bytes.fromhex(iv_hex)), backend=default_backend())
+    decryptor = cipher.decryptor()
+    padded = decryptor.update(bytes.fromhex(data_hex)) + decryptor.finalize()
+    return json.loads(padded[:-padded[-1]])
+
+
+class TestCodecs:
+    """Test codec implementations"""
+
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_round_trip(self, name, sample_transactions_response):
+        """Test every installed codec round-trips a transaction page"""
+        codec = get_codec(name)
+        encoded = codec.dumps(sample_transactions_response)
+
+        assert isinstance(encoded, bytes)
+        assert codec.loads(encoded) == sample_transactions_response
+
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_invalid_json_raises_value_error(self, name):
+        """Test decoding errors are normalized to ValueError"""
+        with pytest.raises(ValueError):
+            get_codec(name).loads(b"<html>")
+
+    def test_auto_prefers_fastest_installed(self):
+        """Test auto selection picks the first available codec"""
+        assert get_codec("auto").name == AVAILABLE[0]
+
+    def test_instance_passthrough(self):
+        """Test codec instances are used as-is"""
+        codec = JsonCodec()
+        assert get_codec(codec) is codec
+
+    def test_unknown_codec(self):
+        """Test unknown codec names are rejected"""
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+
+
+class TestClientCodec:
+    """Test the client uses its codec for bodies and responses"""
+
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_encrypted_request(self, name, sample_payment_data):
+        """Test encrypted payloads decrypt to the original data"""
+        client = PayAgencyApi(
+            encryption_key=ENCRYPTION_KEY,
+            secret_key="PA_TEST_mock_secret_key",
+            transport=InMemoryTransport(),
+            json_codec=name,
+        )
+
+        assert client.payment.s2s(sample_payment_data) == {"status": "SUCCESS"}
+
+        body = client.transport.requests[0].json()
+        assert _decrypt(body["payload"]) == sample_payment_data
+
+    def test_invalid_response(self):
+        """Test unparsable responses raise PayAgencyAPIError"""
+        client = PayAgencyApi(
+            encryption_key=ENCRYPTION_KEY,
+            secret_key="PA_TEST_mock_secret_key",
+            transport=InMemoryTransport(lambda request: TransportResponse(200, {}, b"not json")),
+        )
+
+        with pytest.raises(PayAgencyAPIError, match="Invalid JSON"):
+            client.txn.get_transactions()
@@ -0,0 +1,97 @@
+"""
+Tests for columnar transaction storage
+"""
+
+import pytest
+from decimal import Decimal
+
+from payagency_api.columnar import TransactionColumns
+
+
+class TestTransactionColumns:
+    """Test columnar transaction table"""
+
+    def test_round_trip(self, sample_transactions_response):
+        """Test rows materialize back to the TransactionInfo shape"""
+        table = TransactionColumns.from_pages([sample_transactions_response])
+
+        expected = [dict(txn) for txn in sample_transactions_response["data"]]
+        expected[1]["amount"] = "5.00"  # amounts share the column's scale
+
+        assert len(table) == 2
+        assert table.to_dicts() == expected
+
+    def test_exact_amounts_with_rescaling(self):
+        """Test amounts stay exact as precision grows"""
+        table = TransactionColumns([
+            {"transaction_id": "A", "amount": "5"},
+            {"transaction_id": "B", "amount": "0.125"},
+            {"transaction_id": "C", "amount": None},
+        ])
+
+        assert table.column("amount") == [Decimal("5"), Decimal("0.125"), None]
+        assert table[0]["amount"] == "5.000"
+        assert table[1].decimal() == Decimal("0.125")
+
+    def test_zero_and_small_amounts(self):
+        """Test zero and sub-cent amounts come back in fixed-point notation"""
+        table = TransactionColumns([
+            {"transaction_id": "A", "amount": "0.00000001"},
+            {"transaction_id": "B", "amount": "0"},
+            {"transaction_id": "C", "amount": "0.00000000"},
+            {"transaction_id": "D", "amount": "-0.00000002"},
+        ])
+
+        assert [row["amount"] for row in table] == ["0.00000001", "0.00000000", "0.00000000", "-0.00000002"]
+        assert [Decimal(row["amount"]) for row in table] == [
+            Decimal("0.00000001"), Decimal("0"), Decimal("0"), Decimal("-0.00000002"),
+        ]
+
+    def test_dictionary_encoding(self, sample_transactions_response):
+        """Test low-cardinality columns are dictionary-encoded"""
+        table = TransactionColumns()
+        for _ in range(100):
+            table.add_page(sample_transactions_response)
+
+        assert table.categories("currency") == ["USD", "GBP"]
+        assert table.categories("merchant_connector") == ["Acquirer"]
+        assert table._categories["status"].codes.itemsize == 1
+        assert table[-1]["transaction_id"] == "TXN_2"
+
+    def test_invalid_amount_keeps_columns_aligned(self):
+        """Test a rejected row does not leave partial columns"""
+        table = TransactionColumns([{"transaction_id": "A", "amount": "1"}])
+
+        with pytest.raises(ValueError, match="Invalid amount"):
+            table.append({"transaction_id": "B", "amount": "1", "converted_amount": "bad"})
+
+        assert len(table._decimals["amount"].values) == len(table) == 1
+
+    @pytest.mark.parametrize("converted_amount", ["1e30", "0.0000000001"])
+    def test_out_of_range_amount_keeps_columns_aligned(self, converted_amount):
+        """Test amounts overflowing the column, directly or by rescaling, leave the table unchanged"""
+        table = TransactionColumns([{"transaction_id": "A", "amount": "1", "converted_amount": "900000000000"}])
+
+        with pytest.raises(ValueError, match="out of range"):
+            table.append({"transaction_id": "B", "amount": "2", "converted_amount": converted_amount})
+
+        assert len(table) == 1
+        assert all(len(column.values) == 1 for column in table._decimals.values())
+        assert all(len(values) == 1 for values in table._strings.values())
+        assert table.column("converted_amount") == [Decimal("900000000000")]
+
+    def test_to_pandas(self, sample_transactions_response):
+        """Test pandas conversion uses categoricals"""
+        pytest.importorskip("pandas")
+        frame = TransactionColumns.from_pages([sample_transactions_response]).to_pandas()
+
+        assert str(frame["currency"].dtype) == "category"
+        assert frame["amount"].tolist() == [100.5, 5.0]
+
+    def test_to_arrow(self, sample_transactions_response):
+        """Test Arrow conversion uses dictionary arrays"""
+        pa = pytest.importorskip("pyarrow")
+        table = TransactionColumns.from_pages([sample_transactions_response]).to_arrow()
+
+        assert pa.types.is_dictionary(table.schema.field("status").type)
+        assert table.column("amount").to_pylist() == [Decimal("100.50"), Decimal("5.00")]
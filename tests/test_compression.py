@@ -0,0 +1,116 @@
+"""
+Tests for HTTP compression negotiation and byte accounting
+"""
+
+import gzip
+import json
+
+import pytest
+
+from payagency_api.compression import CompressionPolicy, available_encodings, compress, decompress
+from payagency_api.transports import InMemoryTransport
+
+
+class TestCompressionPolicy:
+    """Test compression configuration"""
+
+    def test_available_encodings(self):
+        """Test gzip and deflate are always offered"""
+        assert {"gzip", "deflate"} <= set(available_encodings())
+
+    @pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+    def test_round_trip(self, encoding):
+        """Test compressed bodies decode to the original"""
+        body = b'{"amount": 100}' * 100
+
+        assert decompress(compress(body, encoding), encoding) == body
+        assert decompress(body, None) == body
+
+    def test_invalid_request_encoding(self):
+        """Test unsupported request encodings are rejected"""
+        with pytest.raises(ValueError, match="Request encoding"):
+            CompressionPolicy(request_encoding="br")
+
+    def test_accept_encoding_header(self, make_client):
+        """Test Accept-Encoding is sent by default and can be set or disabled"""
+        default = make_client(transport=InMemoryTransport())
+        custom = make_client(transport=InMemoryTransport(), compression=CompressionPolicy(accept_encoding=["gzip"]))
+        disabled = make_client(transport=InMemoryTransport(), compression=CompressionPolicy(accept_encoding=None))
+
+        for client in (default, custom, disabled):
+            client.make_request("GET", "/api/v1/test/transactions")
+
+        assert "gzip" in default.transport.requests[0].headers["Accept-Encoding"]
+        assert custom.transport.requests[0].headers["Accept-Encoding"] == "gzip"
+        assert "Accept-Encoding" not in disabled.transport.requests[0].headers
+
+
+class TestRequestCompression:
+    """Test request body compression"""
+
+    def test_large_bodies_are_compressed(self, make_client):
+        """Test bodies over the threshold are sent gzip-encoded"""
+        compression = CompressionPolicy(request_encoding="gzip", min_size=100)
+        client = make_client(transport=InMemoryTransport(), compression=compression)
+
+        client.make_request("POST", "/api/v1/test/card", {"items": ["x" * 50] * 20})
+        client.make_request("POST", "/api/v1/test/card", {"a": 1}, skip_encryption=True)
+
+        large, small = client.transport.requests
+        assert large.headers["Content-Encoding"] == "gzip"
+        assert list(large.json()) == ["payload"]
+        assert "Content-Encoding" not in small.headers
+        assert small.json() == {"a": 1}
+
+        stats = compression.stats()
+        assert stats["requests_compressed"] == 1
+        assert stats["request_wire_bytes"] == len(large.body)
+        assert stats["request_bytes"] == len(gzip.decompress(large.body))
+
+
+class TestResponseAccounting:
+    """Test wire and decoded byte metrics"""
+
+    def _httpx_client(self, make_client, body):
+        httpx = pytest.importorskip("httpx")
+        encoded = gzip.compress(json.dumps(body).encode("utf-8"))
+        client = make_client(transport="http2")
+        client.transport.client = httpx.Client(transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, stream=httpx.ByteStream(encoded), headers={"Content-Encoding": "gzip"}
+            )
+        ))
+        return client, len(encoded)
+
+    def test_in_memory_responses(self, make_client):
+        """Test uncompressed responses count their decoded size on the wire"""
+        client = make_client(transport=InMemoryTransport())
+
+        client.make_request("GET", "/api/v1/test/transactions")
+
+        stats = client.compression.stats()
+        assert stats["responses"] == 1
+        assert stats["wire_bytes"] == stats["decoded_bytes"] == len(b'{"status": "SUCCESS"}')
+        assert stats["encodings"] == {"identity": 1}
+
+    def test_compressed_responses(self, make_client, sample_transactions_response):
+        """Test compressed responses record the bytes received before decoding"""
+        client, wire_bytes = self._httpx_client(make_client, sample_transactions_response)
+
+        assert client.make_request("GET", "/api/v1/test/transactions") == sample_transactions_response
+
+        stats = client.compression.stats()
+        assert stats["wire_bytes"] == wire_bytes
+        assert stats["decoded_bytes"] == len(json.dumps(sample_transactions_response))
+        assert stats["encodings"] == {"gzip": 1}
+
+    def test_streamed_responses(self, make_client, sample_transactions_response):
+        """Test streamed responses are recorded once fully read"""
+        client, wire_bytes = self._httpx_client(make_client, sample_transactions_response)
+
+        assert len(list(client.txn.stream_transactions())) == 2
+
+        stats = client.compression.stats()
+        assert stats["responses"] == 1
+        assert stats["wire_bytes"] == wire_bytes
+        assert stats["ratio"] < 1
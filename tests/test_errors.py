@@ -0,0 +1,175 @@
+"""
+Tests for the error taxonomy
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import requests
+import urllib3
+
+from payagency_api import (
+    PayAgencyAPIError,
+    PayAgencyConnectionError,
+    PayAgencyDeclinedError,
+    PayAgencyInvalidRequestError,
+    PayAgencyNetworkError,
+    PayAgencyOverloadError,
+    PayAgencyRateLimitError,
+    PayAgencyServerError,
+    PayAgencyTimeoutError,
+    PayAgencyTLSError,
+    PayAgencyValidationError,
+)
+from payagency_api.hedging import HedgingPolicy
+from payagency_api.limits import AIMDLimit, ConcurrencyLimiter
+from payagency_api.transports import AsyncInMemoryTransport, Transport, TransportResponse, _network_error
+
+
+class _FailingTransport(Transport):
+    """Transport raising a fixed exception"""
+
+    def __init__(self, error):
+        self.error = error
+
+    def send(self, method, url, headers, body=None, params=None, timeout=None):
+        raise _network_error(self.error)
+
+
+def _error_for(make_client, status_code, payload, headers=None):
+    response = TransportResponse(status_code, headers or {}, json.dumps(payload).encode())
+    client = make_client(lambda request: response)
+    with pytest.raises(PayAgencyAPIError) as exc_info:
+        client.make_request("POST", "/api/v1/test/card", {"amount": 1})
+    return exc_info.value
+
+
+class TestAPIErrors:
+    """Test HTTP error classification"""
+
+    def test_rate_limit(self, make_client):
+        """Test 429 is retryable and honours Retry-After"""
+        error = _error_for(make_client, 429, {"message": "Slow down"}, {"Retry-After": "7"})
+
+        assert isinstance(error, PayAgencyRateLimitError)
+        assert error.retryable
+        assert error.retry_after == 7
+        assert error.endpoint == "/api/v1/test/card"
+        assert error.attempts == 1
+        assert error.elapsed >= 0
+
+    def test_server_error(self, make_client):
+        """Test 5xx is retryable"""
+        error = _error_for(make_client, 503, {"message": "Unavailable"})
+
+        assert isinstance(error, PayAgencyServerError)
+        assert error.retryable
+        assert error.retry_after is None
+
+    def test_invalid_request(self, make_client):
+        """Test 400/422 are validation errors and not retryable"""
+        error = _error_for(make_client, 422, {"message": "Invalid card"})
+
+        assert isinstance(error, PayAgencyInvalidRequestError)
+        assert isinstance(error, PayAgencyValidationError)
+        assert not error.retryable
+
+    def test_declined(self, make_client):
+        """Test declined or blocked payments are classified as declines"""
+        assert isinstance(_error_for(make_client, 402, {"message": "Declined"}), PayAgencyDeclinedError)
+        assert isinstance(_error_for(make_client, 403, {"status": "BLOCKED", "message": "Blocked"}), PayAgencyDeclinedError)
+
+    def test_other_client_errors(self, make_client):
+        """Test other 4xx stay generic API errors"""
+        error = _error_for(make_client, 401, {"message": "Unauthorized"})
+
+        assert type(error) is PayAgencyAPIError
+        assert not error.retryable
+        assert _error_for(make_client, 408, {"message": "Request timeout"}).retryable
+
+
+class TestAttempts:
+    """Test the attempt count on errors"""
+
+    def test_single_attempt(self, make_client):
+        """Test a request sent once reports one attempt"""
+        assert _error_for(make_client, 503, {"message": "Unavailable"}).attempts == 1
+
+    def test_hedged_attempts(self, make_client):
+        """Test a retried (hedged) request reports every attempt sent"""
+        policy = HedgingPolicy(delay=0.01, budget=1)
+
+        def handler(request):
+            time.sleep(0.05)
+            return 503, {"message": "Unavailable"}
+
+        client = make_client(handler, hedging=policy)
+
+        with pytest.raises(PayAgencyServerError) as exc_info:
+            client.make_request("GET", "/api/v1/test-transactions")
+
+        assert exc_info.value.attempts == 2
+        assert policy.stats()["hedged"] == 1
+        policy.close()
+
+    def test_shed_request(self, make_client):
+        """Test a request shed before sending reports no attempts"""
+        limiter = ConcurrencyLimiter(limit=lambda: AIMDLimit(initial_limit=1), max_queue=0)
+        client = make_client(lambda request: {"status": "SUCCESS"}, concurrency_limiter=limiter)
+
+        with limiter.acquire("/api/v1/test-transactions"):
+            with pytest.raises(PayAgencyOverloadError) as exc_info:
+                client.make_request("GET", "/api/v1/test-transactions")
+
+        assert exc_info.value.attempts == 0
+
+    def test_async_attempt(self, make_client):
+        """Test amake_request reports its attempt"""
+        client = make_client(async_transport=AsyncInMemoryTransport(lambda request: (500, {"message": "Down"})))
+
+        with pytest.raises(PayAgencyServerError) as exc_info:
+            asyncio.run(client.amake_request("GET", "/api/v1/test-transactions"))
+
+        assert exc_info.value.attempts == 1
+
+
+class TestNetworkErrors:
+    """Test network error classification"""
+
+    @pytest.mark.parametrize("error, expected", [
+        (requests.exceptions.SSLError("certificate verify failed"), PayAgencyTLSError),
+        (requests.exceptions.ConnectTimeout("connect timed out"), PayAgencyConnectionError),
+        (urllib3.exceptions.NewConnectionError(None, "refused"), PayAgencyConnectionError),
+        (requests.exceptions.ReadTimeout("read timed out"), PayAgencyTimeoutError),
+        (requests.exceptions.ConnectionError("Connection aborted"), PayAgencyNetworkError),
+    ])
+    def test_classification(self, error, expected):
+        """Test library errors map to the most specific class"""
+        assert type(_network_error(error)) is expected
+
+    def test_connection_errors_are_retryable(self, make_client):
+        """Test requests that were never sent can be retried"""
+        client = make_client(transport=_FailingTransport(requests.exceptions.ConnectTimeout("timed out")))
+
+        with pytest.raises(PayAgencyConnectionError) as exc_info:
+            client.make_request("POST", "/api/v1/test/card", {"amount": 1})
+
+        assert exc_info.value.retryable
+
+    def test_timeout_retryable_only_when_safe(self, make_client):
+        """Test read timeouts are retryable for GETs and keyed POSTs only"""
+        client = make_client(transport=_FailingTransport(requests.exceptions.ReadTimeout("timed out")))
+
+        with pytest.raises(PayAgencyTimeoutError) as exc_info:
+            client.make_request("POST", "/api/v1/test/card", {"amount": 1})
+        assert not exc_info.value.retryable
+
+        with pytest.raises(PayAgencyTimeoutError) as exc_info:
+            client.make_request("POST", "/api/v1/test/card", {"amount": 1}, idempotency_key="k")
+        assert exc_info.value.retryable
+
+        with pytest.raises(PayAgencyTimeoutError) as exc_info:
+            client.make_request("GET", "/api/v1/test-transactions")
+        assert exc_info.value.retryable
@@ -0,0 +1,80 @@
+"""
+Tests for fork safety and process-pool helpers
+"""
+
+import os
+import pytest
+
+from payagency_api import InMemoryIdempotencyStore
+from payagency_api.forksafe import process_map
+
+
+def _square(value):
+    return value * value
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+class TestForkSafety:
+    """Test client state is rebuilt in forked children"""
+
+    def _in_child(self, func):
+        """Run func in a forked child and return the byte it reports"""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            try:
+                result = b"1" if func() else b"0"
+            except Exception:
+                result = b"E"
+            os.write(write_fd, result)
+            os._exit(0)
+
+        os.close(write_fd)
+        result = os.read(read_fd, 1)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        return result
+
+    def test_sessions_rebuilt_after_fork(self, mock_client):
+        """Test a child never reuses the parent's session"""
+        parent_session = mock_client.session
+
+        assert self._in_child(lambda: mock_client.session is not parent_session) == b"1"
+        assert mock_client.session is parent_session
+
+    def test_sharded_pool_rebuilt_after_fork(self):
+        """Test sessions checked out in the parent are free in the child"""
+        from payagency_api import PayAgencyApi
+
+        client = PayAgencyApi(
+            encryption_key="12345678901234567890123456789012",
+            secret_key="PA_TEST_mock_secret_key",
+            session_mode="sharded",
+            session_shards=1,
+        )
+        with client.transport.pool.acquire():
+            result = self._in_child(lambda: client.transport.pool._shard_inflight == [0])
+
+        assert result == b"1"
+
+    def test_idempotency_store_survives_fork(self):
+        """Test recorded responses remain available in the child"""
+        store = InMemoryIdempotencyStore()
+        store.set("key", {"status": "SUCCESS"})
+
+        assert self._in_child(lambda: store.get("key") == {"status": "SUCCESS"}) == b"1"
+
+
+class TestProcessMap:
+    """Test process-pool fan-out"""
+
+    def test_small_inputs_run_inline(self):
+        """Test small batches skip the pool"""
+        assert process_map(_square, [1, 2, 3]) == [1, 4, 9]
+
+    def test_results_keep_input_order(self):
+        """Test pooled results are returned in input order"""
+        items = list(range(200))
+
+        assert process_map(_square, items, processes=2, min_items=1) == [i * i for i in items]
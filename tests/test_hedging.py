@@ -0,0 +1,141 @@
+"""
+Tests for hedged requests
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from payagency_api.hedging import HedgingPolicy
+from payagency_api.transports import InMemoryTransport
+
+
+def _slow_first_handler(slow=0.5):
+    """Handler whose first request is slow and later ones are fast"""
+    calls = []
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            calls.append(request)
+            first = len(calls) == 1
+        if first:
+            time.sleep(slow)
+        return {"status": "SUCCESS", "attempt": 1 if first else 2}
+
+    return handler
+
+
+class TestHedgingPolicy:
+    """Test hedge delay and budget"""
+
+    def test_percentile_delay(self):
+        """Test the delay tracks the observed latency percentile"""
+        policy = HedgingPolicy(percentile=0.9, min_samples=10, min_delay=0)
+        assert policy.hedge_delay() is None
+
+        for latency in range(1, 11):
+            policy.record(latency / 100)
+
+        assert policy.hedge_delay() == 0.1
+
+    def test_percentile_delay_follows_window(self):
+        """Test latencies leaving the window no longer affect the delay"""
+        policy = HedgingPolicy(percentile=0.5, window=4, min_samples=4, min_delay=0)
+
+        for latency in (0.9, 0.8, 0.1, 0.2, 0.3, 0.4):
+            policy.record(latency)
+
+        assert policy.hedge_delay() == 0.3
+
+    def test_only_idempotent_methods(self):
+        """Test only configured methods are hedged"""
+        policy = HedgingPolicy(delay=0.01)
+
+        assert policy.applies("get")
+        assert not policy.applies("POST")
+
+    def test_zero_budget_never_hedges(self, make_client):
+        """Test hedges are not sent without budget"""
+        policy = HedgingPolicy(delay=0.01, budget=0)
+        client = make_client(_slow_first_handler(slow=0.1), hedging=policy)
+
+        assert client.txn.get_transactions()["attempt"] == 1
+        assert policy.stats()["hedged"] == 0
+        assert len(client.transport.requests) == 1
+
+
+class TestHedgedRequests:
+    """Test make_request hedging"""
+
+    def test_slow_request_is_hedged(self, make_client):
+        """Test the hedge's response wins over a slow primary"""
+        policy = HedgingPolicy(delay=0.02, budget=1)
+        client = make_client(_slow_first_handler(), hedging=policy)
+
+        start = time.perf_counter()
+        result = client.txn.get_transactions()
+        elapsed = time.perf_counter() - start
+
+        assert result["attempt"] == 2
+        assert elapsed < 0.4
+        assert policy.stats()["hedged"] == 1
+        assert policy.stats()["hedge_wins"] == 1
+        policy.close()
+
+    def test_unhedgeable_request_runs_on_calling_thread(self, make_client):
+        """Test requests are sent from the caller's thread when no hedge can be sent"""
+        threads = []
+        policy = HedgingPolicy(delay=0.01, budget=0)
+        client = make_client(lambda request: threads.append(threading.get_ident()) or {}, hedging=policy)
+
+        client.txn.get_transactions()
+
+        assert threads == [threading.get_ident()]
+
+    def test_concurrency_not_capped_by_workers(self, make_client):
+        """Test primaries do not queue behind the hedge pool"""
+        policy = HedgingPolicy(delay=1.0, budget=1, max_workers=1)
+        barrier = threading.Barrier(4, timeout=0.5)
+        client = make_client(lambda request: {"parties": barrier.wait() + 1}, hedging=policy)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: client.txn.get_transactions(), range(4)))
+
+        assert sorted(result["parties"] for result in results) == [1, 2, 3, 4]
+        assert policy.stats()["hedged"] == 0
+        policy.close()
+
+    def test_attempts_reuse_pool_threads(self, make_client):
+        """Test hedgeable attempts run on the policy's bounded pool rather than new threads"""
+        threads = set()
+        policy = HedgingPolicy(delay=0.5, budget=1, max_workers=2)
+        client = make_client(lambda request: threads.add(threading.current_thread().name) or {}, hedging=policy)
+
+        for _ in range(20):
+            client.txn.get_transactions()
+
+        assert 1 <= len(threads) <= 2
+        assert all(name.startswith("payagency-hedge") for name in threads)
+        policy.close()
+
+    def test_fast_request_is_not_hedged(self, make_client):
+        """Test requests faster than the delay are sent once"""
+        policy = HedgingPolicy(delay=0.5, budget=1)
+        client = make_client(transport=InMemoryTransport(), hedging=policy)
+
+        client.txn.get_transactions()
+
+        assert len(client.transport.requests) == 1
+        assert policy.stats()["hedged"] == 0
+        policy.close()
+
+    def test_post_is_not_hedged(self, make_client, sample_payment_data):
+        """Test non-idempotent requests are never duplicated"""
+        policy = HedgingPolicy(delay=0.01, budget=1)
+        client = make_client(_slow_first_handler(slow=0.1), hedging=policy)
+
+        client.payment.s2s(sample_payment_data)
+
+        assert len(client.transport.requests) == 1
+        assert policy.stats()["requests"] == 0
@@ -0,0 +1,142 @@
+"""
+Tests for idempotency keys and dedup stores
+"""
+
+import pytest
+
+from payagency_api import InMemoryIdempotencyStore, SQLiteIdempotencyStore
+from payagency_api.idempotency import IDEMPOTENCY_HEADER, generate_idempotency_key, idempotency_namespace
+from payagency_api.transports import InMemoryTransport
+
+
+class TestIdempotencyKeys:
+    """Test idempotency key generation"""
+
+    def test_key_is_deterministic(self):
+        """Test same request yields same key regardless of dict order"""
+        key_a = generate_idempotency_key("POST", "/card", {"a": 1, "b": 2})
+        key_b = generate_idempotency_key("post", "/card", {"b": 2, "a": 1})
+
+        assert key_a == key_b
+
+    def test_key_depends_on_payload(self):
+        """Test different payloads yield different keys"""
+        assert generate_idempotency_key("POST", "/card", {"a": 1}) != \
+            generate_idempotency_key("POST", "/card", {"a": 2})
+
+    def test_namespace_changes_key(self):
+        """Test the same payload gets a different key per merchant"""
+        key_a = generate_idempotency_key("POST", "/card", {"a": 1}, idempotency_namespace("PA_TEST_one"))
+        key_b = generate_idempotency_key("POST", "/card", {"a": 1}, idempotency_namespace("PA_TEST_two"))
+
+        assert key_a != key_b
+        assert "PA_TEST_one" not in idempotency_namespace("PA_TEST_one")
+
+
+class TestIdempotencyStores:
+    """Test dedup store implementations"""
+
+    def test_in_memory_lru_eviction(self):
+        """Test least recently used keys are evicted first"""
+        store = InMemoryIdempotencyStore(max_size=2)
+        store.set("a", {"n": 1})
+        store.set("b", {"n": 2})
+        store.get("a")
+        store.set("c", {"n": 3})
+
+        assert store.get("a") == {"n": 1}
+        assert store.get("b") is None
+        assert len(store) == 2
+
+    def test_in_memory_ttl_expiry(self):
+        """Test expired in-memory responses are ignored"""
+        store = InMemoryIdempotencyStore(ttl=0)
+        store.set("key", {"status": "SUCCESS"})
+
+        assert store.get("key") is None
+        assert len(store) == 0
+
+    def test_in_memory_returns_copies(self):
+        """Test mutating a stored or returned response does not change the record"""
+        store = InMemoryIdempotencyStore()
+        response = {"status": "SUCCESS", "data": {"id": 1}}
+        store.set("key", response)
+        response["data"]["id"] = 2
+        store.get("key")["status"] = "CHANGED"
+
+        assert store.get("key") == {"status": "SUCCESS", "data": {"id": 1}}
+
+    def test_sqlite_persists(self, tmp_path):
+        """Test SQLite store keeps responses across instances"""
+        path = str(tmp_path / "idem.db")
+        store = SQLiteIdempotencyStore(path)
+        store.set("key", {"status": "SUCCESS"})
+        store.close()
+
+        assert SQLiteIdempotencyStore(path).get("key") == {"status": "SUCCESS"}
+
+    def test_sqlite_ttl_expiry(self):
+        """Test expired responses are ignored"""
+        store = SQLiteIdempotencyStore(":memory:", ttl=0)
+        store.set("key", {"status": "SUCCESS"})
+
+        assert store.get("key") is None
+
+
+class TestIdempotentRequests:
+    """Test make_request idempotency behaviour"""
+
+    def test_duplicate_post_short_circuits(self, make_client, sample_payment_data):
+        """Test a replayed submission returns the recorded response"""
+        client = make_client(transport=InMemoryTransport(), idempotency_store=InMemoryIdempotencyStore())
+
+        first = client.payment.s2s(sample_payment_data)
+        second = client.payment.s2s(sample_payment_data)
+
+        assert first == second == {"status": "SUCCESS"}
+        assert len(client.transport.requests) == 1
+        assert client.transport.requests[0].headers[IDEMPOTENCY_HEADER] == generate_idempotency_key(
+            "POST", "/api/v1/test/card", sample_payment_data, idempotency_namespace("PA_TEST_mock_secret_key")
+        )
+
+    def test_caller_supplied_key(self, make_client, sample_payout_data):
+        """Test caller-supplied keys are sent and used for dedup"""
+        client = make_client(lambda request: {"status": "PENDING"}, idempotency_store=InMemoryIdempotencyStore())
+
+        client.payout.create_payout(sample_payout_data, idempotency_key="payout-1")
+        client.payout.create_payout(sample_payout_data, idempotency_key="payout-1")
+
+        assert len(client.transport.requests) == 1
+        assert client.transport.requests[0].headers[IDEMPOTENCY_HEADER] == "payout-1"
+
+    def test_errors_are_not_recorded(self, make_client, sample_payment_data):
+        """Test failed submissions can be retried"""
+        responses = iter([(500, {"message": "Internal error"}), {"status": "SUCCESS"}])
+        client = make_client(lambda request: next(responses), idempotency_store=InMemoryIdempotencyStore())
+
+        with pytest.raises(Exception):
+            client.payment.s2s(sample_payment_data)
+
+        assert client.payment.s2s(sample_payment_data) == {"status": "SUCCESS"}
+        assert len(client.transport.requests) == 2
+
+    def test_quotes_are_not_deduplicated(self, make_client):
+        """Test read-like POSTs are sent every time without a derived key"""
+        quotes = iter([{"data": [{"rate": 1}]}, {"data": [{"rate": 2}]}])
+        client = make_client(lambda request: next(quotes), idempotency_store=InMemoryIdempotencyStore())
+
+        first = client.crypto.get_currencies({"country": "GB", "amount": 100})
+        second = client.crypto.get_currencies({"country": "GB", "amount": 100})
+
+        assert first != second
+        assert len(client.transport.requests) == 2
+        assert IDEMPOTENCY_HEADER not in client.transport.requests[0].headers
+
+    def test_explicit_opt_in(self, make_client):
+        """Test other requests are deduplicated when given a key"""
+        client = make_client(lambda request: {"status": "SUCCESS"}, idempotency_store=InMemoryIdempotencyStore())
+
+        client.make_request("POST", "/api/v1/test/refund", {"transaction_id": "T1"}, idempotency_key="refund-T1")
+        client.make_request("POST", "/api/v1/test/refund", {"transaction_id": "T1"}, idempotency_key="refund-T1")
+
+        assert len(client.transport.requests) == 1
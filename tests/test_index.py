@@ -0,0 +1,124 @@
+"""
+Tests for the transaction lookup index
+"""
+
+import pytest
+
+from payagency_api.index import TransactionIndex
+
+
+class TestTransactionIndex:
+    """Test transaction lookup index"""
+
+    def test_lookups(self, sample_transactions_response):
+        """Test lookups by transaction ID, order ID and email"""
+        index = TransactionIndex()
+        index.add_page(sample_transactions_response)
+
+        assert len(index) == 2
+        assert index.get("TXN_2")["status"] == "FAILED"
+        assert index.get("TXN_MISSING") is None
+        assert [t["transaction_id"] for t in index.find_by_order_id("ORDER_1")] == ["TXN_1"]
+        assert [t["transaction_id"] for t in index.find_by_email(" JANE@example.com")] == ["TXN_2"]
+
+    def test_newest_row_wins(self, sample_transactions_response):
+        """Test re-indexed transactions supersede older rows"""
+        index = TransactionIndex()
+        index.add_page(sample_transactions_response)
+        index.add({**sample_transactions_response["data"][0], "status": "REFUNDED"})
+
+        assert len(index) == 2
+        assert index.get("TXN_1")["status"] == "REFUNDED"
+        assert [t["status"] for t in index.find_by_order_id("ORDER_1")] == ["REFUNDED"]
+
+    def test_track_indexes_while_paging(self, sample_transactions_response):
+        """Test pages are indexed as they pass through"""
+        index = TransactionIndex()
+
+        pages = list(index.track([sample_transactions_response]))
+
+        assert pages == [sample_transactions_response]
+        assert index.get("TXN_1") is not None
+
+    def test_persisted_index_reopens(self, sample_transactions_response, tmp_path):
+        """Test a persisted index is rebuilt from its row file"""
+        path = str(tmp_path / "txn.idx")
+        with TransactionIndex(path) as index:
+            index.add_page(sample_transactions_response)
+            assert index.get("TXN_1")["amount"] == "100.50"
+            index.add({**sample_transactions_response["data"][1], "status": "SUCCESS"})
+
+        with TransactionIndex(path) as index:
+            assert len(index) == 2
+            assert index.get("TXN_2")["status"] == "SUCCESS"
+            assert index.find_by_email("john@example.com")[0]["transaction_id"] == "TXN_1"
+
+    def test_updates_replace_rows_in_memory(self, sample_transactions_response):
+        """Test re-adding a transaction does not keep its old row"""
+        index = TransactionIndex()
+        index.add_page(sample_transactions_response)
+        for status in ("PENDING", "SUCCESS", "REFUNDED"):
+            index.add({**sample_transactions_response["data"][0], "status": status})
+
+        assert len(index._rows) == 2
+        assert [t["status"] for t in index.find_by_order_id("ORDER_1")] == ["REFUNDED"]
+
+    def test_memory_is_capped(self, sample_transactions_response):
+        """Test an in-memory index evicts its least recently added rows beyond max_rows"""
+        first, second = sample_transactions_response["data"]
+        index = TransactionIndex(max_rows=2)
+        index.add_page(sample_transactions_response)
+        index.add({**first, "status": "REFUNDED"})
+        index.add({**second, "transaction_id": "TXN_3", "order_id": "ORDER_3"})
+
+        assert len(index) == len(index._rows) == 2
+        assert index.get("TXN_2") is None
+        assert [t["transaction_id"] for t in index.find_by_email("jane@example.com")] == ["TXN_3"]
+        assert index.get("TXN_1")["status"] == "REFUNDED"
+        assert [t["transaction_id"] for t in index.find_by_order_id("ORDER_3")] == ["TXN_3"]
+
+        for number in range(100):
+            index.add({**second, "transaction_id": f"TXN_X{number}"})
+        assert len(index._rows) == 2
+        assert len(index._by_email) == 1
+
+    def test_max_rows_must_be_positive(self):
+        """Test the row cap is validated"""
+        with pytest.raises(ValueError, match="max_rows"):
+            TransactionIndex(max_rows=0)
+
+    def test_row_file_is_compacted(self, sample_transactions_response, tmp_path):
+        """Test superseded rows are dropped from the row file past the threshold"""
+        path = tmp_path / "txn.idx"
+        with TransactionIndex(str(path), compact_after=3) as index:
+            index.add_page(sample_transactions_response)
+            for amount in range(4):
+                index.add({**sample_transactions_response["data"][0], "amount": str(amount)})
+
+            assert len(path.read_bytes().splitlines()) == 2
+            assert index.get("TXN_1")["amount"] == "3"
+            assert [t["transaction_id"] for t in index.find_by_order_id("ORDER_1")] == ["TXN_1"]
+
+    def test_torn_last_row_is_discarded(self, sample_transactions_response, tmp_path):
+        """Test a partly written last row is truncated when the index is opened"""
+        path = tmp_path / "txn.idx"
+        with TransactionIndex(str(path)) as index:
+            index.add_page(sample_transactions_response)
+        intact = path.read_bytes()
+        path.write_bytes(intact + b'{"transaction_id": "TXN_3", "amo')
+
+        with TransactionIndex(str(path)) as index:
+            assert len(index) == 2
+            index.add({**sample_transactions_response["data"][0], "transaction_id": "TXN_3"})
+            assert index.get("TXN_3") is not None
+
+        with TransactionIndex(str(path)) as index:
+            assert len(index) == 3
+
+    def test_corrupt_inner_row_raises(self, sample_transactions_response, tmp_path):
+        """Test damage before the last row is not silently dropped"""
+        path = tmp_path / "txn.idx"
+        path.write_bytes(b'{"transaction_id": "TX\n{"transaction_id": "TXN_1"}\n')
+
+        with pytest.raises(ValueError):
+            TransactionIndex(str(path))
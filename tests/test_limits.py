@@ -0,0 +1,129 @@
+"""
+Tests for adaptive concurrency limits
+"""
+
+import threading
+import time
+
+import pytest
+
+from payagency_api import PayAgencyOverloadError
+from payagency_api.limits import AIMDLimit, ConcurrencyLimiter, GradientLimit
+
+
+class TestLimitAlgorithms:
+    """Test limit updates"""
+
+    def test_aimd(self):
+        """Test additive increase when busy and multiplicative decrease on drops"""
+        limit = AIMDLimit(initial_limit=10, backoff=0.5)
+
+        assert limit.update(0.1, inflight=8, dropped=False) == 11
+        assert limit.update(0.1, inflight=1, dropped=False) == 11
+        assert limit.update(0.1, inflight=8, dropped=True) == 5.5
+
+    def test_aimd_latency_timeout(self):
+        """Test slow responses count as drops"""
+        limit = AIMDLimit(initial_limit=10, backoff=0.5, latency_timeout=1.0)
+
+        assert limit.update(2.0, inflight=10, dropped=False) == 5
+
+    def test_limits_are_bounded(self):
+        """Test the limit stays within min_limit and max_limit"""
+        limit = AIMDLimit(initial_limit=2, min_limit=2, max_limit=3, backoff=0.5)
+
+        limit.update(0.1, inflight=2, dropped=True)
+        assert limit.limit == 2
+        limit.update(0.1, inflight=2, dropped=False)
+        limit.update(0.1, inflight=3, dropped=False)
+        assert limit.limit == 3
+
+    def test_gradient_shrinks_when_latency_grows(self):
+        """Test rising latency lowers the limit and steady latency raises it"""
+        limit = GradientLimit(initial_limit=20)
+        for _ in range(20):
+            limit.update(0.1, inflight=20, dropped=False)
+        grown = limit.limit
+
+        for _ in range(20):
+            limit.update(1.0, inflight=20, dropped=False)
+
+        assert grown > 20
+        assert limit.limit < grown
+
+
+class TestConcurrencyLimiter:
+    """Test admission, queueing and shedding"""
+
+    def test_sheds_when_queue_full(self):
+        """Test calls over the limit are shed when queueing is disabled"""
+        limiter = ConcurrencyLimiter(lambda: AIMDLimit(initial_limit=1), max_queue=0)
+
+        with limiter.acquire("/card"):
+            with pytest.raises(PayAgencyOverloadError):
+                with limiter.acquire("/card"):
+                    pass
+            # Other endpoints have their own limit
+            with limiter.acquire("/payout"):
+                pass
+
+        assert limiter.stats()["/card"]["shed"] == 1
+
+    def test_queue_timeout(self):
+        """Test queued calls are shed after queue_timeout"""
+        limiter = ConcurrencyLimiter(lambda: AIMDLimit(initial_limit=1), queue_timeout=0.01)
+
+        with limiter.acquire("/card"):
+            with pytest.raises(PayAgencyOverloadError):
+                with limiter.acquire("/card"):
+                    pass
+
+    def test_queued_calls_are_admitted(self):
+        """Test waiting calls run once a slot frees up"""
+        limiter = ConcurrencyLimiter(lambda: AIMDLimit(initial_limit=1, max_limit=1))
+        peak = []
+
+        def work():
+            with limiter.acquire("/card"):
+                peak.append(limiter.stats()["/card"]["inflight"])
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == [1] * 5
+
+
+class TestClientLimits:
+    """Test make_request reports outcomes to the limiter"""
+
+    def test_throttling_shrinks_limit(self, make_client):
+        """Test 429 responses count as drops"""
+        limiter = ConcurrencyLimiter(lambda: AIMDLimit(initial_limit=10, backoff=0.5))
+        client = make_client(lambda request: (429, {"message": "Too many requests"}), concurrency_limiter=limiter)
+
+        with pytest.raises(Exception):
+            client.txn.get_transactions()
+
+        stats = limiter.stats()["/api/v1/test-transactions"]
+        assert stats["dropped"] == 1
+        assert stats["limit"] == 5
+        assert stats["inflight"] == 0
+
+    def test_clean_streams_keep_limit(self, make_client, sample_transactions_response):
+        """Test finished and closed streams are not counted as drops"""
+        limiter = ConcurrencyLimiter(lambda: AIMDLimit(initial_limit=10, backoff=0.5))
+        client = make_client(lambda request: sample_transactions_response, concurrency_limiter=limiter)
+
+        for _ in range(5):
+            assert len(list(client.txn.stream_transactions())) == 2
+        with client.txn.stream_transactions() as stream:
+            next(iter(stream))
+
+        stats = limiter.stats()["/api/v1/test-transactions"]
+        assert stats["dropped"] == 0
+        assert stats["limit"] == 10
+        assert stats["inflight"] == 0
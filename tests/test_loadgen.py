@@ -0,0 +1,116 @@
+"""
+Tests for the load generator
+"""
+
+import json
+
+import pytest
+
+from payagency_api.loadgen import LatencyHistogram, LoadGenerator, OPERATIONS, main, offline_response, parse_mix
+
+
+class TestParseMix:
+    """Test operation mix parsing"""
+
+    def test_weights(self):
+        """Test weights default to 1"""
+        assert parse_mix("s2s=5, transactions") == {"s2s": 5.0, "transactions": 1.0}
+
+    @pytest.mark.parametrize("text", ["", "refund=1", "s2s=0"])
+    def test_invalid(self, text):
+        """Test unknown operations and non-positive weights are rejected"""
+        with pytest.raises(ValueError):
+            parse_mix(text)
+
+
+class TestLatencyHistogram:
+    """Test the latency histogram"""
+
+    def test_percentiles(self):
+        """Test percentiles are within the bucket precision"""
+        histogram = LatencyHistogram()
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000)
+
+        assert histogram.count == 1000
+        assert histogram.percentile(0.5) == pytest.approx(0.5, rel=0.03)
+        assert histogram.percentile(0.99) == pytest.approx(0.99, rel=0.03)
+        assert histogram.percentile(1.0) == 1.0
+        assert histogram.mean == pytest.approx(0.5005)
+        assert sum(count for _, count in histogram.bins()) == 1000
+
+    def test_empty(self):
+        """Test an empty histogram reports zeros"""
+        histogram = LatencyHistogram()
+
+        assert histogram.percentile(0.99) == 0.0
+        assert histogram.bins() == []
+
+
+class TestLoadGenerator:
+    """Test load runs"""
+
+    def test_every_operation_passes_validation(self, make_client):
+        """Test the generated payloads are valid for every operation"""
+        client = make_client(offline_response)
+
+        for index, operation in enumerate(OPERATIONS.values()):
+            assert operation(client, index)["status"] == "SUCCESS"
+
+    def test_closed_loop_mix(self, make_client):
+        """Test requests follow the mix and stop at max_requests"""
+        client = make_client(offline_response)
+
+        report = LoadGenerator(client, {"s2s": 3, "transactions": 1}, concurrency=2, max_requests=400).run()
+
+        data = report.to_dict()
+        assert data["requests"] == 400
+        assert data["operations"]["s2s"]["requests"] == pytest.approx(300, abs=2)
+        assert data["operations"]["transactions"]["requests"] == pytest.approx(100, abs=2)
+        assert data["cpu_ms_per_request"] > 0
+        assert client.transport.stats()["requests"] == 400
+
+    def test_open_loop_rate(self, make_client):
+        """Test open-loop runs send at the target rate"""
+        report = LoadGenerator(make_client(offline_response), {"transactions": 1}, rps=200, duration=0.25).run()
+
+        assert 45 <= report.requests <= 50
+
+    def test_errors_are_counted(self, make_client):
+        """Test failures are broken down by error type and status"""
+        client = make_client(lambda request: (503, {"message": "Unavailable"}))
+
+        report = LoadGenerator(client, {"transactions": 1}, concurrency=1, max_requests=5).run()
+
+        assert report.to_dict()["errors"] == {"PayAgencyServerError (503)": 5}
+        assert "PayAgencyServerError (503)" in report.format()
+
+
+class TestCommandLine:
+    """Test the command-line entry point"""
+
+    def test_offline_json_report(self, capsys):
+        """Test an offline run prints a JSON report"""
+        assert main(["--offline", "--requests", "60", "--concurrency", "2", "--json"]) == 0
+
+        report = json.loads(capsys.readouterr().out)
+        assert report["requests"] == 60
+        assert set(report["operations"]) == set(OPERATIONS)
+
+    def test_profile(self, capsys, tmp_path):
+        """Test --profile adds the phase breakdown and --profile-dump writes pstats"""
+        path = tmp_path / "sdk.prof"
+
+        assert main(["--offline", "--requests", "20", "--mix", "s2s", "--profile", "--profile-dump", str(path)]) == 0
+
+        output = capsys.readouterr().out
+        assert "POST /api/v1/test/card" in output and "  encrypt" in output
+        assert path.stat().st_size > 0
+
+    def test_requires_credentials(self, capsys, monkeypatch):
+        """Test online runs need credentials"""
+        monkeypatch.delenv("PAYAGENCY_ENCRYPTION_KEY", raising=False)
+        monkeypatch.delenv("PAYAGENCY_SECRET_KEY", raising=False)
+
+        assert main(["--requests", "1"]) == 2
+        assert "--secret-key" in capsys.readouterr().err
@@ -0,0 +1,160 @@
+"""
+Tests for the multi-merchant client pool
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from payagency_api import InMemoryIdempotencyStore, PayAgencyClientPool
+from payagency_api.transports import InMemoryTransport
+
+
+def _key(n):
+    return f"{n:032d}"
+
+
+class TestPayAgencyClientPool:
+    """Test per-merchant clients over a shared transport"""
+
+    def test_clients_share_transport(self):
+        """Test each merchant's requests carry its own credentials over one transport"""
+        transport = InMemoryTransport()
+        pool = PayAgencyClientPool(
+            {"m1": (_key(1), "PA_TEST_one"), "m2": (_key(2), "PA_LIVE_two")},
+            transport=transport,
+        )
+
+        pool["m1"].make_request("GET", "/api/v1/test/transactions")
+        pool["m2"].make_request("GET", "/api/v1/live/transactions")
+
+        first, second = transport.requests
+        assert first.headers["Authorization"] == "Bearer PA_TEST_one"
+        assert second.headers["Authorization"] == "Bearer PA_LIVE_two"
+        assert pool["m1"].environment == "test"
+        assert pool["m2"].environment == "live"
+        assert pool["m1"].transport is pool["m2"].transport is transport
+        assert pool["m1"].codec is pool["m2"].codec
+        assert pool["m1"].compression is pool["m2"].compression
+
+    def test_shared_idempotency_store_is_per_merchant(self, sample_payment_data):
+        """Test identical submissions from two merchants are not answered from each other's records"""
+        transport = InMemoryTransport(lambda request: {"merchant": request.headers["Authorization"]})
+        pool = PayAgencyClientPool(
+            {"m1": (_key(1), "PA_TEST_one"), "m2": (_key(2), "PA_TEST_two")},
+            transport=transport,
+            idempotency_store=InMemoryIdempotencyStore(),
+        )
+
+        first = pool["m1"].payment.s2s(sample_payment_data)
+        second = pool["m2"].payment.s2s(sample_payment_data)
+        assert pool["m2"].payment.s2s(sample_payment_data) == second
+
+        assert first == {"merchant": "Bearer PA_TEST_one"}
+        assert second == {"merchant": "Bearer PA_TEST_two"}
+        assert len(transport.requests) == 2
+
+        # Caller-supplied keys such as order IDs are also kept apart
+        for merchant_id in ("m1", "m2"):
+            pool[merchant_id].make_request("POST", "/api/v1/test/payout", {"amount": 1}, idempotency_key="order-1")
+        assert len(transport.requests) == 4
+
+    def test_clients_are_cached(self):
+        """Test a merchant's client is created once"""
+        pool = PayAgencyClientPool({"m1": (_key(1), "PA_TEST_one")}, transport=InMemoryTransport())
+
+        assert pool.get("m1") is pool.get("m1")
+        stats = pool.stats()
+        assert stats["created"] == 1
+        assert stats["hits"] == 1
+        assert stats["transport"]["mode"] == "in-memory"
+
+    def test_unknown_merchant(self):
+        """Test unknown merchants raise KeyError"""
+        pool = PayAgencyClientPool(transport=InMemoryTransport())
+
+        with pytest.raises(KeyError, match="m1"):
+            pool.get("m1")
+
+    def test_invalid_credentials(self):
+        """Test credentials are validated when added"""
+        pool = PayAgencyClientPool(transport=InMemoryTransport())
+
+        with pytest.raises(ValueError, match="Encryption key"):
+            pool.add("m1", "short", "PA_TEST_one")
+
+    def test_credentials_loader(self):
+        """Test a loader resolves merchants on demand"""
+        loaded = []
+
+        def load(merchant_id):
+            loaded.append(merchant_id)
+            return _key(len(loaded)), f"PA_TEST_{merchant_id}"
+
+        pool = PayAgencyClientPool(load, transport=InMemoryTransport())
+
+        assert pool["acme"].secret_key == "PA_TEST_acme"
+        pool["acme"]
+        assert loaded == ["acme"]
+
+    def test_lru_eviction(self):
+        """Test the least recently used client is dropped beyond max_clients"""
+        pool = PayAgencyClientPool(
+            {f"m{n}": (_key(n), f"PA_TEST_{n}") for n in range(3)},
+            max_clients=2,
+            transport=InMemoryTransport(),
+        )
+
+        first = pool["m0"]
+        pool["m1"]
+        pool["m0"]
+        pool["m2"]
+
+        assert len(pool) == 2
+        assert pool.stats()["evicted"] == 1
+        assert pool["m0"] is first
+        assert pool.stats()["created"] == 3
+
+    def test_idle_eviction(self):
+        """Test clients unused for idle_timeout are dropped"""
+        pool = PayAgencyClientPool(
+            {"m1": (_key(1), "PA_TEST_one"), "m2": (_key(2), "PA_TEST_two")},
+            idle_timeout=60,
+            transport=InMemoryTransport(),
+        )
+
+        with patch("payagency_api.merchants.time.monotonic", return_value=0.0):
+            pool["m1"]
+        with patch("payagency_api.merchants.time.monotonic", return_value=30.0):
+            pool["m2"]
+        with patch("payagency_api.merchants.time.monotonic", return_value=75.0):
+            pool["m2"]
+
+        assert len(pool) == 1
+        assert pool.stats()["evicted"] == 1
+
+    def test_add_replaces_client(self):
+        """Test replacing credentials drops the merchant's existing client"""
+        pool = PayAgencyClientPool({"m1": (_key(1), "PA_TEST_old")}, transport=InMemoryTransport())
+        pool["m1"]
+
+        pool.add("m1", _key(1), "PA_TEST_new")
+
+        assert pool["m1"].secret_key == "PA_TEST_new"
+
+    def test_concurrent_get(self):
+        """Test concurrent first use of a merchant yields one client"""
+        pool = PayAgencyClientPool({"m1": (_key(1), "PA_TEST_one")}, transport=InMemoryTransport())
+        barrier = threading.Barrier(8)
+
+        def get(_):
+            barrier.wait()
+            return pool["m1"]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(get, range(8)))
+
+        assert len({id(client) for client in clients}) == 1
+        assert pool.stats()["created"] == 1
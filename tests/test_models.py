@@ -0,0 +1,77 @@
+"""
+Tests for response model classes
+"""
+
+import pytest
+from decimal import Decimal
+
+from payagency_api.exceptions import PayAgencyAPIError
+from payagency_api.models import Transaction, TransactionPage, PaymentResult, User
+
+
+class TestResponseModels:
+    """Test response models"""
+
+    def test_models_are_slotted(self, sample_transactions_response):
+        """Test models carry no per-instance __dict__"""
+        txn = Transaction(sample_transactions_response["data"][0])
+
+        assert not hasattr(txn, "__dict__")
+
+    def test_amounts_decode_to_decimal(self, sample_transactions_response):
+        """Test amount strings are converted to Decimal on access"""
+        txn = Transaction(sample_transactions_response["data"][0])
+
+        assert txn.amount == Decimal("100.50")
+        assert txn.converted_amount == Decimal("91.20")
+        assert Transaction(sample_transactions_response["data"][1]).converted_amount is None
+
+    def test_nested_fields_decode_lazily(self, sample_transactions_response):
+        """Test nested objects are wrapped once, on first access"""
+        txn = Transaction(sample_transactions_response["data"][0])
+
+        assert txn._decoded is None
+        assert isinstance(txn.user, User)
+        assert txn.user is txn.user
+        assert txn.user.user_kyc.name == "KYC Name"
+        assert txn.merchant_connector.name == "Acquirer"
+
+    def test_page_iteration_and_meta(self, sample_transactions_response):
+        """Test page wraps transactions and exposes metadata"""
+        page = TransactionPage(sample_transactions_response)
+
+        assert len(page) == 2
+        assert [txn.transaction_id for txn in page] == ["TXN_1", "TXN_2"]
+        assert page[1].status == "FAILED"
+        assert page.meta.has_next_page is True
+        assert page.meta.next_cursor == "abc"
+        assert page.meta.total_count == 2
+        assert page.to_dict() is sample_transactions_response
+
+    def test_missing_required_keys(self):
+        """Test malformed responses fail at construction"""
+        with pytest.raises(PayAgencyAPIError, match="missing amount"):
+            Transaction({"transaction_id": "TXN_1", "currency": "USD", "status": "SUCCESS"})
+
+        with pytest.raises(PayAgencyAPIError, match="'data' must be a list"):
+            TransactionPage({"data": {}})
+
+    def test_invalid_amount(self):
+        """Test invalid amounts raise on access"""
+        txn = Transaction({"transaction_id": "T", "amount": "abc", "currency": "USD", "status": "SUCCESS"})
+
+        with pytest.raises(PayAgencyAPIError, match="invalid amount"):
+            txn.amount
+
+    def test_payment_result(self):
+        """Test payment response wrapping"""
+        result = PaymentResult({
+            "status": "REDIRECT",
+            "message": "Redirect",
+            "redirect_url": "https://pay.agency/checkout/1",
+            "data": {"transaction_id": "TXN_1", "amount": 100, "currency": "USD"},
+        })
+
+        assert result.status == "REDIRECT"
+        assert result.data.amount == Decimal("100")
+        assert result["redirect_url"] == "https://pay.agency/checkout/1"
@@ -29,7 +29,7 @@ class TestPaymentMocked:
         result = payment.s2s(sample_payment_data)
         
         assert result == mock_response
-        mock_request.assert_called_once_with("POST", "/api/v1/test/card", sample_payment_data)
+        mock_request.assert_called_once_with("POST", "/api/v1/test/card", sample_payment_data, idempotency_key=None, idempotent=True)
     
     @patch('payagency_api.client.PayAgencyApi.make_request')
     def test_hosted_payment_test_env(self, mock_request, mock_client, sample_payment_data):
@@ -49,7 +49,7 @@ class TestPaymentMocked:
         result = payment.hosted(hosted_data)
         
         assert result == mock_response
-        mock_request.assert_called_once_with("POST", "/api/v1/test/hosted/card", hosted_data)
+        mock_request.assert_called_once_with("POST", "/api/v1/test/hosted/card", hosted_data, idempotency_key=None, idempotent=True)
     
     @patch('payagency_api.client.PayAgencyApi.make_request')
     def test_apm_payment_test_env(self, mock_request, mock_client, sample_payment_data):
@@ -69,7 +69,7 @@ class TestPaymentMocked:
         result = payment.apm(apm_data)
         
         assert result == mock_response
-        mock_request.assert_called_once_with("POST", "/api/v1/test/apm", apm_data)
+        mock_request.assert_called_once_with("POST", "/api/v1/test/apm", apm_data, idempotency_key=None, idempotent=True)
     
     def test_s2s_payment_live_env(self, mock_client, sample_payment_data):
         """Test S2S payment endpoint selection for live environment"""
@@ -82,4 +82,4 @@ class TestPaymentMocked:
             payment = Payment(mock_client)
             payment.s2s(sample_payment_data)
             
-            mock_request.assert_called_once_with("POST", "/api/v1/live/card", sample_payment_data)
+            mock_request.assert_called_once_with("POST", "/api/v1/live/card", sample_payment_data, idempotency_key=None, idempotent=True)
@@ -29,7 +29,7 @@ class TestPayoutMocked:
         result = payout.create_payout(sample_payout_data)
         
         assert result == mock_response
-        mock_request.assert_called_once_with("POST", "/api/v1/test/payout", sample_payout_data)
+        mock_request.assert_called_once_with("POST", "/api/v1/test/payout", sample_payout_data, idempotency_key=None, idempotent=True)
     
     def test_get_wallets_test_env(self, mock_client):
         """Test get wallets in test environment (mock data)"""
@@ -93,4 +93,4 @@ class TestPayoutMocked:
             payout = Payout(mock_client)
             payout.create_payout(sample_payout_data)
             
-            mock_request.assert_called_once_with("POST", "/api/v1/live/payout", sample_payout_data)
+            mock_request.assert_called_once_with("POST", "/api/v1/live/payout", sample_payout_data, idempotency_key=None, idempotent=True)
@@ -0,0 +1,118 @@
+"""
+Tests for per-phase profiling
+"""
+
+import pstats
+
+import pytest
+
+from payagency_api import PayAgencyValidationError
+from payagency_api.idempotency import InMemoryIdempotencyStore
+from payagency_api.profiling import Profiler
+from payagency_api.transports import InMemoryTransport
+
+
+class TestProfiler:
+    """Test phase attribution"""
+
+    def test_payment_phases(self, make_client, sample_payment_data):
+        """Test every phase of an encrypted request is attributed to its operation"""
+        profiler = Profiler()
+        client = make_client(transport=InMemoryTransport(), profiler=profiler, idempotency_store=InMemoryIdempotencyStore())
+
+        client.payment.s2s(sample_payment_data)
+        client.payment.s2s({**sample_payment_data, "amount": 200})
+
+        operation = profiler.report().operations["POST /api/v1/test/card"]
+        assert operation["calls"] == 2
+        assert set(operation["phases"]) == {
+            "validate", "idempotency", "headers", "serialize", "encrypt", "encode", "send", "decode", "other",
+        }
+        assert all(phase["calls"] == 2 for phase in operation["phases"].values())
+        assert operation["wall"] >= sum(
+            phase["wall"] for name, phase in operation["phases"].items() if name != "other"
+        )
+
+    def test_unencrypted_request(self, make_client):
+        """Test GET requests have no serialize or encrypt phases"""
+        profiler = Profiler()
+        client = make_client(transport=InMemoryTransport(), profiler=profiler)
+
+        client.make_request("GET", "/api/v1/test-transactions")
+
+        phases = profiler.report().operations["GET /api/v1/test-transactions"]["phases"]
+        assert set(phases) == {"headers", "encode", "send", "decode", "other"}
+
+    def test_failed_validation_is_not_attributed(self, make_client, sample_payment_data):
+        """Test validation that fails is not carried into the next request"""
+        profiler = Profiler()
+        client = make_client(transport=InMemoryTransport(), profiler=profiler)
+
+        with pytest.raises(PayAgencyValidationError):
+            client.payment.s2s({**sample_payment_data, "card_number": "123"})
+        client.make_request("GET", "/api/v1/test-transactions")
+
+        assert "validate" not in profiler.report().operations["GET /api/v1/test-transactions"]["phases"]
+
+    def test_error_responses(self, make_client):
+        """Test requests ending in API errors are still timed"""
+        profiler = Profiler()
+        client = make_client(lambda request: (500, {"message": "Down"}), profiler=profiler)
+
+        with pytest.raises(Exception):
+            client.make_request("GET", "/api/v1/test-transactions")
+
+        operation = profiler.report().operations["GET /api/v1/test-transactions"]
+        assert operation["calls"] == 1
+        assert operation["phases"]["send"]["calls"] == 1
+
+    def test_reset(self, make_client):
+        """Test reset discards timings"""
+        profiler = Profiler()
+        client = make_client(transport=InMemoryTransport(), profiler=profiler)
+        client.make_request("GET", "/api/v1/test-transactions")
+
+        profiler.reset()
+
+        assert profiler.report().operations == {}
+
+
+class TestProfileReport:
+    """Test report output formats"""
+
+    @pytest.fixture
+    def report(self, make_client, sample_payment_data):
+        profiler = Profiler()
+        client = make_client(transport=InMemoryTransport(), profiler=profiler)
+        client.payment.s2s(sample_payment_data)
+        client.make_request("GET", "/api/v1/test-transactions")
+        return profiler.report()
+
+    def test_format_and_totals(self, report):
+        """Test the text table and phase totals"""
+        text = report.format()
+
+        assert "POST /api/v1/test/card" in text
+        assert "  encrypt" in text
+        assert report.totals()["send"]["calls"] == 2
+        assert report.to_dict() == report.operations
+
+    def test_dump_stats(self, report, tmp_path):
+        """Test the dump loads with pstats"""
+        path = str(tmp_path / "sdk.prof")
+        report.dump_stats(path, clock="wall")
+
+        stats = pstats.Stats(path)
+        functions = {name for _, _, name in stats.stats}
+        assert "POST /api/v1/test/card" in functions
+        assert "POST /api/v1/test/card [encrypt]" in functions
+        assert stats.total_calls > 0
+
+    def test_folded(self, report):
+        """Test collapsed stacks"""
+        lines = report.folded(clock="wall").splitlines()
+
+        assert any(line.startswith("payagency;POST /api/v1/test/card;encrypt ") for line in lines)
+        assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+        with pytest.raises(ValueError):
+            report.folded(clock="gpu")
@@ -0,0 +1,99 @@
+"""
+Tests for priority scheduling
+"""
+
+import threading
+import time
+
+import pytest
+
+from payagency_api import PayAgencyApi, PayAgencyOverloadError
+from payagency_api.scheduling import PriorityScheduler, request_priority, resolve_priority
+from payagency_api.transports import InMemoryTransport
+
+
+class TestPriorityResolution:
+    """Test how a request's priority is chosen"""
+
+    def test_defaults(self):
+        """Test the method default applies outside request_priority blocks"""
+        assert resolve_priority() == "interactive"
+        assert resolve_priority("reporting") == "reporting"
+
+    def test_context_overrides_default(self):
+        """Test request_priority overrides method defaults"""
+        with request_priority("batch"):
+            assert resolve_priority("reporting") == "batch"
+        assert resolve_priority("reporting") == "reporting"
+
+    def test_unknown_priority(self):
+        """Test unknown classes are rejected"""
+        with pytest.raises(ValueError):
+            with request_priority("urgent"):
+                pass
+
+
+class TestPriorityScheduler:
+    """Test reserved capacity and fair queueing"""
+
+    def test_reserved_capacity(self):
+        """Test other classes cannot take slots reserved for interactive requests"""
+        scheduler = PriorityScheduler(capacity=2, reserved={"interactive": 1}, queue_timeout=0.01)
+
+        with scheduler.acquire("reporting"):
+            with pytest.raises(PayAgencyOverloadError):
+                with scheduler.acquire("reporting"):
+                    pass
+            with scheduler.acquire("interactive"):
+                pass
+
+        assert scheduler.stats()["reporting"]["shed"] == 1
+
+    def test_weighted_fair_admission(self):
+        """Test waiting classes are admitted in proportion to their weights"""
+        scheduler = PriorityScheduler(
+            capacity=1, reserved={}, weights={"interactive": 3, "reporting": 1}
+        )
+        order = []
+        lock = threading.Lock()
+
+        def work(priority):
+            with scheduler.acquire(priority):
+                with lock:
+                    order.append(priority)
+
+        with scheduler.acquire("batch"):
+            threads = [threading.Thread(target=work, args=(p,)) for p in ["reporting"] * 4 + ["interactive"] * 4]
+            for thread in threads:
+                thread.start()
+            while sum(s["queued"] for s in scheduler.stats().values()) < 8:
+                time.sleep(0.001)
+
+        for thread in threads:
+            thread.join()
+
+        assert order[:4].count("interactive") == 3
+        assert sorted(order) == ["interactive"] * 4 + ["reporting"] * 4
+
+
+class TestClientScheduling:
+    """Test make_request uses the scheduler"""
+
+    def test_transactions_are_reporting(self, sample_payment_data):
+        """Test transaction history is scheduled as reporting and payments as interactive"""
+        scheduler = PriorityScheduler()
+        client = PayAgencyApi(
+            encryption_key="12345678901234567890123456789012",
+            secret_key="PA_TEST_mock_secret_key",
+            transport=InMemoryTransport(),
+            scheduler=scheduler,
+        )
+
+        client.txn.get_transactions()
+        client.payment.s2s(sample_payment_data)
+        with request_priority("batch"):
+            client.payment.s2s(sample_payment_data)
+
+        stats = scheduler.stats()
+        assert [stats[p]["admitted"] for p in ("interactive", "batch", "reporting")] == [1, 1, 1]
+        assert all(s["inflight"] == 0 for s in stats.values())
@@ -0,0 +1,115 @@
+"""
+Tests for thread-safe session management
+"""
+
+import gc
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock
+
+from payagency_api.sessions import SessionPool
+
+
+class TestSessionPool:
+    """Test session pool modes"""
+
+    def test_invalid_mode(self):
+        """Test unknown session modes are rejected"""
+        with pytest.raises(ValueError, match="Session mode must be one of"):
+            SessionPool(mode="global")
+
+    def test_shared_mode_uses_one_session(self):
+        """Test shared mode hands every thread the same session"""
+        pool = SessionPool()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = set(executor.map(lambda _: id(pool.session), range(8)))
+
+        assert len(sessions) == 1
+        assert pool.stats()["acquisitions"] == 0
+
+    def test_thread_mode_uses_session_per_thread(self):
+        """Test thread mode creates one session per thread"""
+        pool = SessionPool(mode="thread")
+        barrier = threading.Barrier(4)
+
+        def get_session(_):
+            barrier.wait()
+            return pool.session
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = list(executor.map(get_session, range(4)))
+            stats = pool.stats()
+
+        assert len({id(session) for session in sessions}) == 4
+        assert stats["sessions"] == 4
+        assert stats["acquisitions"] == 4
+
+    def test_sharded_mode_spreads_threads(self):
+        """Test sharded mode assigns threads to shards round-robin"""
+        pool = SessionPool(mode="sharded", shards=2)
+        barrier = threading.Barrier(2)
+
+        def get_session(_):
+            barrier.wait()
+            return id(pool.session)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sessions = set(executor.map(get_session, range(2)))
+
+        assert len(sessions) == 2
+
+    def test_sharded_checkouts_are_not_capped_by_shards(self):
+        """Test more concurrent requests than shards share the least busy sessions"""
+        pool = SessionPool(mode="sharded", shards=2)
+        barrier = threading.Barrier(4, timeout=5)
+
+        def check_out(_):
+            with pool.acquire() as session:
+                barrier.wait()
+                return id(session)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = list(executor.map(check_out, range(4)))
+
+        assert len(set(sessions)) == 2
+        assert pool._shard_inflight == [0, 0]
+
+    def test_thread_mode_discards_sessions_of_finished_threads(self):
+        """Test a thread's session is closed and forgotten when the thread exits"""
+        pool = SessionPool(mode="thread")
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(pool.session))
+
+        with patch("payagency_api.sessions.requests.Session.close") as close:
+            thread.start()
+            thread.join()
+            gc.collect()
+
+        close.assert_called_once_with()
+        assert pool.sessions == []
+        assert pool.session not in sessions
+        assert pool.stats()["sessions"] == 1
+
+
+class TestConcurrentClient:
+    """Test concurrent use of one client"""
+
+    @patch('payagency_api.client.requests.Session.request')
+    def test_sharded_client_records_lock_metrics(self, mock_request, make_client):
+        """Test concurrent requests through sharded sessions are measured"""
+        response = Mock()
+        response.status_code = 200
+        response.content = b'{"status": "SUCCESS"}'
+        mock_request.return_value = response
+        client = make_client(session_mode="sharded", session_shards=2)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: client.make_request("GET", "/test"), range(32)))
+
+        stats = client.session_stats()
+        assert results == [{"status": "SUCCESS"}] * 32
+        assert stats["mode"] == "sharded"
+        assert stats["acquisitions"] == 32
+        assert stats["max_wait"] >= 0
+        assert all(call.kwargs["timeout"] == client.timeout for call in mock_request.call_args_list)
@@ -0,0 +1,239 @@
+"""
+Tests for streamed responses and incremental JSON parsing
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from payagency_api import PayAgencyAPIError, PayAgencyNetworkError
+from payagency_api.scheduling import PriorityScheduler
+from payagency_api.streaming import JsonItemStream
+from payagency_api.transports import AsyncInMemoryTransport
+
+
+def _chunked(document, size):
+    encoded = json.dumps(document, indent=1, ensure_ascii=False).encode("utf-8")
+    return [encoded[i:i + size] for i in range(0, len(encoded), size)]
+
+
+class TestJsonItemStream:
+    """Test the incremental parser"""
+
+    @pytest.mark.parametrize("size", [1, 7, 4096])
+    def test_items_and_fields(self, sample_transactions_response, size):
+        """Test elements and other members are parsed for any chunking"""
+        document = {**sample_transactions_response, "message": "Transactions fetched – ünïcode"}
+        stream = JsonItemStream(_chunked(document, size))
+
+        assert list(stream) == document["data"]
+        assert stream.fields["message"] == document["message"]
+        assert stream.meta == document["meta"]
+
+    def test_items_are_yielded_before_body_ends(self, sample_transactions_response):
+        """Test the first element is available before the rest of the body is read"""
+        chunks = _chunked(sample_transactions_response, 64)
+        consumed = []
+
+        def source():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        first = next(iter(JsonItemStream(source())))
+
+        assert first == sample_transactions_response["data"][0]
+        assert len(consumed) < len(chunks)
+
+    def test_numbers_split_across_chunks(self):
+        """Test numbers ending at a chunk boundary are not cut short"""
+        stream = JsonItemStream([b'{"data": [12', b'34, 5', b'6]}'])
+
+        assert list(stream) == [1234, 56]
+
+    def test_empty_and_missing_array(self):
+        """Test documents without elements"""
+        assert list(JsonItemStream([b'{"data": []}'])) == []
+        assert list(JsonItemStream([b'{}'])) == []
+
+        stream = JsonItemStream([b'{"message": "none"}'])
+        assert list(stream) == []
+        assert stream.fields == {"message": "none"}
+
+    @pytest.mark.parametrize("body", [b'{"data": [{"a": 1}, {"b"', b'[1, 2]', b'<html>'])
+    def test_invalid_documents(self, body):
+        """Test truncated or non-object documents raise PayAgencyAPIError"""
+        with pytest.raises(PayAgencyAPIError, match="Invalid JSON"):
+            list(JsonItemStream([body]))
+
+
+class TestStreamTransactions:
+    """Test client streaming"""
+
+    def test_stream_transactions(self, make_client, sample_transactions_response):
+        """Test transactions stream with query parameters and meta"""
+        scheduler = PriorityScheduler()
+        client = make_client(lambda request: sample_transactions_response, scheduler=scheduler)
+
+        stream = client.txn.stream_transactions({"nextCursor": "abc", "status": None})
+        assert len(client.transport.requests) == 0
+
+        assert [txn["transaction_id"] for txn in stream] == ["TXN_1", "TXN_2"]
+        assert stream.meta["nextCursor"] == "abc"
+        assert client.transport.requests[0].params == {"nextCursor": "abc"}
+        assert scheduler.stats()["reporting"] == {"inflight": 0, "queued": 0, "admitted": 1, "shed": 0}
+
+    def test_stream_closed_early(self, make_client, sample_transactions_response):
+        """Test closing a partly read stream releases its scheduler slot"""
+        scheduler = PriorityScheduler()
+        client = make_client(lambda request: sample_transactions_response, scheduler=scheduler)
+
+        with client.txn.stream_transactions() as stream:
+            items = iter(stream)
+            next(items)
+            assert scheduler.stats()["reporting"]["inflight"] == 1
+
+        assert scheduler.stats()["reporting"]["inflight"] == 0
+
+    def test_stream_error_status(self, make_client):
+        """Test HTTP errors are raised when iteration starts"""
+        client = make_client(lambda request: (401, {"message": "Unauthorized"}))
+
+        with pytest.raises(PayAgencyAPIError, match="Unauthorized") as exc_info:
+            list(client.txn.stream_wallet_transactions())
+
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.endpoint == "/api/v1/test-wallet-transactions"
+
+    def test_httpx_streaming(self, make_client, sample_transactions_response):
+        """Test the HTTP/2 transport streams the body"""
+        httpx = pytest.importorskip("httpx")
+        client = make_client(transport="http2")
+        client.transport.client = httpx.Client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json=sample_transactions_response))
+        )
+
+        with client.txn.stream_transactions() as stream:
+            assert len(list(stream)) == 2
+
+
+def _paged(pages, fail_page=None):
+    """Handler serving ``pages`` pages of two transactions, chained by cursor"""
+    def handler(request):
+        page = int((request.params or {}).get("nextCursor") or 0)
+        if page == fail_page:
+            return 500, {"message": "Server error"}
+        return {
+            "message": "ok",
+            "data": [{"transaction_id": f"TXN_{page}_{i}"} for i in range(2)],
+            "meta": {"hasNextPage": page + 1 < pages, "nextCursor": str(page + 1)},
+        }
+    return handler
+
+
+class _GatedTransport(AsyncInMemoryTransport):
+    """Transport blocking on one page and reporting its cancellation as a network error"""
+
+    def __init__(self, handler, block_page):
+        super().__init__(handler)
+        self.block_page = block_page
+        self.blocked = False
+        self.cancelled = False
+
+    async def send(self, method, url, headers, body=None, params=None, timeout=None):
+        if (params or {}).get("nextCursor") == str(self.block_page):
+            self.blocked = True
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise PayAgencyNetworkError("Request cancelled")
+        return await super().send(method, url, headers, body, params, timeout)
+
+
+class TestAiterTransactions:
+    """Test async transaction iteration with prefetch"""
+
+    def test_follows_cursors(self, make_client):
+        """Test every page is fetched in order with the date filters"""
+        client = make_client(async_transport=AsyncInMemoryTransport(_paged(3)))
+
+        async def collect():
+            return [txn["transaction_id"] async for txn in client.txn.aiter_transactions("2024-01-01", "2024-01-31")]
+
+        assert asyncio.run(collect()) == ["TXN_0_0", "TXN_0_1", "TXN_1_0", "TXN_1_1", "TXN_2_0", "TXN_2_1"]
+        requests = client.async_transport.requests
+        assert [request.path for request in requests] == ["/api/v1/test-transactions"] * 3
+        assert requests[0].params == {"transaction_start_date": "2024-01-01", "transaction_end_date": "2024-01-31"}
+        assert requests[2].params["nextCursor"] == "2"
+
+    def test_backpressure(self, make_client):
+        """Test fetching pauses while prefetched pages are unread"""
+        client = make_client(async_transport=AsyncInMemoryTransport(_paged(10)))
+
+        async def read_one():
+            items = client.txn.aiter_wallet_transactions(prefetch=2)
+            await items.__anext__()
+            await asyncio.sleep(0.05)
+            sent = len(client.async_transport.requests)
+            await items.aclose()
+            return sent
+
+        # The page being read, two prefetched pages and one waiting for room
+        assert asyncio.run(read_one()) == 4
+        assert client.async_transport.requests[0].path == "/api/v1/test-wallet-transactions"
+
+    def test_close_cancels_fetch(self, make_client):
+        """Test closing the iterator cancels the in-flight page request"""
+        client = make_client(async_transport=AsyncInMemoryTransport(_paged(10), latency=0.05))
+
+        async def stop_early():
+            items = client.txn.aiter_transactions(prefetch=1)
+            await items.__anext__()
+            await items.aclose()
+            sent = len(client.async_transport.requests)
+            await asyncio.sleep(0.2)
+            return sent, len(client.async_transport.requests)
+
+        sent, later = asyncio.run(stop_early())
+        assert sent == later == 1
+
+    def test_break_with_full_queue(self, make_client):
+        """Test stopping early does not hang when the cancelled fetch ends in an error"""
+        gate = _GatedTransport(_paged(10), block_page=2)
+        client = make_client(async_transport=gate)
+
+        async def stop_early():
+            items = client.txn.aiter_transactions(prefetch=1)
+            first = await items.__anext__()
+            # Page 1 fills the queue while page 2 is in flight
+            while not gate.blocked:
+                await asyncio.sleep(0.01)
+            await asyncio.wait_for(items.aclose(), timeout=1)
+            return first["transaction_id"]
+
+        assert asyncio.run(stop_early()) == "TXN_0_0"
+        assert gate.cancelled
+
+    def test_error_after_earlier_pages(self, make_client):
+        """Test a failed page fetch is raised once earlier pages are consumed"""
+        client = make_client(async_transport=AsyncInMemoryTransport(_paged(5, fail_page=1)))
+        seen = []
+
+        async def collect():
+            async for txn in client.txn.aiter_transactions():
+                seen.append(txn["transaction_id"])
+
+        with pytest.raises(PayAgencyAPIError, match="Server error"):
+            asyncio.run(collect())
+        assert seen == ["TXN_0_0", "TXN_0_1"]
+
+    def test_invalid_arguments(self, make_client):
+        """Test prefetch and the async transport are checked up front"""
+        with pytest.raises(ValueError, match="prefetch"):
+            make_client(async_transport=AsyncInMemoryTransport(_paged(1))).txn.aiter_transactions(prefetch=0)
+
+        client = make_client()
+        with pytest.raises(ValueError, match="async_transport"):
+            client.txn.aiter_transactions()
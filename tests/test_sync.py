@@ -0,0 +1,130 @@
+"""
+Tests for incremental transaction sync
+"""
+
+import copy
+import pytest
+from unittest.mock import patch
+
+from payagency_api.sync import TransactionSync
+
+
+def _pages(response, cursors):
+    """Split a transactions response into one page per transaction"""
+    pages = []
+    for index, txn in enumerate(response["data"]):
+        next_cursor = cursors[index] if index < len(cursors) else None
+        pages.append({
+            "message": "ok",
+            "data": [txn],
+            "meta": {"hasNextPage": next_cursor is not None, "nextCursor": next_cursor},
+        })
+    return pages
+
+
+class TestTransactionSync:
+    """Test SQLite transaction sync"""
+
+    @patch('payagency_api.client.PayAgencyApi.make_request')
+    def test_initial_sync_follows_cursors(self, mock_request, mock_client, sample_transactions_response):
+        """Test the first run pages through history and stores rows"""
+        mock_request.side_effect = _pages(sample_transactions_response, ["c1"])
+
+        with TransactionSync(mock_client, ":memory:") as sync:
+            summary = sync.sync(start_date="2024-01-01")
+
+            assert summary["pages"] == 2
+            assert summary["inserted"] == 2
+            assert summary["high_water_mark"] == "2024-01-02T10:00:00.000Z"
+            assert sync.count() == 2
+            assert sync.get("TXN_1")["amount"] == "100.50"
+            assert [t["transaction_id"] for t in sync.find_by_order_id("ORDER_1")] == ["TXN_1"]
+            assert [t["transaction_id"] for t in sync.query(status="FAILED")] == ["TXN_2"]
+
+        first_call, second_call = mock_request.call_args_list
+        assert first_call.kwargs["params"] == {"transaction_start_date": "2024-01-01"}
+        assert second_call.kwargs["params"]["nextCursor"] == "c1"
+
+    @patch('payagency_api.client.PayAgencyApi.make_request')
+    def test_delta_sync_uses_high_water_mark(self, mock_request, mock_client, sample_transactions_response, tmp_path):
+        """Test later runs only fetch from the high-water mark and count changes"""
+        path = str(tmp_path / "txn.db")
+        mock_request.side_effect = _pages(sample_transactions_response, ["c1"])
+        with TransactionSync(mock_client, path) as sync:
+            sync.sync()
+
+        changed = copy.deepcopy(sample_transactions_response)
+        changed["data"][1]["status"] = "SUCCESS"
+        mock_request.side_effect = [{"data": changed["data"], "meta": {"hasNextPage": False}}]
+
+        with TransactionSync(mock_client, path) as sync:
+            summary = sync.sync()
+
+            assert summary["inserted"] == 0
+            assert summary["updated"] == 1
+            assert sync.get("TXN_2")["status"] == "SUCCESS"
+
+        assert mock_request.call_args.kwargs["params"] == {"transaction_start_date": "2024-01-01"}
+
+    @patch('payagency_api.client.PayAgencyApi.make_request')
+    def test_interrupted_sync_resumes_from_cursor(self, mock_request, mock_client, sample_transactions_response):
+        """Test a failed run resumes from the saved cursor"""
+        first_page, second_page = _pages(sample_transactions_response, ["c1"])
+        mock_request.side_effect = [first_page, RuntimeError("connection lost")]
+
+        sync = TransactionSync(mock_client, ":memory:")
+        with pytest.raises(RuntimeError):
+            sync.sync(start_date="2023-12-01")
+        assert sync.high_water_mark is None
+
+        mock_request.side_effect = [second_page]
+        summary = sync.sync()
+
+        assert summary["inserted"] == 1
+        assert mock_request.call_args.kwargs["params"] == {
+            "transaction_start_date": "2023-12-01",
+            "nextCursor": "c1",
+        }
+        assert sync.high_water_mark == "2024-01-02T10:00:00.000Z"
+
+    @patch('payagency_api.client.PayAgencyApi.make_request')
+    def test_resumed_sync_keeps_newest_row_of_interrupted_pages(
+        self, mock_request, mock_client, sample_transactions_response
+    ):
+        """Test the high-water mark covers pages fetched before the interruption"""
+        newest_first = {**sample_transactions_response, "data": sample_transactions_response["data"][::-1]}
+        first_page, second_page = _pages(newest_first, ["c1"])
+        mock_request.side_effect = [first_page, RuntimeError("connection lost")]
+
+        sync = TransactionSync(mock_client, ":memory:")
+        with pytest.raises(RuntimeError):
+            sync.sync()
+
+        mock_request.side_effect = [second_page]
+        summary = sync.sync()
+
+        assert summary["high_water_mark"] == "2024-01-02T10:00:00.000Z"
+        assert sync.high_water_mark == "2024-01-02T10:00:00.000Z"
+
+    @patch('payagency_api.client.PayAgencyApi.make_request')
+    def test_full_sync_ignores_high_water_mark(self, mock_request, mock_client, sample_transactions_response):
+        """Test a full run re-fetches from the start date and drops a pending cursor"""
+        first_page, second_page = _pages(sample_transactions_response, ["c1"])
+        mock_request.side_effect = [first_page, second_page, first_page, RuntimeError("connection lost")]
+
+        sync = TransactionSync(mock_client, ":memory:")
+        sync.sync()
+        with pytest.raises(RuntimeError):
+            sync.sync()
+
+        mock_request.side_effect = _pages(sample_transactions_response, [])
+        summary = sync.sync(start_date="2023-01-01", full=True)
+
+        assert summary["fetched"] == 1
+        assert mock_request.call_args.kwargs["params"] == {"transaction_start_date": "2023-01-01"}
+        assert sync.high_water_mark == "2024-01-02T10:00:00.000Z"
+
+    def test_invalid_source(self, mock_client):
+        """Test unknown sources are rejected"""
+        with pytest.raises(ValueError, match="source must be one of"):
+            TransactionSync(mock_client, ":memory:", source="refunds")
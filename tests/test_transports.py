@@ -0,0 +1,227 @@
+"""
+Tests for pluggable HTTP transports
+"""
+
+import asyncio
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch, Mock
+
+from payagency_api import PayAgencyAPIError, PayAgencyNetworkError
+from payagency_api.transports import (
+    InMemoryTransport,
+    AsyncInMemoryTransport,
+    RequestsTransport,
+    TransportResponse,
+    Urllib3Transport,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def verify_request(self, request, client_address):
+        self.connections += 1
+        return True
+
+
+@pytest.fixture
+def http_server():
+    """Local keep-alive HTTP server counting the connections it accepts"""
+    server = _CountingServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestTransportSelection:
+    """Test transport configuration"""
+
+    def test_invalid_transport(self, make_client):
+        """Test unknown transports are rejected"""
+        with pytest.raises(ValueError, match="Transport must be"):
+            make_client(transport="carrier-pigeon")
+
+    def test_default_transport_exposes_session(self, make_client):
+        """Test the requests transport keeps the session property"""
+        assert make_client().session is not None
+        assert make_client(transport="urllib3").session is None
+
+
+class TestInMemoryTransport:
+    """Test the in-memory transport"""
+
+    def test_request_shape(self, make_client):
+        """Test requests carry auth headers, encrypted body and params"""
+        client = make_client(transport=InMemoryTransport())
+
+        client.make_request("POST", "/api/v1/test/card", {"amount": 1}, params={"a": "b"})
+
+        request = client.transport.requests[0]
+        assert request.method == "POST"
+        assert request.path == "/api/v1/test/card"
+        assert request.headers["Authorization"] == "Bearer PA_TEST_mock_secret_key"
+        assert list(request.json()) == ["payload"]
+        assert request.params == {"a": "b"}
+
+    def test_api_error_mapping(self, make_client):
+        """Test HTTP errors map to PayAgencyAPIError"""
+        client = make_client(lambda request: (422, {"message": "Invalid"}))
+
+        with pytest.raises(PayAgencyAPIError) as exc_info:
+            client.make_request("GET", "/test")
+
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.message == "Invalid"
+
+    def test_invalid_json(self, make_client):
+        """Test non-JSON bodies raise PayAgencyAPIError"""
+        client = make_client(lambda request: TransportResponse(200, {}, b"<html>"))
+
+        with pytest.raises(PayAgencyAPIError, match="Invalid JSON"):
+            client.make_request("GET", "/test")
+
+    def test_async_transport(self, make_client):
+        """Test amake_request uses the async transport"""
+        client = make_client(async_transport=AsyncInMemoryTransport(lambda request: {"status": "PENDING"}))
+
+        result = asyncio.run(client.amake_request("GET", "/test"))
+
+        assert result == {"status": "PENDING"}
+        assert client.async_transport.requests[0].method == "GET"
+
+    def test_async_requires_transport(self, make_client):
+        """Test amake_request without an async transport fails clearly"""
+        with pytest.raises(ValueError, match="async_transport"):
+            asyncio.run(make_client().amake_request("GET", "/test"))
+
+
+class TestUrllib3Transport:
+    """Test the urllib3 transport"""
+
+    def test_params_and_errors(self, make_client):
+        """Test query encoding and network error mapping"""
+        import urllib3
+
+        transport = Urllib3Transport()
+        response = Mock(status=200, headers={}, data=b'{"ok": true}')
+        with patch.object(transport.manager, "request", return_value=response) as mock_request:
+            result = transport.send("GET", "https://x/test", {}, params={"nextCursor": "a b"})
+
+        assert result.json() == {"ok": True}
+        assert mock_request.call_args.args[1] == "https://x/test?nextCursor=a+b"
+
+        with patch.object(transport.manager, "request", side_effect=urllib3.exceptions.NewConnectionError(None, "refused")):
+            with pytest.raises(PayAgencyNetworkError):
+                transport.send("GET", "https://x/test", {})
+
+
+class TestHttpxTransport:
+    """Test the httpx HTTP/2 transport"""
+
+    def _client(self, make_client, handler):
+        httpx = pytest.importorskip("httpx")
+        client = make_client(transport="http2")
+        client.transport.client = httpx.Client(transport=httpx.MockTransport(handler))
+        return client, httpx
+
+    def test_success(self, make_client):
+        """Test requests carry auth headers and encrypted payloads"""
+        seen = {}
+
+        def handler(request):
+            seen["auth"] = request.headers["Authorization"]
+            seen["body"] = request.content
+            return httpx.Response(200, json={"status": "SUCCESS"})
+
+        client, httpx = self._client(make_client, handler)
+
+        assert client.make_request("POST", "/api/v1/test/card", {"amount": 1}) == {"status": "SUCCESS"}
+        assert seen["auth"] == "Bearer PA_TEST_mock_secret_key"
+        assert b'"payload"' in seen["body"]
+        assert client.session_stats() == {"mode": "http2", "requests": 1}
+
+    def test_network_error_mapping(self, make_client):
+        """Test connection failures map to PayAgencyNetworkError"""
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client, httpx = self._client(make_client, handler)
+
+        with pytest.raises(PayAgencyNetworkError, match="connection refused"):
+            client.make_request("GET", "/test")
+
+
+class TestPreconnect:
+    """Test opening keep-alive connections ahead of use"""
+
+    def _wait_for(self, server, connections):
+        for _ in range(100):
+            if server.connections >= connections:
+                break
+            threading.Event().wait(0.01)
+        return server.connections
+
+    def test_urllib3_connections_reused(self, http_server):
+        """Test preconnected urllib3 connections serve later requests"""
+        server, url = http_server
+        transport = Urllib3Transport(pool_maxsize=4)
+
+        assert transport.preconnect(url, 3) == 3
+        assert self._wait_for(server, 3) == 3
+
+        assert transport.preconnect(url, 3) == 3
+        assert transport.send("GET", f"{url}/test", {}).json() == {}
+        assert server.connections == 3
+        transport.close()
+
+    def test_requests_connections_reused(self, http_server):
+        """Test connections land in the pool requests sends through, spread over shards"""
+        server, url = http_server
+        transport = RequestsTransport(session_mode="sharded", session_shards=2, pool_maxsize=4)
+
+        assert transport.preconnect(url, 3) == 3
+        assert self._wait_for(server, 3) == 3
+
+        assert transport.send("GET", f"{url}/test", {}).json() == {}
+        assert server.connections == 3
+        transport.close()
+
+    def test_capped_by_pool_size(self, http_server):
+        """Test no more connections are opened than the pool keeps"""
+        server, url = http_server
+        transport = Urllib3Transport(pool_maxsize=2)
+
+        assert transport.preconnect(url, 5) == 2
+        transport.close()
+
+    def test_refused(self, http_server):
+        """Test connection failures map to PayAgencyNetworkError"""
+        server, url = http_server
+        server.shutdown()
+        server.server_close()
+
+        with pytest.raises(PayAgencyNetworkError):
+            Urllib3Transport().preconnect(url, 1, timeout=1)
+
+    def test_in_memory_transport(self):
+        """Test transports without connections open none"""
+        assert InMemoryTransport().preconnect("https://x", 4) == 0
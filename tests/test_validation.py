@@ -0,0 +1,185 @@
+"""
+Tests for client-side input validation
+"""
+
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+from payagency_api import PayAgencyValidationError
+from payagency_api.transports import InMemoryTransport
+from payagency_api.types import CryptoOffRampInput, CryptoOnRampInput, HostedInput, PayoutInput, S2SInput
+from payagency_api.validation import get_validator, luhn_valid, validate_input
+
+
+@pytest.fixture
+def sample_on_ramp_data():
+    """Sample OnRamp data for testing"""
+    return {
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "john@example.com",
+        "phone_number": "1234567890",
+        "fiat_amount": 200,
+        "fiat_currency": "EUR",
+        "crypto_currency": "BTC",
+        "wallet_address": "bc1qxy2kgdygjrsqtzq2n0yrf2493p83kkfjhx0wlh",
+        "ip_address": "127.0.0.1",
+        "country": "GB",
+        "crypto_network": "BTC",
+        "redirect_url": "https://example.com",
+    }
+
+
+class TestValidators:
+    """Test compiled schema validators"""
+
+    def test_valid_data_passes(self, sample_payment_data):
+        """Test fixture data passes and optional keys may be omitted"""
+        validate_input(S2SInput, sample_payment_data)
+        validate_input(S2SInput, {**sample_payment_data, "order_id": None})
+
+    def test_validator_is_compiled_once(self):
+        """Test validators are cached per schema"""
+        assert get_validator(S2SInput) is get_validator(S2SInput)
+
+    def test_missing_and_mistyped_keys(self, sample_payment_data):
+        """Test all errors are reported together"""
+        data = {**sample_payment_data, "amount": "100"}
+        del data["email"]
+
+        with pytest.raises(PayAgencyValidationError) as exc_info:
+            validate_input(S2SInput, data)
+
+        assert exc_info.value.response["errors"] == {
+            "email": "is required",
+            "amount": "must be int, got str",
+        }
+
+    @pytest.mark.parametrize("field, value", [
+        ("currency", "usd"),
+        ("currency", "US"),
+        ("country", "USA"),
+        ("card_number", "4111-1111-1111-1111"),
+        ("card_number", "41111111111"),
+        ("card_expiry_month", "13"),
+        ("card_expiry_year", "27"),
+        ("amount", 0),
+        ("amount", True),
+    ])
+    def test_format_errors(self, sample_payment_data, field, value):
+        """Test format checks reject malformed values"""
+        with pytest.raises(PayAgencyValidationError) as exc_info:
+            validate_input(S2SInput, {**sample_payment_data, field: value})
+
+        assert field in exc_info.value.response["errors"]
+
+    def test_expired_card(self, sample_payment_data):
+        """Test cards expiring before the current month are rejected"""
+        last_year = str(datetime.date.today().year - 1)
+
+        with pytest.raises(PayAgencyValidationError, match="expired"):
+            validate_input(S2SInput, {**sample_payment_data, "card_expiry_year": last_year})
+
+    def test_luhn(self):
+        """Test the Luhn checksum"""
+        assert luhn_valid("4111111111111111")
+        assert luhn_valid("5555555555554444")
+        assert not luhn_valid("4111111111111121")
+
+    def test_luhn_check_is_opt_in(self, sample_payout_data):
+        """Test gateway test cards failing the Luhn check pass unless it is enabled"""
+        data = {**sample_payout_data, "card_number": "4222222222222222"}
+        validate_input(PayoutInput, data)
+
+        with pytest.raises(PayAgencyValidationError, match="Luhn"):
+            validate_input(PayoutInput, data, luhn=True)
+        validate_input(PayoutInput, sample_payout_data, luhn=True)
+        assert get_validator(PayoutInput, luhn=True) is not get_validator(PayoutInput)
+
+    def test_non_dict_input(self):
+        """Test non-dict input is rejected"""
+        with pytest.raises(PayAgencyValidationError):
+            validate_input(HostedInput, None)
+
+
+class TestClientValidation:
+    """Test API modules validate before sending"""
+
+    def test_invalid_payment_is_not_sent(self, make_client, sample_payment_data):
+        """Test invalid input fails before reaching the transport"""
+        client = make_client(transport=InMemoryTransport())
+
+        with pytest.raises(PayAgencyValidationError):
+            client.payment.s2s({**sample_payment_data, "card_number": "4111-1111-1111-1111"})
+
+        assert len(client.transport.requests) == 0
+
+    @pytest.mark.parametrize("make_client", [{"check_luhn": True}], indirect=True)
+    def test_luhn_check_can_be_enabled(self, make_client, sample_payment_data):
+        """Test check_luhn=True rejects card numbers failing the checksum"""
+        client = make_client(transport=InMemoryTransport())
+
+        with pytest.raises(PayAgencyValidationError, match="Luhn"):
+            client.payment.s2s({**sample_payment_data, "card_number": "4111111111111112"})
+
+        assert len(client.transport.requests) == 0
+
+    @pytest.mark.parametrize("example", [
+        "example_s2s_payment",
+        "example_hosted_payment",
+        "example_payout",
+        "example_crypto_onramp",
+        "example_crypto_offramp",
+    ])
+    def test_example_payloads_are_sent(self, make_client, monkeypatch, example):
+        """Test the payloads in examples.py pass validation"""
+        examples = pytest.importorskip("examples")
+        client = make_client(transport=InMemoryTransport())
+        monkeypatch.setattr(examples, "pay_agency", client)
+
+        assert getattr(examples, example)() is not None
+        assert len(client.transport.requests) == 1
+
+    def test_valid_requests_are_sent(self, make_client, sample_payment_data, sample_payout_data, sample_on_ramp_data):
+        """Test valid input is sent unchanged"""
+        client = make_client(transport=InMemoryTransport())
+
+        client.payment.s2s(sample_payment_data)
+        client.payout.create_payout(sample_payout_data)
+        client.crypto.on_ramp(sample_on_ramp_data)
+
+        assert len(client.transport.requests) == 3
+
+    def test_on_ramp_requires_fiat_amount(self, make_client, sample_on_ramp_data):
+        """Test OnRamp uses its own schema rather than the unified one"""
+        del sample_on_ramp_data["fiat_amount"]
+
+        with pytest.raises(PayAgencyValidationError, match="fiat_amount"):
+            make_client(transport=InMemoryTransport()).crypto.on_ramp(sample_on_ramp_data)
+
+    @pytest.mark.parametrize("method", ["on_ramp", "off_ramp"])
+    def test_ramps_validate_once(self, make_client, method, sample_on_ramp_data):
+        """Test OnRamp and OffRamp input is validated once, against its own schema"""
+        client = make_client(transport=InMemoryTransport())
+        off_ramp_data = {key: value for key, value in sample_on_ramp_data.items() if key != "fiat_amount"}
+
+        with patch.object(client, "validate", wraps=client.validate) as validate:
+            if method == "on_ramp":
+                client.crypto.on_ramp(sample_on_ramp_data)
+            else:
+                client.crypto.off_ramp({**off_ramp_data, "crypto_amount": "0.01"})
+
+        assert validate.call_count == 1
+        assert validate.call_args.args[0] is (CryptoOnRampInput if method == "on_ramp" else CryptoOffRampInput)
+        assert client.transport.requests[0].path == "/api/v1/test/crypto"
+
+    @pytest.mark.parametrize("make_client", [{"validate_inputs": False}], indirect=True)
+    def test_validation_can_be_disabled(self, make_client, sample_payment_data):
+        """Test validate_inputs=False sends input as-is"""
+        client = make_client(transport=InMemoryTransport())
+
+        client.payment.s2s({**sample_payment_data, "currency": "usd"})
+
+        assert len(client.transport.requests) == 1